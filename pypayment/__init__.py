@@ -1,9 +1,39 @@
 from __future__ import annotations
 
+from .authorization import authorize_all, deferred_authorization
+from .batch import BatchCreationResult, CreationFailure
+from .concurrency import AdaptiveConcurrency, AdaptiveLimiter
+from .connections import ConnectionWarmer, configure_connections, prewarm
 from .enums.commission import ChargeCommission
+from .enums.operation import PaymentOperation
+from .enums.priority import RequestPriority
 from .enums.status import PaymentStatus
-from .exceptions import AuthorizationError, NotAuthorized, PaymentCreationError, PaymentGettingError, PaymentNotFound
+from .events import EventBuffer, EventBus, EventStream, PaymentStatusChanged, payment_events
+from .exceptions import (
+    AuthorizationError,
+    DeadlineExceeded,
+    EventBufferFull,
+    LeaseLost,
+    NotAuthorized,
+    PaymentCreationError,
+    PaymentGettingError,
+    PaymentNotFound,
+    PollerWorkerDied,
+)
+from .fakes import FakeBackend, fake_providers
+from .frames import PaymentFrame, PaymentGroups
+from .gating import BalanceGate
+from .health import HealthMonitor, ProviderHealth
+from .hedging import Hedger
+from .leases import LeaseCoordinator, LeaseStore, SQLiteLeaseStore
+from .notifications import (
+    MemoryNotificationStore,
+    NotificationDeduplicator,
+    NotificationStore,
+    SQLiteNotificationStore,
+)
 from .payment import Payment
+from .polling import PollResult, PollTarget, ShardedPoller
 from .providers.aaio import AaioCurrency, AaioPayment, AaioPaymentType
 from .providers.betatransfer import (
     BetaTransferCurrency,
@@ -15,31 +45,90 @@ from .providers.betatransfer import (
 from .providers.lava import LavaPayment
 from .providers.payok import PayOkCurrency, PayOkPayment, PayOkPaymentType
 from .providers.qiwi import QiwiPayment, QiwiPaymentType
-from .providers.yoomoney import YooMoneyPayment, YooMoneyPaymentType
+from .providers.yoomoney import YooMoneyOperationType, YooMoneyPayment, YooMoneyPaymentType
+from .reconciliation import Discrepancy, DiscrepancyKind, LedgerEntry, reconcile
+from .scheduling import RequestScheduler, request_priority
+from .sync import FileCursorStore, StatusTransition, SyncCursor, sync_transitions
+from .timeouts import Timeout, deadline, request_timeout
+from .transport import HttpRequest, HttpResponse
 
 __all__ = [
     "AaioCurrency",
     "AaioPayment",
     "AaioPaymentType",
+    "AdaptiveConcurrency",
+    "AdaptiveLimiter",
     "AuthorizationError",
+    "BalanceGate",
+    "BatchCreationResult",
     "BetaTransferCurrency",
     "BetaTransferGateway",
     "BetaTransferLocale",
     "BetaTransferPayment",
     "BetaTransferPaymentType",
     "ChargeCommission",
+    "ConnectionWarmer",
+    "CreationFailure",
+    "DeadlineExceeded",
+    "Discrepancy",
+    "DiscrepancyKind",
+    "EventBuffer",
+    "EventBufferFull",
+    "EventBus",
+    "EventStream",
+    "FakeBackend",
+    "FileCursorStore",
+    "HealthMonitor",
+    "Hedger",
+    "HttpRequest",
+    "HttpResponse",
     "LavaPayment",
+    "LeaseCoordinator",
+    "LeaseLost",
+    "LeaseStore",
+    "LedgerEntry",
+    "MemoryNotificationStore",
     "NotAuthorized",
+    "NotificationDeduplicator",
+    "NotificationStore",
     "PayOkCurrency",
     "PayOkPayment",
     "PayOkPaymentType",
     "Payment",
     "PaymentCreationError",
+    "PaymentFrame",
     "PaymentGettingError",
+    "PaymentGroups",
     "PaymentNotFound",
+    "PaymentOperation",
     "PaymentStatus",
+    "PaymentStatusChanged",
+    "PollResult",
+    "PollTarget",
+    "PollerWorkerDied",
+    "ProviderHealth",
     "QiwiPayment",
     "QiwiPaymentType",
+    "RequestPriority",
+    "RequestScheduler",
+    "SQLiteLeaseStore",
+    "SQLiteNotificationStore",
+    "ShardedPoller",
+    "StatusTransition",
+    "SyncCursor",
+    "Timeout",
+    "YooMoneyOperationType",
     "YooMoneyPayment",
     "YooMoneyPaymentType",
+    "authorize_all",
+    "configure_connections",
+    "deadline",
+    "deferred_authorization",
+    "fake_providers",
+    "payment_events",
+    "prewarm",
+    "reconcile",
+    "request_priority",
+    "request_timeout",
+    "sync_transitions",
 ]
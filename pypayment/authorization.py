@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar, copy_context
+from threading import Lock
+from typing import TYPE_CHECKING, Any
+
+from pypayment.exceptions import AuthorizationError
+from pypayment.timeouts import deadline
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+    from concurrent.futures import Future
+
+    from pypayment import Payment
+
+_authorization_deferred: ContextVar[bool] = ContextVar("authorization_deferred", default=False)
+
+
+def is_authorization_deferred() -> bool:
+    """Return True if authorize() calls should postpone credentials check until the first use of the class."""
+    return _authorization_deferred.get()
+
+
+@contextmanager
+def deferred_authorization() -> Iterator[None]:
+    """Postpone credentials check of every authorize() call made inside the block.
+
+    Parameters are saved as default right away, while the request to the provider API
+    is made only when the first payment of the class is created.
+    """
+    token = _authorization_deferred.set(True)
+    try:
+        yield
+    finally:
+        _authorization_deferred.reset(token)
+
+
+def authorize_all(
+    authorizations: Mapping[type[Payment], Mapping[str, Any]],
+    timeout: float | None = None,
+    lazy: bool = False,
+) -> None:
+    """Authorize several payment classes at once.
+
+    Credentials checks run concurrently, so authorization takes as long as the slowest provider.
+
+    >>> authorize_all({
+    ...     QiwiPayment: {"secret_key": "my_secret_key"},
+    ...     PayOkPayment: {"api_key": "...", "api_id": 1, "shop_id": 2, "shop_secret_key": "..."},
+    ... }, timeout=5)
+
+    :param authorizations: Payment classes mapped to keyword arguments of their authorize() method.
+    :param timeout: Overall deadline in seconds for all credentials checks and their requests (default: no deadline).
+    :param lazy: Do not make any requests now, check credentials on the first use of each class instead.
+
+    :raise AuthorizationError: When authorization of any class fails or does not finish in time.
+    """
+    if lazy:
+        with deferred_authorization():
+            for payment_class, parameters in authorizations.items():
+                payment_class.authorize(**parameters)
+        return
+
+    if not authorizations:
+        return
+
+    futures, timed_out = _authorize_concurrently(authorizations, timeout)
+
+    failures = []
+    first_error = None
+    for payment_class, future in futures.items():
+        if payment_class in timed_out:
+            failures.append(f"{payment_class.__name__} (timed out)")
+            continue
+
+        error = future.exception()
+        if error is not None:
+            failures.append(f"{payment_class.__name__} ({error or error.__class__.__name__})")
+            first_error = first_error or error
+
+    if failures:
+        raise AuthorizationError("Authorization failed: " + ", ".join(failures)) from first_error
+
+
+def _authorize_concurrently(
+    authorizations: Mapping[type[Payment], Mapping[str, Any]],
+    timeout: float | None,
+) -> tuple[dict[type[Payment], Future[None]], set[type[Payment]]]:
+    """Run authorize() of every class in its own thread and return their futures and classes that timed out.
+
+    Checks that time out keep running in their threads, so their late successes are undone.
+    """
+    timed_out: set[type[Payment]] = set()
+    timed_out_lock = Lock()
+
+    def authorize(payment_class: type[Payment], parameters: Mapping[str, Any]) -> None:
+        try:
+            payment_class.authorize(**parameters)
+        finally:
+            with timed_out_lock:
+                if payment_class in timed_out:
+                    payment_class.authorized = False
+
+    executor = ThreadPoolExecutor(max_workers=len(authorizations), thread_name_prefix="pypayment-authorize")
+    with deadline(timeout) if timeout is not None else nullcontext():
+        futures = {
+            payment_class: executor.submit(copy_context().run, authorize, payment_class, parameters)
+            for payment_class, parameters in authorizations.items()
+        }
+    wait(futures.values(), timeout=timeout)
+    executor.shutdown(wait=False)
+
+    with timed_out_lock:
+        for payment_class, future in futures.items():
+            if not future.done():
+                timed_out.add(payment_class)
+                payment_class.authorized = False
+
+    return futures, timed_out
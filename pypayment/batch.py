@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from pypayment.enums.priority import RequestPriority
+from pypayment.ratelimit import RateLimiter
+from pypayment.scheduling import request_priority
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
+    from pypayment import Payment
+
+P = TypeVar("P", bound="Payment")
+
+_creation_deferred: ContextVar[bool] = ContextVar("creation_deferred", default=False)
+
+
+def is_creation_deferred() -> bool:
+    """Return True if payments should be validated now and created with a request later."""
+    return _creation_deferred.get()
+
+
+@contextmanager
+def deferred_creation() -> Iterator[None]:
+    """Validate payments created inside the block without requesting their URLs.
+
+    URL of such payment is empty until its _create_url() result is assigned.
+    """
+    token = _creation_deferred.set(True)
+    try:
+        yield
+    finally:
+        _creation_deferred.reset(token)
+
+
+@dataclass
+class CreationFailure:
+    """Payment that could not be created."""
+
+    index: int
+    """Index of the payment parameters in the batch."""
+    parameters: Mapping[str, Any]
+    error: Exception
+
+
+@dataclass
+class BatchCreationResult(Generic[P]):
+    """Result of creating many payments at once."""
+
+    created: list[P] = field(default_factory=list)
+    """Created payments in order of their parameters."""
+    failed: list[CreationFailure] = field(default_factory=list)
+    """Payments that failed validation or creation, in order of their parameters."""
+
+
+def create_many(
+    payment_class: type[P],
+    batch: Iterable[Mapping[str, Any]],
+    max_concurrency: int = 8,
+    rate_limit: float | None = None,
+) -> BatchCreationResult[P]:
+    """Create many payments concurrently.
+
+    All payments are validated locally first, so invalid parameters fail before any request is made.
+    Valid payments are then created with up to max_concurrency simultaneous requests,
+    or fewer if adaptive concurrency of the class currently allows fewer. Requests are BACKGROUND priority.
+
+    :param payment_class: Authorized payment class.
+    :param batch: Keyword arguments of payment class constructor, one mapping per payment.
+    :param max_concurrency: Maximum number of simultaneous creation requests.
+    :param rate_limit: Maximum number of creation requests per second (default: unlimited).
+
+    :raise ValueError: When max_concurrency is not positive.
+    :raise NotAuthorized: When class was not authorized.
+    """
+    if max_concurrency < 1:
+        raise ValueError("Max concurrency must be positive.")
+    payment_class._check_authorization()  # noqa: SLF001
+    result: BatchCreationResult[P] = BatchCreationResult()
+
+    pending: list[tuple[int, Mapping[str, Any], P]] = []
+    with deferred_creation():
+        for index, parameters in enumerate(batch):
+            try:
+                pending.append((index, parameters, payment_class(**parameters)))
+            except Exception as e:  # noqa: BLE001
+                result.failed.append(CreationFailure(index, parameters, e))
+
+    rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+
+    def create(payment: P) -> str:
+        if rate_limiter:
+            rate_limiter.acquire()
+        with request_priority(RequestPriority.BACKGROUND):
+            return payment._make_url()  # noqa: SLF001
+
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="pypayment-create") as executor:
+        futures = [executor.submit(copy_context().run, create, payment) for _, _, payment in pending]
+
+    for (index, parameters, payment), future in zip(pending, futures):  # noqa: B905
+        error = future.exception()
+        if error is None:
+            payment.url = future.result()
+            result.created.append(payment)
+        elif isinstance(error, Exception):
+            result.failed.append(CreationFailure(index, parameters, error))
+        else:
+            raise error
+
+    result.failed.sort(key=lambda failure: failure.index)
+    return result
@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import inspect
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager, ExitStack, nullcontext
+from contextvars import copy_context
+from datetime import timedelta
+from enum import Enum
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+import pypayment
+from pypayment import Payment, PaymentNotFound, fake_providers, request_timeout
+from pypayment.exceptions import PyPaymentException
+from pypayment.ratelimit import RateLimiter
+from pypayment.reconciliation import read_ledger, reconcile, write_csv, write_jsonl
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Mapping, Sequence
+    from concurrent.futures import Future
+
+    from pypayment import PaymentStatus
+
+PROVIDERS: Mapping[str, type[Payment]] = {
+    name[: -len("Payment")].lower(): getattr(pypayment, name)
+    for name in pypayment.__all__
+    if name.endswith("Payment") and name != "Payment"
+}
+"""Payment classes by command-line name."""
+
+_STATUS_FIELDS = ("payment_id", "status", "income", "error")
+_CREATION_FIELDS = ("index", "payment_id", "amount", "url", "error")
+_FAKE_CREDENTIAL = "fake"
+_SCALAR_TYPES: Mapping[str, Callable[[str], Any]] = {
+    "int": int,
+    "float": float,
+    "bool": lambda value: value.lower() in {"1", "true", "yes", "on"},
+    "timedelta": lambda value: timedelta(seconds=float(value)),
+}
+
+
+class _Progress:
+    """Line on stderr with number of processed items, errors and throughput, redrawn at most twice a second."""
+
+    def __init__(self, file: IO[str] | None) -> None:
+        self._file = file
+        self._started_at = time.monotonic()
+        self._drawn_at = 0.0
+        self.done = 0
+        self.errors = 0
+
+    def add(self, is_error: bool = False) -> None:
+        self.done += 1
+        self.errors += is_error
+        now = time.monotonic()
+        if now - self._drawn_at >= 0.5:  # noqa: PLR2004
+            self._drawn_at = now
+            self._draw("\r")
+
+    def finish(self) -> None:
+        self._draw("\r")
+        if self._file:
+            self._file.write("\n")
+
+    def _draw(self, prefix: str) -> None:
+        if not self._file:
+            return
+        elapsed = time.monotonic() - self._started_at
+        rate = self.done / elapsed if elapsed else 0.0
+        self._file.write(f"{prefix}{self.done} done, {self.errors} errors, {rate:.1f}/s, {elapsed:.0f}s elapsed")
+        self._file.flush()
+
+
+class _Writer:
+    """Stream of result records in JSON Lines or CSV format."""
+
+    def __init__(self, file: IO[str], output_format: str, fields: Sequence[str]) -> None:
+        self._file = file
+        self._csv = csv.DictWriter(file, fieldnames=fields) if output_format == "csv" else None
+        if self._csv:
+            self._csv.writeheader()
+
+    def write(self, record: Mapping[str, Any]) -> None:
+        if self._csv:
+            self._csv.writerow(record)
+        else:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run command-line tool and return exit code.
+
+    >>> python -m pypayment status qiwi -i ids.txt -c 32 --rate-limit 50 -f csv > statuses.csv
+    """
+    parser = _get_parser()
+    args = parser.parse_args(argv)
+    payment_class = PROVIDERS[args.provider]
+
+    with ExitStack() as stack:
+        stack.enter_context(fake_providers() if args.fake else nullcontext())
+        if args.timeout:
+            stack.enter_context(request_timeout(args.timeout))
+
+        try:
+            payment_class.authorize(**_get_credentials(args.provider, args.config, fake=args.fake))
+        except argparse.ArgumentTypeError as e:
+            parser.error(str(e))
+        except (TypeError, PyPaymentException) as e:
+            sys.stderr.write(f"Authorization failed: {e or repr(e.__cause__)}\n")
+            return 2
+
+        source = stack.enter_context(_open(args.input, "r"))
+        output = stack.enter_context(_open(args.output, "w"))
+        progress = _Progress(None if args.quiet else sys.stderr)
+        try:
+            args.command(payment_class, args, source, output, progress)
+        except argparse.ArgumentTypeError as e:
+            parser.error(str(e))
+        finally:
+            progress.finish()
+
+    return 1 if progress.errors else 0
+
+
+def _check_statuses(
+    payment_class: type[Payment],
+    args: argparse.Namespace,
+    source: IO[str],
+    output: IO[str],
+    progress: _Progress,
+) -> None:
+    """Write status and income of every payment ID, in input order."""
+    writer = _Writer(output, args.format, _STATUS_FIELDS)
+    rate_limiter = RateLimiter(args.rate_limit) if args.rate_limit else None
+
+    def get_status_and_income(payment_id: str) -> tuple[PaymentStatus | None, float]:
+        if rate_limiter:
+            rate_limiter.acquire()
+        return payment_class.get_status_and_income(payment_id)
+
+    def write(payment_id: str, future: Future[tuple[PaymentStatus | None, float]]) -> None:
+        record: dict[str, Any] = dict.fromkeys(_STATUS_FIELDS)
+        record["payment_id"] = payment_id
+        try:
+            status, income = future.result()
+        except PaymentNotFound:
+            record["error"] = "not_found"
+        except Exception as e:  # noqa: BLE001
+            record["error"] = str(e) or repr(e.__cause__ or e)
+        else:
+            record["status"] = status.name if status else None
+            record["income"] = income
+        writer.write(record)
+        progress.add(is_error=record["error"] is not None)
+
+    pending: deque[tuple[str, Future[tuple[PaymentStatus | None, float]]]] = deque()
+    with ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix="pypayment-cli") as executor:
+        for payment_id in _read_lines(source):
+            pending.append((payment_id, executor.submit(copy_context().run, get_status_and_income, payment_id)))
+            if len(pending) >= args.concurrency * 2:
+                write(*pending.popleft())
+
+        while pending:
+            write(*pending.popleft())
+
+
+def _reconcile(
+    payment_class: type[Payment],
+    args: argparse.Namespace,
+    source: IO[str],
+    output: IO[str],
+    progress: _Progress,
+) -> None:
+    """Write discrepancies between ledger and provider."""
+    discrepancies = reconcile(
+        payment_class,
+        read_ledger(source),
+        max_concurrency=args.concurrency,
+        tolerance=args.tolerance,
+        rate_limit=args.rate_limit,
+        on_compared=lambda _: progress.add(),
+    )
+    write_discrepancies = write_csv if args.format == "csv" else write_jsonl
+    progress.errors = write_discrepancies(discrepancies, output)
+
+
+def _create_links(
+    payment_class: type[Payment],
+    args: argparse.Namespace,
+    source: IO[str],
+    output: IO[str],
+    progress: _Progress,
+) -> None:
+    """Create payments from specs and write their URLs, in input order."""
+    writer = _Writer(output, args.format, _CREATION_FIELDS)
+    parameters = inspect.signature(payment_class.__init__).parameters
+    chunk_size = args.concurrency * 16
+
+    def write_chunk(offset: int, specs: list[dict[str, Any]]) -> None:
+        result = payment_class.create_many(specs, max_concurrency=args.concurrency, rate_limit=args.rate_limit)
+        records = {
+            failure.index: {"index": offset + failure.index, "error": str(failure.error) or repr(failure.error)}
+            for failure in result.failed
+        }
+        created = iter(result.created)
+        for index in range(len(specs)):
+            if index not in records:
+                payment = next(created)
+                records[index] = {
+                    "index": offset + index,
+                    "payment_id": payment.id,
+                    "amount": payment.amount,
+                    "url": payment.url,
+                }
+            writer.write({**dict.fromkeys(_CREATION_FIELDS), **records[index]})
+            progress.add(is_error="error" in records[index])
+
+    offset = 0
+    chunk: list[dict[str, Any]] = []
+    for number, line in enumerate(_read_lines(source), 1):
+        try:
+            spec = json.loads(line)
+            spec = spec if isinstance(spec, dict) else {"amount": spec}
+            chunk.append(_coerce_arguments(payment_class, parameters, spec))
+        except (ValueError, argparse.ArgumentTypeError) as e:
+            msg = f"invalid payment spec #{number}: {e}"
+            raise argparse.ArgumentTypeError(msg) from e
+        if len(chunk) >= chunk_size:
+            write_chunk(offset, chunk)
+            offset += len(chunk)
+            chunk = []
+
+    if chunk:
+        write_chunk(offset, chunk)
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m pypayment",
+        description="Check, reconcile and create payments in bulk.",
+        epilog="Credentials are read from --config JSON file and PYPAYMENT_<PROVIDER>_<PARAMETER> environment "
+        "variables, e.g. PYPAYMENT_QIWI_SECRET_KEY. Parameter names are those of the provider authorize() method.",
+    )
+    commands = parser.add_subparsers(required=True, metavar="command")
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("provider", choices=sorted(PROVIDERS))
+    common.add_argument("-i", "--input", default="-", help="input file (default: stdin)")
+    common.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    common.add_argument("-f", "--format", choices=("jsonl", "csv"), default="jsonl", help="output format")
+    common.add_argument("-c", "--concurrency", type=int, default=8, help="simultaneous requests (default: 8)")
+    common.add_argument("-r", "--rate-limit", type=float, help="maximum requests per second")
+    common.add_argument("-t", "--timeout", type=float, help="timeout of one request in seconds")
+    common.add_argument("--config", type=Path, help="JSON file with authorize() parameters")
+    common.add_argument("--fake", action="store_true", help="use in-memory fake provider instead of real API")
+    common.add_argument("-q", "--quiet", action="store_true", help="do not show progress on stderr")
+
+    status = commands.add_parser(
+        "status",
+        parents=[common],
+        help="check status and income of payments",
+        description="Read payment IDs, one per line, and write their status and income.",
+    )
+    status.set_defaults(command=_check_statuses)
+
+    reconciliation = commands.add_parser(
+        "reconcile",
+        parents=[common],
+        help="compare ledger with provider",
+        description="Read payment IDs, or CSV ledger with id, income and status columns, and write discrepancies.",
+    )
+    reconciliation.add_argument("--tolerance", type=float, default=0.01, help="allowed income difference")
+    reconciliation.set_defaults(command=_reconcile)
+
+    creation = commands.add_parser(
+        "create-links",
+        parents=[common],
+        help="create payments and write their URLs",
+        description="Read JSON objects with payment class parameters (or bare amounts), one per line, "
+        "and write created payment URLs.",
+    )
+    creation.set_defaults(command=_create_links)
+
+    return parser
+
+
+def _get_credentials(provider: str, config: Path | None, fake: bool = False) -> dict[str, Any]:
+    """Return authorize() arguments from config file, overridden by environment variables.
+
+    With fake provider required arguments that are not given are filled with placeholders,
+    as fake backend never checks them.
+    """
+    payment_class = PROVIDERS[provider]
+    credentials: dict[str, Any] = {}
+    if config:
+        data = json.loads(config.read_text(encoding="utf-8"))
+        credentials.update(data.get(provider, data))
+
+    parameters = inspect.signature(payment_class.authorize).parameters
+    for name in parameters:
+        value = os.environ.get(f"PYPAYMENT_{provider}_{name}".upper())
+        if value is not None:
+            credentials[name] = value
+
+    if fake:
+        for name, parameter in parameters.items():
+            if parameter.default is inspect.Parameter.empty and name != "cls":
+                credentials.setdefault(name, _FAKE_CREDENTIAL)
+
+    return _coerce_arguments(payment_class, parameters, credentials)
+
+
+def _coerce_arguments(
+    payment_class: type[Payment],
+    parameters: Mapping[str, inspect.Parameter],
+    arguments: Mapping[str, Any],
+) -> dict[str, Any]:
+    """Convert strings and numbers to types of the method parameters: numbers, flags, durations and enums.
+
+    :raise argparse.ArgumentTypeError: When value can not be converted.
+    """
+    namespace = vars(sys.modules[payment_class.__module__])
+    coerced = dict(arguments)
+    for name, value in arguments.items():
+        parameter = parameters.get(name)
+        if parameter is None or value is None:
+            continue
+
+        annotation = str(parameter.annotation).split("|")[0].strip()
+        enum_class = namespace.get(annotation)
+        try:
+            if isinstance(enum_class, type) and issubclass(enum_class, Enum) and not isinstance(value, Enum):
+                coerced[name] = _get_member(enum_class, value)
+            elif isinstance(value, str) and annotation in _SCALAR_TYPES:
+                coerced[name] = _SCALAR_TYPES[annotation](value)
+            elif isinstance(value, (int, float)) and annotation == "timedelta":
+                coerced[name] = timedelta(seconds=value)
+        except (TypeError, ValueError, OverflowError) as e:
+            msg = f"invalid {name} value: {value!r}"
+            raise argparse.ArgumentTypeError(msg) from e
+    return coerced
+
+
+def _get_member(enum_class: type[Enum], value: Any) -> Enum:  # noqa: ANN401
+    """Return enum member by case-insensitive name or by value."""
+    if isinstance(value, str) and value.upper() in enum_class.__members__:
+        return enum_class[value.upper()]
+    return enum_class(value)
+
+
+def _read_lines(source: IO[str]) -> Iterator[str]:
+    for line in source:
+        line = line.strip()  # noqa: PLW2901
+        if line:
+            yield line
+
+
+def _open(path: str, mode: str) -> AbstractContextManager[IO[str]]:
+    """Open file, or return stdin or stdout for "-" without closing them."""
+    if path != "-":
+        return Path(path).open(mode, newline="", encoding="utf-8")
+    return nullcontext(sys.stdin if mode == "r" else sys.stdout)
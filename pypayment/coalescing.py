@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+from concurrent.futures import Future
+from contextvars import copy_context
+from functools import partial, wraps
+from threading import Lock
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from pypayment.exceptions import DeadlineExceeded
+from pypayment.timeouts import get_remaining_time
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+    from pypayment import Payment, PaymentStatus
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key.
+
+    Call results are not cached: as soon as the call finishes, the next caller makes a new one.
+    """
+
+    def __init__(self) -> None:
+        """Initialize SingleFlight class."""
+        self._lock = Lock()
+        self._calls: dict[Hashable, Future[Any]] = {}
+
+    def call(self, key: Hashable, function: Callable[[], T]) -> T:
+        """Run function, or wait for the result of the same call made by another thread.
+
+        :param key: Call identity.
+        :param function: Function to run if there is no call in flight.
+
+        :raise DeadlineExceeded: When deadline of the current context passes while waiting for another thread.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._calls[key] = future
+
+        if not is_owner:
+            try:
+                return future.result(get_remaining_time())
+            except concurrent.futures.TimeoutError:
+                raise DeadlineExceeded("Deadline passed while waiting for call in flight.") from None
+
+        try:
+            result = function()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def acall(self, key: Hashable, function: Callable[[], T]) -> T:
+        """Await the call in flight, or run function in the default executor.
+
+        Function is expected to go through call() with the same key itself,
+        so async callers racing each other still share one call.
+
+        :param key: Call identity.
+        :param function: Blocking function to run if there is no call in flight.
+
+        :raise DeadlineExceeded: When deadline of the current context passes while waiting for the call in flight.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+
+        if future is not None:
+            # Shielded, so a caller giving up does not cancel the call other callers share.
+            try:
+                return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), get_remaining_time())
+            except asyncio.TimeoutError:  # noqa: UP041
+                raise DeadlineExceeded("Deadline passed while waiting for call in flight.") from None
+
+        return await asyncio.get_running_loop().run_in_executor(None, copy_context().run, function)
+
+
+status_checks = SingleFlight()
+"""In-flight status checks keyed by payment class, its credentials and payment ID."""
+
+
+def coalesce_status_checks(
+    method: Callable[[type[Payment], str], tuple[PaymentStatus | None, float]],
+) -> Callable[[type[Payment], str], tuple[PaymentStatus | None, float]]:
+    """Make concurrent get_status_and_income() calls for the same payment share one request.
+
+    Must be applied under @classmethod.
+    """
+
+    @wraps(method)
+    def wrapper(cls: type[Payment], payment_id: str) -> tuple[PaymentStatus | None, float]:
+        return status_checks.call(
+            cls._get_status_check_key(payment_id),
+            partial(cls._call_status_check, partial(method, cls, payment_id)),
+        )
+
+    return wrapper
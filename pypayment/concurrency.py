@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from threading import Condition, Lock
+from typing import TYPE_CHECKING, Any
+
+import requests
+
+from pypayment.exceptions import DeadlineExceeded
+from pypayment.timeouts import get_remaining_time
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+    from types import TracebackType
+
+
+class AdaptiveLimiter:
+    """Limit of simultaneous requests to one provider account, adjusted by additive increase, multiplicative decrease.
+
+    While requests succeed at normal latency and the limit is fully used, it grows by one per limit
+    of completed requests. On 429 and 5xx responses, request errors, or latency growing above
+    latency_tolerance times the lowest recently observed latency, it is multiplied by backoff.
+    Only requests started after the previous decrease can decrease the limit again,
+    so one burst of throttled requests counts as one signal.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        *,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        window: int = 100,
+    ) -> None:
+        """Initialize AdaptiveLimiter class.
+
+        :param initial_limit: Number of simultaneous requests allowed at start.
+        :param min_limit: Lowest limit.
+        :param max_limit: Highest limit.
+        :param backoff: Factor limit is multiplied by on overload (0-1).
+        :param latency_tolerance: Ratio to the lowest recent latency from which latency is considered overload.
+        :param window: Number of recent answered requests the lowest latency is taken from.
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit.")
+        if not 0 < backoff < 1:
+            raise ValueError("Backoff must be between 0 and 1.")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._decreases = 0
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._min_samples = max(1, window // 10)
+        self._condition = Condition(Lock())
+
+    @property
+    def limit(self) -> int:
+        """Current number of simultaneous requests allowed."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests running now."""
+        return self._in_flight
+
+    def acquire(self) -> _Permit:
+        """Block until a request is allowed, and return permit to be used as context manager around it.
+
+        :raise DeadlineExceeded: When deadline of the current context passes while waiting.
+        """
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                remaining = get_remaining_time()
+                if remaining is not None and remaining <= 0:
+                    raise DeadlineExceeded("Deadline passed while waiting for concurrency limit.")
+                self._condition.wait(remaining)
+
+            self._in_flight += 1
+            return _Permit(self, self._decreases, is_saturated=self._in_flight >= int(self._limit))
+
+    def _release(self, permit: _Permit, latency: float, is_overloaded: bool | None) -> None:
+        """Free permit slot and adjust limit by request outcome, or keep it if outcome is unknown (None)."""
+        with self._condition:
+            self._in_flight -= 1
+
+            if is_overloaded is False:
+                is_overloaded = self._is_slow(latency)
+                self._latencies.append(latency)
+
+            if is_overloaded and permit.generation == self._decreases:
+                self._decreases += 1
+                self._limit = max(self.min_limit, self._limit * self.backoff)
+            elif is_overloaded is False and permit.is_saturated:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+            self._condition.notify_all()
+
+    def _is_slow(self, latency: float) -> bool:
+        if len(self._latencies) < self._min_samples:
+            return False
+        return latency > min(self._latencies) * self.latency_tolerance
+
+
+class _Permit:
+    """Slot of AdaptiveLimiter held while request runs.
+
+    Request is considered overloaded if it raises RequestException or is marked with set_response().
+    Other exceptions release the slot without adjusting the limit.
+    """
+
+    def __init__(self, limiter: AdaptiveLimiter, generation: int, is_saturated: bool) -> None:
+        self.generation = generation
+        """Number of limit decreases when permit was acquired."""
+        self.is_saturated = is_saturated
+        """Limit was fully used when permit was acquired."""
+        self._limiter = limiter
+        self._status_code: int | None = None
+        self._started_at = 0.0
+
+    def start(self) -> None:
+        """Restart measuring latency, when request is sent later than permit was entered."""
+        self._started_at = time.monotonic()
+
+    def set_response(self, status_code: int) -> None:
+        """Record response status code, so 429 and 5xx are counted as overload."""
+        self._status_code = status_code
+
+    def __enter__(self) -> _Permit:  # noqa: PYI034
+        """Start measuring request latency."""
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Release the slot."""
+        latency = time.monotonic() - self._started_at
+        is_overloaded: bool | None
+        if exc_type is not None:
+            is_overloaded = True if issubclass(exc_type, requests.RequestException) else None
+        else:
+            is_overloaded = self._status_code is not None and (
+                self._status_code == requests.codes.too_many_requests
+                or self._status_code >= requests.codes.internal_server_error
+            )
+        self._limiter._release(self, latency, is_overloaded)  # noqa: SLF001
+
+
+class AdaptiveConcurrency:
+    """Adaptive limits of simultaneous requests, one AdaptiveLimiter per provider account.
+
+    Enabled for payment class with Payment.set_adaptive_concurrency(). Status checks and payment creation
+    of the class then find the highest concurrency provider sustains, so batch creation and pollers
+    may be given generous thread counts: threads above the limit wait for a free slot.
+
+    >>> concurrency = AdaptiveConcurrency(max_limit=32)
+    >>> QiwiPayment.set_adaptive_concurrency(concurrency)
+    >>> QiwiPayment.create_many(invoices, max_concurrency=64)
+    """
+
+    def __init__(self, **limiter_settings: Any) -> None:  # noqa: ANN401
+        """Initialize AdaptiveConcurrency class.
+
+        :param limiter_settings: Keyword arguments of AdaptiveLimiter, used for limiters of all accounts.
+        """
+        AdaptiveLimiter(**limiter_settings)  # Validate settings early
+        self._settings = limiter_settings
+        self._limiters: dict[Hashable, AdaptiveLimiter] = {}
+        self._lock = Lock()
+
+    def get_limiter(self, key: Hashable) -> AdaptiveLimiter:
+        """Return limiter of provider account, creating it on first use.
+
+        :param key: Payment class and its credentials.
+        """
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.setdefault(key, AdaptiveLimiter(**self._settings))
+        return limiter
+
+    def get_limits(self) -> dict[Hashable, int]:
+        """Return current limits of all provider accounts."""
+        return {key: limiter.limit for key, limiter in list(self._limiters.items())}
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Pickle settings only, so every worker process learns its own limits."""
+        return {"settings": self._settings}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore settings with no learned limits."""
+        self._settings = state["settings"]
+        self._limiters = {}
+        self._lock = Lock()
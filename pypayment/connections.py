@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import ipaddress
+import os
+import socket
+import ssl
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from http.cookiejar import DefaultCookiePolicy
+from threading import Event, Lock, Thread
+from typing import TYPE_CHECKING, Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_CA_BUNDLE_PATH
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from pypayment import Payment
+
+_session: requests.Session | None = None
+_session_lock = Lock()
+_pool_size = 16
+
+
+class _DNSCache:
+    """Addresses of resolved host names, kept for ttl seconds."""
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._addresses: dict[tuple[str, int], tuple[list[str], float]] = {}
+
+    def resolve(self, host: str, port: int) -> list[str]:
+        """Return cached or freshly resolved addresses of host, or host itself if it can not be resolved.
+
+        All addresses are kept, so connection falls back to the next one, like from IPv6 to IPv4,
+        when the first is unreachable.
+        """
+        if self.ttl <= 0 or _is_ip_address(host):
+            return [host]
+
+        cached = self._addresses.get((host, port))
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+
+        try:
+            address_info = socket.getaddrinfo(host, port, allowed_gai_family(), socket.SOCK_STREAM)
+        except OSError:
+            return [host]
+        addresses = list(dict.fromkeys(str(info[4][0]) for info in address_info)) or [host]
+        self._addresses[host, port] = (addresses, time.monotonic() + self.ttl)
+        return addresses
+
+    def invalidate(self, host: str, port: int) -> None:
+        """Forget address of host, so it is resolved again on the next connection."""
+        self._addresses.pop((host, port), None)
+
+
+_dns_cache = _DNSCache(ttl=60.0)
+
+
+class _ResumingSSLContext(ssl.SSLContext):
+    """SSL context resuming TLS sessions of previous connections to the same host, skipping full handshakes."""
+
+    def __init__(self, *_: object) -> None:
+        super().__init__()
+        self._sessions: dict[str, ssl.SSLSession] = {}
+        self._sockets: dict[str, weakref.ref[ssl.SSLSocket]] = {}
+
+    def wrap_socket(  # type: ignore[override]
+        self,
+        sock: socket.socket,
+        *args: Any,  # noqa: ANN401
+        server_hostname: str | None = None,
+        session: ssl.SSLSession | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> ssl.SSLSocket:
+        """Wrap socket, offering the latest session of server_hostname for resumption.
+
+        Server that does not accept the session makes a full handshake.
+        """
+        if server_hostname is not None and session is None:
+            session = self._get_session(server_hostname)
+
+        ssl_socket = super().wrap_socket(sock, *args, server_hostname=server_hostname, session=session, **kwargs)
+        if server_hostname is not None:
+            self._sockets[server_hostname] = weakref.ref(ssl_socket)
+            if ssl_socket.session is not None:
+                self._sessions[server_hostname] = ssl_socket.session
+        return ssl_socket
+
+    def _get_session(self, server_hostname: str) -> ssl.SSLSession | None:
+        """Return session of the latest connection to host.
+
+        TLS 1.3 servers send session tickets after the handshake, so session is taken from the latest socket
+        if it is still open, and from saved sessions otherwise.
+        """
+        latest = self._sockets.get(server_hostname)
+        ssl_socket = latest() if latest is not None else None
+        session = ssl_socket.session if ssl_socket is not None else None
+        if session is not None:
+            self._sessions[server_hostname] = session
+            return session
+        return self._sessions.get(server_hostname)
+
+
+class _CachedDNSConnectionMixin:
+    """Connection resolving host names through the in-process DNS cache."""
+
+    _dns_host: str
+    port: int
+
+    def _new_conn(self) -> socket.socket:
+        """Connect to resolved addresses of host in turn, until one accepts connection."""
+        host = self._dns_host
+        *fallbacks, last = _dns_cache.resolve(host, self.port)
+        try:
+            for address in fallbacks:
+                self._dns_host = address
+                with suppress(NewConnectionError, ConnectTimeoutError):
+                    return super()._new_conn()  # type: ignore[misc]
+            self._dns_host = last
+            return super()._new_conn()  # type: ignore[misc]
+        except Exception:
+            _dns_cache.invalidate(host, self.port)
+            raise
+        finally:
+            self._dns_host = host
+
+
+class _HTTPConnection(_CachedDNSConnectionMixin, HTTPConnection):
+    pass
+
+
+class _HTTPSConnection(_CachedDNSConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _HTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _HTTPConnection
+
+
+class _HTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _HTTPSConnection
+
+
+class _PoolingAdapter(HTTPAdapter):
+    """Adapter with DNS cache and TLS session resumption."""
+
+    def init_poolmanager(self, *args: Any, **pool_kwargs: Any) -> None:  # noqa: ANN401
+        ssl_context = _ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        ssl_context.load_verify_locations(DEFAULT_CA_BUNDLE_PATH)
+        super().init_poolmanager(*args, ssl_context=ssl_context, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _HTTPConnectionPool, "https": _HTTPSConnectionPool}
+
+
+def get_session() -> requests.Session:
+    """Return session all provider requests of the process are sent with, keeping connections alive between them."""
+    global _session  # noqa: PLW0603
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session()
+    return _session
+
+
+def configure_connections(pool_size: int = 16, dns_ttl: float = 60.0) -> None:
+    """Set connection pool settings, retiring current connections.
+
+    Requests sent afterwards use a new session. Requests in flight finish on the retired one,
+    and its connections are closed when it is garbage collected.
+
+    :param pool_size: Maximum number of idle connections kept alive per provider host.
+        More simultaneous requests still work, extra connections are closed after use.
+    :param dns_ttl: Seconds resolved host addresses are cached for, 0 to resolve on every new connection.
+    """
+    global _session, _pool_size  # noqa: PLW0603
+    _pool_size = pool_size
+    _dns_cache.ttl = dns_ttl
+    with _session_lock:
+        _session = None
+
+
+def prewarm(
+    targets: Iterable[type[Payment] | str],
+    connections: int = 2,
+    timeout: float = 5,
+    wait: bool = True,
+) -> None:
+    """Open connections to provider hosts in advance, so the first requests do not wait for DNS, TCP and TLS.
+
+    Connections are opened with simultaneous HEAD requests to the host, which leave them in the session pool.
+    Idle connections that are still alive are reused, dropped ones are reopened,
+    so calling it periodically keeps connections warm. Failures are ignored.
+
+    >>> prewarm([QiwiPayment, YooMoneyPayment], connections=4)
+
+    :param targets: Payment classes or URLs of provider hosts.
+    :param connections: Number of connections to open per host, up to pool size.
+    :param timeout: Timeout of one request in seconds.
+    :param wait: Wait until connections are opened (default), or open them in a background thread.
+    """
+    urls = [target if isinstance(target, str) else target._API_ORIGIN for target in targets]  # noqa: SLF001
+    urls = [url for url in dict.fromkeys(urls) if url]
+    if not wait:
+        Thread(target=prewarm, args=(urls, connections, timeout), name="pypayment-prewarm", daemon=True).start()
+        return
+
+    session = get_session()
+
+    def connect(url: str) -> None:
+        with suppress(requests.RequestException):
+            session.head(url, timeout=timeout, allow_redirects=False).close()
+
+    requests_to_send = [url for url in urls for _ in range(min(connections, _pool_size))]
+    if requests_to_send:
+        with ThreadPoolExecutor(len(requests_to_send), thread_name_prefix="pypayment-prewarm") as executor:
+            list(executor.map(connect, requests_to_send))
+
+
+class ConnectionWarmer:
+    """Keep connections to provider hosts warm, reopening the ones closed by servers during idle time.
+
+    >>> with ConnectionWarmer([QiwiPayment], connections=4, interval=30):
+    ...     serve()
+    """
+
+    def __init__(
+        self,
+        targets: Sequence[type[Payment] | str],
+        connections: int = 2,
+        interval: float = 30,
+        timeout: float = 5,
+    ) -> None:
+        """Initialize ConnectionWarmer class.
+
+        :param targets: Payment classes or URLs of provider hosts.
+        :param connections: Number of connections to keep open per host.
+        :param interval: Seconds between checks, shorter than keep-alive timeout of provider servers.
+        :param timeout: Timeout of opening one connection in seconds.
+        """
+        self.targets = list(targets)
+        self.connections = connections
+        self.interval = interval
+        self.timeout = timeout
+        self._stop = Event()
+        self._thread: Thread | None = None
+
+    def start(self) -> None:
+        """Start warming connections in a background thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name="pypayment-connection-warmer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop warming connections."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> ConnectionWarmer:  # noqa: PYI034
+        """Start warming connections."""
+        self.start()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Stop warming connections."""
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            prewarm(self.targets, self.connections, self.timeout)
+            self._stop.wait(self.interval)
+
+
+def _create_session() -> requests.Session:
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = _PoolingAdapter(pool_connections=16, pool_maxsize=_pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _forget_session() -> None:
+    """Drop session inherited by forked process without closing connections still used by the parent."""
+    global _session  # noqa: PLW0603
+    _session = None
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+    except ValueError:
+        return False
+    return True
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_session)
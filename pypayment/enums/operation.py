@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from enum import Enum
+
+
+class PaymentOperation(Enum):
+    """Kind of request made to payment provider API."""
+
+    AUTHORIZATION = "authorization"
+    """Credentials check and access token requests."""
+    CREATION = "creation"
+    """Payment creation requests."""
+    STATUS = "status"
+    """Payment status and transaction history requests."""
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from enum import Enum
+
+
+class RequestPriority(Enum):
+    """Lane of RequestScheduler a request to payment provider API waits in."""
+
+    INTERACTIVE = "interactive"
+    """Requests a customer is waiting for, like payment creation."""
+    BACKGROUND = "background"
+    """Bulk requests, like status polling, reconciliation and batch creation."""
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import queue
+import threading
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from pypayment.exceptions import EventBufferFull
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterator
+
+    from pypayment import Payment, PaymentStatus
+
+_CLOSED = object()
+
+
+@dataclass
+class PaymentStatusChanged:
+    """Payment status has changed."""
+
+    payment_class: type[Payment]
+    payment_id: str
+    old: PaymentStatus | None
+    """Previous status, None if it is unknown, like for changes reported by provider notifications."""
+    new: PaymentStatus | None
+    income: float | None
+    payment: Payment | None = None
+    """Changed payment object, if the change was made through one."""
+
+
+class EventBus:
+    """Deliver payment status changes to subscribers.
+
+    >>> payment_events.subscribe(lambda event: print(event.payment_id, event.new))
+    >>> with payment_events.buffer(maxsize=1000) as events:
+    ...     for event in events:
+    ...         ...
+    """
+
+    def __init__(self) -> None:
+        """Initialize EventBus class."""
+        self._subscribers: tuple[Callable[[PaymentStatusChanged], None], ...] = ()
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[PaymentStatusChanged], None]) -> Callable[[], None]:
+        """Call callback on every event and return function that unsubscribes it.
+
+        Callbacks run in the thread that changed the payment. Their exceptions propagate to the changing code,
+        after the payment has been changed.
+        """
+        with self._lock:
+            self._subscribers = (*self._subscribers, callback)
+        return lambda: self.unsubscribe(callback)
+
+    def unsubscribe(self, callback: Callable[[PaymentStatusChanged], None]) -> None:
+        """Stop calling callback. Unknown callbacks are ignored."""
+        with self._lock:
+            self._subscribers = tuple(subscriber for subscriber in self._subscribers if subscriber != callback)
+
+    def buffer(self, maxsize: int = 1000, timeout: float | None = None) -> EventBuffer:
+        """Subscribe a bounded buffer to be consumed from another thread.
+
+        :param maxsize: Maximum number of buffered events.
+        :param timeout: Seconds a publisher waits for free space before EventBufferFull is raised
+            (default: wait as long as needed).
+        """
+        buffer = EventBuffer(maxsize, timeout)
+        buffer._unsubscribe = self.subscribe(buffer.put)  # noqa: SLF001
+        return buffer
+
+    def stream(self, maxsize: int = 1000, timeout: float | None = None) -> EventStream:
+        """Subscribe a bounded asyncio queue. Must be called from the running event loop.
+
+        :param maxsize: Maximum number of buffered events.
+        :param timeout: Seconds a publisher waits for free space before EventBufferFull is raised
+            (default: wait as long as needed). Publishers running in the event loop thread never wait.
+        """
+        stream = EventStream(maxsize, timeout)
+        stream._unsubscribe = self.subscribe(stream.put)  # noqa: SLF001
+        return stream
+
+    def publish(self, event: PaymentStatusChanged) -> None:
+        """Pass event to all subscribers."""
+        for callback in self._subscribers:
+            callback(event)
+
+
+class EventBuffer:
+    """Bounded buffer of events consumed from another thread.
+
+    Publishers block while the buffer is full, so a slow consumer slows down producers instead of losing events.
+    """
+
+    def __init__(self, maxsize: int = 1000, timeout: float | None = None) -> None:
+        """Initialize EventBuffer class. Use EventBus.buffer() to create a subscribed one."""
+        self.timeout = timeout
+        self._queue: queue.Queue[PaymentStatusChanged | object] = queue.Queue(maxsize)
+        self._closed = False
+        self._unsubscribe: Callable[[], None] | None = None
+
+    def put(self, event: PaymentStatusChanged) -> None:
+        """Add event, waiting for free space.
+
+        :raise EventBufferFull: When buffer stayed full for timeout seconds.
+        """
+        try:
+            self._queue.put(event, timeout=self.timeout)
+        except queue.Full:
+            raise EventBufferFull("Event consumer is too slow.") from None
+
+    def get(self, timeout: float | None = None) -> PaymentStatusChanged | None:
+        """Return the next event, or None if buffer is closed or no event came within timeout."""
+        if self._closed and self._queue.empty():
+            return None
+        try:
+            event = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        return None if event is _CLOSED else event  # type: ignore[return-value]
+
+    def close(self) -> None:
+        """Unsubscribe buffer. Events that are already buffered can still be consumed."""
+        if self._unsubscribe:
+            self._unsubscribe()
+        self._closed = True
+        with suppress(queue.Full):
+            self._queue.put_nowait(_CLOSED)
+
+    def __iter__(self) -> Iterator[PaymentStatusChanged]:
+        """Iterate over events until buffer is closed."""
+        while True:
+            event = self.get()
+            if event is None:
+                return
+            yield event
+
+    def __enter__(self) -> EventBuffer:  # noqa: PYI034
+        """Return buffer itself."""
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Close buffer."""
+        self.close()
+
+
+class EventStream:
+    """Bounded asyncio queue of events.
+
+    >>> async with payment_events.stream() as events:
+    ...     async for event in events:
+    ...         ...
+    """
+
+    def __init__(self, maxsize: int = 1000, timeout: float | None = None) -> None:
+        """Initialize EventStream class. Use EventBus.stream() to create a subscribed one."""
+        self.timeout = timeout
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[PaymentStatusChanged | object] = asyncio.Queue(maxsize)
+        self._closed = False
+        self._unsubscribe: Callable[[], None] | None = None
+
+    def put(self, event: PaymentStatusChanged) -> None:
+        """Add event from any thread.
+
+        Publishers from other threads wait for free space. Publisher running in the event loop thread
+        can not wait without blocking the consumer, so it fails at once.
+
+        :raise EventBufferFull: When queue stayed full for timeout seconds, or is full in the event loop thread.
+        """
+        if self._is_loop_thread():
+            try:
+                self._queue.put_nowait(event)
+            except asyncio.QueueFull:
+                raise EventBufferFull("Event consumer is too slow.") from None
+            return
+
+        future = asyncio.run_coroutine_threadsafe(self._queue.put(event), self._loop)
+        try:
+            future.result(self.timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise EventBufferFull("Event consumer is too slow.") from None
+
+    async def get(self) -> PaymentStatusChanged | None:
+        """Return the next event, or None if stream is closed."""
+        if self._closed and self._queue.empty():
+            return None
+        event = await self._queue.get()
+        return None if event is _CLOSED else event  # type: ignore[return-value]
+
+    def close(self) -> None:
+        """Unsubscribe stream. Events that are already queued can still be consumed."""
+        if self._unsubscribe:
+            self._unsubscribe()
+        self._closed = True
+        if self._is_loop_thread():
+            self._put_closed()
+        else:
+            self._loop.call_soon_threadsafe(self._put_closed)
+
+    def __aiter__(self) -> AsyncIterator[PaymentStatusChanged]:
+        """Iterate over events until stream is closed."""
+        return self._iterate()
+
+    async def __aenter__(self) -> EventStream:  # noqa: PYI034
+        """Return stream itself."""
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        """Close stream."""
+        self.close()
+
+    async def _iterate(self) -> AsyncIterator[PaymentStatusChanged]:
+        while True:
+            event = await self.get()
+            if event is None:
+                return
+            yield event
+
+    def _put_closed(self) -> None:
+        with suppress(asyncio.QueueFull):
+            self._queue.put_nowait(_CLOSED)
+
+    def _is_loop_thread(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+
+payment_events = EventBus()
+"""Status changes made by Payment.update(), ShardedPoller.poll() and sync_transitions()."""
@@ -23,3 +23,19 @@ class PaymentGettingError(PyPaymentException):
 
 class PaymentNotFound(PyPaymentException):
     """Raised when payment not found."""
+
+
+class PollerWorkerDied(PyPaymentException):
+    """Raised when worker process of ShardedPoller has exited while poll was running."""
+
+
+class LeaseLost(PyPaymentException):
+    """Raised when leases of claimed payments could not be renewed and other nodes may have taken them."""
+
+
+class EventBufferFull(PyPaymentException):
+    """Raised when event consumer does not keep up and its buffer stays full."""
+
+
+class DeadlineExceeded(PyPaymentException):
+    """Raised when deadline set with pypayment.deadline() has passed."""
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, NamedTuple
+
+from pypayment.enums.status import PaymentStatus
+from pypayment.exceptions import (
+    AuthorizationError,
+    DeadlineExceeded,
+    PaymentCreationError,
+    PaymentGettingError,
+    PaymentNotFound,
+)
+from pypayment.timeouts import get_remaining_time
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Iterator
+
+    from pypayment import Payment
+
+    Duration = float | Callable[[], float]
+    """Seconds, or function returning random seconds on every call."""
+
+_fake_backend: ContextVar[FakeBackend | None] = ContextVar("fake_backend", default=None)
+
+
+class _FakeInvoice(NamedTuple):
+    amount: float
+    paid_at: float | None
+    """Monotonic time at which invoice becomes PAID, None if it never does."""
+    expires_at: float
+    """Monotonic time at which unpaid invoice becomes EXPIRED."""
+
+    def is_paid(self, now: float) -> bool:
+        return self.paid_at is not None and self.paid_at <= now and self.paid_at < self.expires_at
+
+
+class FakeBackend:
+    """In-memory payment provider for load tests of applications built on PyPayment.
+
+    Payment classes authorized inside fake_providers() block create and check payments here,
+    without network or valid credentials. Every invoice gets a timeline on creation: it is paid after
+    a random time with pay_rate probability, otherwise it expires.
+
+    >>> backend = FakeBackend(latency=lambda: random.lognormvariate(-3, 0.5), failure_rate=0.01, time_to_pay=5)
+    >>> with fake_providers(backend):
+    ...     QiwiPayment.authorize(secret_key="fake")
+    """
+
+    def __init__(
+        self,
+        latency: Duration = 0.0,
+        failure_rate: float = 0.0,
+        *,
+        pay_rate: float = 0.9,
+        time_to_pay: Duration = 30.0,
+        lifetime: float = 3600.0,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize FakeBackend class.
+
+        :param latency: Simulated latency of every request.
+        :param failure_rate: Share of requests failing with PaymentCreationError, PaymentGettingError
+            or AuthorizationError (0-1).
+        :param pay_rate: Share of invoices that get paid (0-1).
+        :param time_to_pay: Time from creation to payment of paid invoices.
+        :param lifetime: Seconds after which unpaid invoice expires, unless payment has its own expiration time.
+        :param seed: Seed of random generator, for reproducible runs.
+        """
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.pay_rate = pay_rate
+        self.time_to_pay = time_to_pay
+        self.lifetime = lifetime
+        self._random = random.Random(seed)  # noqa: S311
+        self._invoices: dict[Hashable, _FakeInvoice] = {}
+
+    def create(self, payment: Payment) -> str:
+        """Store invoice of payment and return its URL.
+
+        :raise PaymentCreationError: When simulated failure happens.
+        """
+        self._simulate_request(PaymentCreationError)
+
+        now = time.monotonic()
+        is_paid = self._random.random() < self.pay_rate
+        lifetime = (payment.expires_at - payment.created_at).total_seconds() if payment.expires_at else self.lifetime
+        self._invoices[type(payment), payment.id] = _FakeInvoice(
+            amount=payment.amount,
+            paid_at=now + self._get_duration(self.time_to_pay) if is_paid else None,
+            expires_at=now + lifetime,
+        )
+        return f"https://pypayment.invalid/{type(payment).__name__}/{payment.id}"
+
+    def get_status_and_income(self, payment_class: type[Payment], payment_id: str) -> tuple[PaymentStatus, float]:
+        """Return status and income of stored invoice at the current point of its timeline.
+
+        :raise PaymentNotFound: When invoice was not created.
+        :raise PaymentGettingError: When simulated failure happens.
+        """
+        self._simulate_request(PaymentGettingError)
+
+        invoice = self._invoices.get((payment_class, payment_id))
+        if invoice is None:
+            raise PaymentNotFound(f"Payment with id {payment_id} not found.")
+
+        now = time.monotonic()
+        if invoice.is_paid(now):
+            return PaymentStatus.PAID, invoice.amount
+        if invoice.expires_at <= now:
+            return PaymentStatus.EXPIRED, 0.0
+        return PaymentStatus.WAITING, 0.0
+
+    def get_balance(self, payment_class: type[Payment]) -> float:
+        """Return sum of paid invoices of payment class.
+
+        :raise PaymentGettingError: When simulated failure happens.
+        """
+        self._simulate_request(PaymentGettingError)
+
+        now = time.monotonic()
+        return sum(
+            invoice.amount
+            for (invoice_class, _), invoice in list(self._invoices.items())
+            if invoice_class is payment_class and invoice.is_paid(now)
+        )
+
+    def probe(self) -> None:
+        """Simulate a credentials check request.
+
+        :raise AuthorizationError: When simulated failure happens.
+        """
+        self._simulate_request(AuthorizationError)
+
+    def clear(self) -> None:
+        """Forget all invoices."""
+        self._invoices.clear()
+
+    def _simulate_request(self, error: type[Exception]) -> None:
+        latency = self._get_duration(self.latency)
+        if latency > 0:
+            remaining = get_remaining_time()
+            if remaining is not None and remaining < latency:
+                time.sleep(max(0.0, remaining))
+                raise DeadlineExceeded("Deadline passed during simulated request.")
+            time.sleep(latency)
+
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise error("Simulated failure.")
+
+    @staticmethod
+    def _get_duration(duration: Duration) -> float:
+        return duration() if callable(duration) else duration
+
+
+def get_fake_backend() -> FakeBackend | None:
+    """Return backend that authorize() calls of the current context switch payment classes to."""
+    return _fake_backend.get()
+
+
+@contextmanager
+def fake_providers(backend: FakeBackend | None = None) -> Iterator[FakeBackend]:
+    """Switch payment classes authorized inside the block to an in-memory fake backend.
+
+    Classes stay fake after the block, until they are authorized again outside of it.
+    No requests are made and credentials are not checked.
+
+    :param backend: Backend to use (default: new FakeBackend with default settings).
+    """
+    backend = backend or FakeBackend()
+    token = _fake_backend.set(backend)
+    try:
+        yield backend
+    finally:
+        _fake_backend.reset(token)
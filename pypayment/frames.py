@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import math
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import TYPE_CHECKING, Any
+
+from pypayment.enums.status import PaymentStatus
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Iterable, Sequence
+
+    from pypayment import Payment
+
+    Column = array | np.ndarray
+    """Column of NumPy or standard library array."""
+
+_CATEGORIES = ("status", "provider", "method", "currency")
+_TYPECODES = {"status": "i", "provider": "i", "method": "i", "currency": "i", "amount": "d", "income": "d"}
+
+
+class PaymentFrame:
+    """Payments stored column by column in typed arrays, for fast analytics over millions of payments.
+
+    Status, provider, method and currency are stored as integer codes of their labels,
+    amount and income as floats (unknown income is NaN). Operations are vectorized with NumPy
+    when it is installed, and run over standard library arrays otherwise. Frames are immutable.
+
+    >>> frame = PaymentFrame.from_payments(payments)
+    >>> paid = frame.filter(status=PaymentStatus.PAID)
+    >>> paid.sum("income")
+    >>> paid.group_by("provider", "currency").sum("income")
+    """
+
+    def __init__(self, columns: dict[str, Column], labels: dict[str, list[Hashable]]) -> None:
+        """Initialize PaymentFrame class. Use from_payments() to create frames."""
+        self._columns = columns
+        self._labels = labels
+
+    @classmethod
+    def from_payments(cls, payments: Iterable[Payment]) -> PaymentFrame:
+        """Create frame from payments.
+
+        :param payments: Payments of any classes.
+        """
+        columns = {name: array(typecode) for name, typecode in _TYPECODES.items()}
+        labels: dict[str, list[Hashable]] = {name: [] for name in _CATEGORIES}
+        labels["status"] = list(PaymentStatus)
+        codes: dict[str, dict[Hashable, int]] = {name: {} for name in _CATEGORIES}
+
+        def encode(category: str, label: Hashable) -> int:
+            code = codes[category].get(label)
+            if code is None:
+                code = codes[category][label] = len(labels[category])
+                labels[category].append(label)
+            return code
+
+        status, provider, method, currency = (columns[name].append for name in _CATEGORIES)
+        amount, income = columns["amount"].append, columns["income"].append
+        for payment in payments:
+            status(payment.status.value)
+            provider(encode("provider", type(payment).__name__))
+            method(encode("method", payment._get_method()))  # noqa: SLF001
+            currency(encode("currency", payment._get_currency()))  # noqa: SLF001
+            amount(payment.amount)
+            income(math.nan if payment.income is None else payment.income)
+
+        if np is not None:
+            columns = {name: np.frombuffer(column, dtype=column.typecode) for name, column in columns.items()}
+        return cls(columns, labels)
+
+    def __len__(self) -> int:
+        """Return number of payments."""
+        return len(self._columns["amount"])
+
+    def get_column(self, name: str) -> Column:
+        """Return column as NumPy array, or as array.array if NumPy is not installed.
+
+        :param name: One of status, provider, method, currency (integer codes), amount or income.
+        """
+        return self._columns[name]
+
+    def get_labels(self, category: str) -> list[Hashable]:
+        """Return labels of category codes, so that code of label is its index.
+
+        Labels are PaymentStatus members, provider class names, payment method names and currency codes.
+        Method and currency are None for payments that do not set them.
+        """
+        return list(self._labels[category])
+
+    def filter(
+        self,
+        status: PaymentStatus | Iterable[PaymentStatus] | None = None,
+        provider: type[Payment] | str | Iterable[type[Payment] | str] | None = None,
+        method: str | Iterable[str] | None = None,
+        currency: str | Iterable[str] | None = None,
+    ) -> PaymentFrame:
+        """Return frame of payments matching all passed conditions.
+
+        Every condition is a label or a collection of labels, payment matches if it has any of them.
+        """
+        conditions = {"status": status, "provider": provider, "method": method, "currency": currency}
+        selected = {
+            category: self._get_codes(category, value) for category, value in conditions.items() if value is not None
+        }
+        if not selected:
+            return self
+
+        if np is not None:
+            mask = np.ones(len(self), dtype=bool)
+            for category, category_codes in selected.items():
+                mask &= np.isin(self._columns[category], list(category_codes))
+            columns = {name: column[mask] for name, column in self._columns.items()}
+        else:
+            selectors: list[bool] | None = None
+            for category, category_codes in selected.items():
+                matches = [code in category_codes for code in self._columns[category]]
+                if selectors is not None:
+                    matches = [a and b for a, b in zip(selectors, matches)]  # noqa: B905
+                selectors = matches
+            columns = {
+                name: array(column.typecode, compress(column, selectors or []))
+                for name, column in self._columns.items()
+            }
+        return PaymentFrame(columns, self._labels)
+
+    def sum(self, column: str = "income") -> float:
+        """Return sum of amount or income column. Unknown incomes are skipped."""
+        values = self._columns[column]
+        if np is not None:
+            return float(np.nansum(values))
+        return math.fsum(value for value in values if not math.isnan(value))
+
+    def count(self) -> int:
+        """Return number of payments."""
+        return len(self)
+
+    def group_by(self, *categories: str) -> PaymentGroups:
+        """Group payments by one or more of status, provider, method and currency.
+
+        :param categories: Categories to group by.
+        """
+        for category in categories:
+            if category not in _CATEGORIES:
+                raise ValueError(f"Can not group by {category}, choose from {', '.join(_CATEGORIES)}.")
+        if not categories:
+            raise ValueError("Choose at least one category to group by.")
+        return PaymentGroups(self, categories)
+
+    def _get_codes(self, category: str, value: Any) -> set[int]:  # noqa: ANN401
+        if isinstance(value, (str, PaymentStatus, type)) or value is None:
+            value = [value]
+        labels = [label.__name__ if isinstance(label, type) else label for label in value]
+        return {code for code, label in enumerate(self._labels[category]) if label in labels}
+
+
+class PaymentGroups:
+    """Payments of a frame grouped by categories, aggregated with count() and sum()."""
+
+    def __init__(self, frame: PaymentFrame, categories: Sequence[str]) -> None:
+        """Initialize PaymentGroups class. Use PaymentFrame.group_by() to create groups."""
+        self._frame = frame
+        self._categories = categories
+
+    def count(self) -> dict[Hashable, int]:
+        """Return number of payments in every non-empty group.
+
+        Groups are keyed by label, or by tuple of labels if grouped by several categories.
+        """
+        return {key: int(value) for key, value in self._aggregate(None).items()}
+
+    def sum(self, column: str = "income") -> dict[Hashable, float]:
+        """Return sum of amount or income column in every non-empty group. Unknown incomes are skipped."""
+        return self._aggregate(column)
+
+    def _aggregate(self, column: str | None) -> dict[Hashable, float]:
+        """Return count, or sum of column, of every non-empty group."""
+        frame = self._frame
+        columns = [frame.get_column(category) for category in self._categories]
+        labels = [frame.get_labels(category) for category in self._categories]
+        sizes = [len(category_labels) for category_labels in labels]
+        values = frame.get_column(column) if column else None
+
+        if np is not None:
+            keys = np.zeros(len(frame), dtype=np.int64)
+            for category_column, size in zip(columns, sizes):  # noqa: B905
+                keys = keys * size + category_column
+            weights = np.nan_to_num(values) if values is not None else None
+            totals = np.bincount(keys, weights=weights, minlength=math.prod(sizes))
+            present = np.bincount(keys, minlength=math.prod(sizes)).nonzero()[0]
+            grouped = dict(zip(present.tolist(), totals[present].tolist()))  # noqa: B905
+        else:
+            group_keys: Sequence[int] = columns[0]
+            for category_column, size in zip(columns[1:], sizes[1:]):  # noqa: B905
+                group_keys = [key * size + code for key, code in zip(group_keys, category_column)]  # noqa: B905
+
+            grouped = dict.fromkeys(sorted(set(group_keys)), 0.0)
+            if values is None:
+                for key, count in Counter(group_keys).items():
+                    grouped[key] = float(count)
+            else:
+                for key, value in zip(group_keys, values):  # noqa: B905
+                    if not math.isnan(value):
+                        grouped[key] += value
+
+        return {self._decode(key, labels, sizes): value for key, value in grouped.items()}
+
+    @staticmethod
+    def _decode(key: int, labels: list[list[Hashable]], sizes: list[int]) -> Hashable:
+        row = []
+        for category_labels, size in zip(reversed(labels), reversed(sizes)):  # noqa: B905
+            key, code = divmod(key, size)
+            row.append(category_labels[code])
+        return row[0] if len(row) == 1 else tuple(reversed(row))
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from pypayment import PaymentGettingError, PaymentStatus
+from pypayment.payment import Payment
+from pypayment.timeouts import DeadlineExceeded
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Iterable, Iterator
+
+    from pypayment.polling import PollTarget
+
+
+class BalanceGate:
+    """Skip status checks of merchants whose balance has not changed since the previous tick.
+
+    If balance is the same, no pending payment of the merchant can have been paid, so only payments
+    with due expiration are checked. Balance is requested once per merchant per tick.
+    Providers without balance API, and merchants whose balance request fails, are always checked.
+
+    Balance may stay the same when a payment and a withdrawal of the same amount happen between two ticks,
+    so every merchant is still checked in full at least once per max_quiet_time.
+
+    >>> gate = BalanceGate()
+    >>> for result in poller.poll(gate.filter(pending_payments)):
+    ...     ...
+    """
+
+    def __init__(self, max_quiet_time: timedelta = timedelta(minutes=10)) -> None:
+        """Initialize BalanceGate class.
+
+        :param max_quiet_time: Maximum time between two full checks of a merchant.
+        """
+        self.max_quiet_time = max_quiet_time
+        self._balances: dict[Hashable, tuple[float, float]] = {}
+        """Merchant keys mapped to the last balance and time of the last full check."""
+        self._lock = Lock()
+
+    def filter(self, targets: Iterable[Payment | PollTarget]) -> Iterator[Payment | PollTarget]:
+        """Yield targets that need a status check in this tick.
+
+        New balances are saved only when all targets have been iterated,
+        so an interrupted tick is repeated in full.
+
+        :param targets: Payments or PollTarget tuples of authorized payment classes.
+        """
+        open_merchants: dict[Hashable, bool] = {}
+        new_balances: dict[Hashable, float] = {}
+
+        for target in targets:
+            payment_class, expires_at = self._unpack(target)
+            key = (payment_class, payment_class._get_credentials())  # noqa: SLF001
+
+            if key not in open_merchants:
+                open_merchants[key] = self._check_balance(key, payment_class, new_balances)
+
+            if open_merchants[key] or self._is_expiration_due(expires_at):
+                yield target
+
+        now = time.monotonic()
+        with self._lock:
+            for key, balance in new_balances.items():
+                full_check_time = now if open_merchants[key] else self._balances[key][1]
+                self._balances[key] = (balance, full_check_time)
+
+    def reset(self) -> None:
+        """Forget saved balances, so every merchant is checked in full on the next tick."""
+        with self._lock:
+            self._balances.clear()
+
+    def _check_balance(self, key: Hashable, payment_class: type[Payment], new_balances: dict[Hashable, float]) -> bool:
+        """Request merchant balance and return True if its payments need a full check."""
+        try:
+            balance = payment_class.get_balance()
+        except (NotImplementedError, PaymentGettingError, DeadlineExceeded, ValueError):
+            return True
+
+        new_balances[key] = balance
+        with self._lock:
+            previous = self._balances.get(key)
+
+        if previous is None or previous[0] != balance:
+            return True
+        return time.monotonic() - previous[1] >= self.max_quiet_time.total_seconds()
+
+    @staticmethod
+    def _unpack(target: Payment | PollTarget) -> tuple[type[Payment], datetime | None]:
+        if isinstance(target, Payment):
+            return type(target), target.expires_at if target.status == PaymentStatus.WAITING else None
+        return target.payment_class, target.expires_at
+
+    @staticmethod
+    def _is_expiration_due(expires_at: datetime | None) -> bool:
+        return expires_at is not None and expires_at <= datetime.now(timezone.utc)  # noqa: UP017
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from threading import Event, Lock, Thread
+from typing import TYPE_CHECKING
+
+from pypayment.enums.priority import RequestPriority
+from pypayment.scheduling import request_priority
+from pypayment.timeouts import Timeout, deadline, request_timeout
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from pypayment import Payment
+
+
+@dataclass
+class ProviderHealth:
+    """Health of a provider computed from recent probes."""
+
+    provider: str
+    healthy: bool
+    """Provider has been probed and error rate is below the monitor threshold."""
+    samples: int
+    """Number of probes in the window."""
+    error_rate: float
+    """Share of failed probes in the window (0-1)."""
+    latency_p50: float | None
+    """Median latency of successful probes in seconds."""
+    latency_p95: float | None
+    """95th percentile latency of successful probes in seconds."""
+    last_error: str | None
+    """Error of the latest probe, None if it succeeded."""
+    checked_at: datetime | None
+    """Time of the latest probe."""
+
+
+class HealthMonitor:
+    """Probe providers in background and keep rolling latency and error rate windows.
+
+    Probes are cheap read-only requests (ping, account info, balance or payment methods).
+    Health snapshots are recomputed after every probe, so reading them costs nothing.
+
+    >>> with HealthMonitor([QiwiPayment, YooMoneyPayment], interval=30) as monitor:
+    ...     if not monitor.is_ready():
+    ...         ...
+    """
+
+    def __init__(
+        self,
+        payment_classes: Sequence[type[Payment]],
+        interval: float = 30,
+        window: int = 20,
+        timeout: Timeout | float = Timeout(2, 5),  # noqa: B008
+        max_error_rate: float = 0.5,
+    ) -> None:
+        """Initialize HealthMonitor class.
+
+        :param payment_classes: Authorized payment classes to probe.
+        :param interval: Seconds between probes of every provider.
+        :param window: Number of recent probes health is computed from.
+        :param timeout: Timeout of a probe.
+        :param max_error_rate: Error rate from which provider is considered unhealthy (0-1).
+        """
+        self.interval = interval
+        self.timeout = timeout if isinstance(timeout, Timeout) else Timeout(timeout, timeout)
+        self.max_error_rate = max_error_rate
+        self._classes = list(payment_classes)
+        self._probes: dict[type[Payment], deque[tuple[float, str | None]]] = {
+            payment_class: deque(maxlen=window) for payment_class in self._classes
+        }
+        self._health: Mapping[type[Payment], ProviderHealth] = {
+            payment_class: self._compute(payment_class, (), None) for payment_class in self._classes
+        }
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread: Thread | None = None
+
+    def get(self, payment_class: type[Payment]) -> ProviderHealth:
+        """Return the latest health of provider."""
+        return self._health[payment_class]
+
+    def snapshot(self) -> dict[str, ProviderHealth]:
+        """Return the latest health of every provider by class name."""
+        return {payment_class.__name__: health for payment_class, health in self._health.items()}
+
+    def is_ready(self, payment_classes: Iterable[type[Payment]] | None = None) -> bool:
+        """Return True if every provider, or every given provider, is healthy."""
+        health = self._health
+        return all(health[payment_class].healthy for payment_class in payment_classes or health)
+
+    def probe(self) -> None:
+        """Probe every provider once, concurrently, and update health."""
+        with ThreadPoolExecutor(max_workers=len(self._classes) or 1, thread_name_prefix="pypayment-health") as pool:
+            results = dict(zip(self._classes, pool.map(self._probe, self._classes)))  # noqa: B905
+
+        checked_at = datetime.now(timezone.utc)  # noqa: UP017
+        with self._lock:
+            health = dict(self._health)
+            for payment_class, result in results.items():
+                probes = self._probes[payment_class]
+                probes.append(result)
+                health[payment_class] = self._compute(payment_class, probes, checked_at)
+            self._health = health
+
+    def start(self) -> None:
+        """Start probing in a background thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name="pypayment-health-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop background probing."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> HealthMonitor:  # noqa: PYI034
+        """Start probing."""
+        self.start()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Stop probing."""
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            started_at = time.monotonic()
+            self.probe()
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started_at)))
+
+    def _probe(self, payment_class: type[Payment]) -> tuple[float, str | None]:
+        """Return latency and error of one probe, sent in BACKGROUND lane so it never delays payment creation."""
+        background = request_priority(RequestPriority.BACKGROUND)
+        started_at = time.monotonic()
+        try:
+            with background, request_timeout(self.timeout), deadline(self.timeout.connect + self.timeout.read):
+                payment_class._probe()  # noqa: SLF001
+        except Exception as e:  # noqa: BLE001
+            return time.monotonic() - started_at, str(e) or repr(e.__cause__ or e)
+        return time.monotonic() - started_at, None
+
+    def _compute(
+        self,
+        payment_class: type[Payment],
+        probes: Iterable[tuple[float, str | None]],
+        checked_at: datetime | None,
+    ) -> ProviderHealth:
+        probes = list(probes)
+        latencies = sorted(latency for latency, error in probes if error is None)
+        errors = sum(1 for _, error in probes if error is not None)
+        error_rate = errors / len(probes) if probes else 0.0
+
+        return ProviderHealth(
+            provider=payment_class.__name__,
+            healthy=bool(probes) and error_rate < self.max_error_rate,
+            samples=len(probes),
+            error_rate=error_rate,
+            latency_p50=_get_percentile(latencies, 50),
+            latency_p95=_get_percentile(latencies, 95),
+            last_error=probes[-1][1] if probes else None,
+            checked_at=checked_at,
+        )
+
+
+def _get_percentile(values: Sequence[float], percentile: float) -> float | None:
+    """Return percentile of sorted values, or None if there are no values."""
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(len(values) * percentile / 100))]
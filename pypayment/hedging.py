@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import time
+from bisect import bisect_left, insort
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+T = TypeVar("T")
+
+
+class Hedger:
+    """Send a duplicate of a slow read-only request and take whichever answer arrives first.
+
+    Duplicate is sent when the first request takes longer than the chosen percentile of recently observed latency.
+    Number of duplicates never exceeds budget share of all requests. The first request starts in its own thread
+    right away, so time spent waiting for a free worker never triggers a duplicate. Latency of the request
+    whose answer is taken is observed.
+
+    >>> QiwiPayment.set_hedging(Hedger(percentile=95, budget=0.05))
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        budget: float = 0.05,
+        *,
+        window: int = 1000,
+        min_samples: int = 20,
+        initial_delay: float = 1.0,
+        max_workers: int = 32,
+    ) -> None:
+        """Initialize Hedger class.
+
+        :param percentile: Latency percentile after which duplicate is sent (0-100).
+        :param budget: Maximum share of requests that may be duplicated (0-1).
+        :param window: Number of recent latencies the percentile is computed from.
+        :param min_samples: Number of observed latencies required before percentile is used.
+        :param initial_delay: Delay in seconds before duplicate is sent while there are not enough samples.
+        :param max_workers: Maximum number of threads running duplicates.
+        """
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self._latencies: deque[float] = deque(maxlen=window)
+        """Recent latencies in order of observation."""
+        self._sorted_latencies: list[float] = []
+        """The same latencies kept sorted, so percentile is read without sorting the window."""
+        self._delay = initial_delay
+        self._requests = 0
+        self._hedges = 0
+        self._lock = Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pypayment-hedging")
+
+    @property
+    def delay(self) -> float:
+        """Current delay in seconds before duplicate is sent."""
+        return self._delay
+
+    @property
+    def hedge_ratio(self) -> float:
+        """Share of requests that were duplicated."""
+        return self._hedges / self._requests if self._requests else 0.0
+
+    def call(self, function: Callable[[], T]) -> T:
+        """Run function, duplicating it if it is slow, and return the first successful result.
+
+        :param function: Read-only function safe to run twice.
+        """
+        with self._lock:
+            self._requests += 1
+            delay = self._delay
+
+        primary = self._start_primary(function)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._spend_budget():
+            return self._finish(primary)
+
+        hedge = self._executor.submit(copy_context().run, _timed, function)
+        done, pending = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        first = done.pop()
+        if first.exception() is not None and pending:
+            return self._finish(pending.pop())
+        return self._finish(first)
+
+    @staticmethod
+    def _start_primary(function: Callable[[], T]) -> Future[tuple[T, float]]:
+        """Run function in a new thread, so it does not wait behind duplicates in the worker pool."""
+        future: Future[tuple[T, float]] = Future()
+        context = copy_context()
+
+        def run() -> None:
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(context.run(_timed, function))
+            except BaseException as e:  # noqa: BLE001
+                future.set_exception(e)
+
+        Thread(target=run, name="pypayment-hedging-primary", daemon=True).start()
+        return future
+
+    def _spend_budget(self) -> bool:
+        with self._lock:
+            if self._hedges + 1 > self._requests * self.budget:
+                return False
+            self._hedges += 1
+            return True
+
+    def _finish(self, future: Future[tuple[T, float]]) -> T:
+        result, latency = future.result()
+        self._observe(latency)
+        return result
+
+    def _observe(self, latency: float) -> None:
+        with self._lock:
+            latencies = self._sorted_latencies
+            if len(self._latencies) == self._latencies.maxlen:
+                del latencies[bisect_left(latencies, self._latencies[0])]
+            self._latencies.append(latency)
+            insort(latencies, latency)
+            if len(latencies) < self.min_samples:
+                return
+
+            index = min(len(latencies) - 1, int(len(latencies) * self.percentile / 100))
+            self._delay = latencies[index]
+
+
+def _timed(function: Callable[[], T]) -> tuple[T, float]:
+    """Return result of function and its latency in seconds."""
+    started_at = time.monotonic()
+    result = function()
+    return result, time.monotonic() - started_at
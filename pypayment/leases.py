@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import os
+import socket
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from threading import Event, Lock, Thread
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from pypayment.exceptions import LeaseLost
+from pypayment.payment import Payment
+from pypayment.polling import PollTarget
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+    from pathlib import Path
+
+
+class LeaseStore(ABC):
+    """Shared storage of pending payments and leases on them.
+
+    Items are (payment class name, payment ID) pairs, registered and claimed with expiration timestamp of payment.
+    """
+
+    @abstractmethod
+    def add(self, items: Iterable[tuple[str, str, float | None]]) -> None:
+        """Register pending payments. Already registered payments are left as is.
+
+        :param items: Payment class name, payment ID and expiration timestamp of payment (None if it does not expire).
+        """
+
+    @abstractmethod
+    def remove(self, items: Iterable[tuple[str, str]]) -> None:
+        """Forget payments that do not need polling anymore."""
+
+    @abstractmethod
+    def claim(
+        self,
+        node_id: str,
+        limit: int,
+        lease_duration: float,
+        interval: float,
+    ) -> list[tuple[str, str, float | None]]:
+        """Lease up to limit payments that are not leased and were not checked within interval.
+
+        Returns payment class name, payment ID and expiration timestamp of every leased payment.
+
+        :param node_id: ID of claiming node.
+        :param limit: Maximum number of payments to lease.
+        :param lease_duration: Seconds after which lease expires unless renewed.
+        :param interval: Minimum number of seconds between two checks of a payment.
+        """
+
+    @abstractmethod
+    def renew(self, node_id: str, items: Iterable[tuple[str, str]], lease_duration: float) -> int:
+        """Extend leases held by node and return number of extended leases."""
+
+    @abstractmethod
+    def complete(self, node_id: str, items: Iterable[tuple[str, str]]) -> None:
+        """Mark payments leased by node as checked now and release their leases."""
+
+    @abstractmethod
+    def release(self, node_id: str, items: Iterable[tuple[str, str]]) -> None:
+        """Release leases held by node without marking payments as checked."""
+
+
+class SQLiteLeaseStore(LeaseStore):
+    """Lease storage in a SQLite database.
+
+    SQLite file locking makes claims atomic between processes sharing the file,
+    so it works for several pollers on one host or on a shared volume with working locks.
+    """
+
+    def __init__(self, path: str | Path, timeout: float = 30) -> None:
+        """Initialize SQLiteLeaseStore class.
+
+        :param path: Path to database file. Created if it does not exist.
+        :param timeout: Seconds to wait for a lock held by another process.
+        """
+        self._connection = sqlite3.connect(str(path), timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._lock = Lock()
+        with self._lock:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                "provider TEXT NOT NULL, "
+                "payment_id TEXT NOT NULL, "
+                "owner TEXT, "
+                "expires_at REAL, "
+                "checked_at REAL, "
+                "payment_expires_at REAL, "
+                "PRIMARY KEY (provider, payment_id))",
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS leases_checked_at ON leases (checked_at)")
+            columns = {row[1] for row in self._connection.execute("PRAGMA table_info(leases)")}
+            if "payment_expires_at" not in columns:
+                self._connection.execute("ALTER TABLE leases ADD COLUMN payment_expires_at REAL")
+
+    def add(self, items: Iterable[tuple[str, str, float | None]]) -> None:
+        with self._transaction() as cursor:
+            cursor.executemany(
+                "INSERT OR IGNORE INTO leases (provider, payment_id, payment_expires_at) VALUES (?, ?, ?)",
+                items,
+            )
+
+    def remove(self, items: Iterable[tuple[str, str]]) -> None:
+        with self._transaction() as cursor:
+            cursor.executemany("DELETE FROM leases WHERE provider = ? AND payment_id = ?", items)
+
+    def claim(
+        self,
+        node_id: str,
+        limit: int,
+        lease_duration: float,
+        interval: float,
+    ) -> list[tuple[str, str, float | None]]:
+        now = time.time()
+        with self._transaction() as cursor:
+            rows = cursor.execute(
+                "SELECT rowid, provider, payment_id, payment_expires_at FROM leases "
+                "WHERE (owner IS NULL OR expires_at < ?) AND (checked_at IS NULL OR checked_at <= ?) "
+                "ORDER BY checked_at IS NOT NULL, checked_at LIMIT ?",
+                (now, now - interval, limit),
+            ).fetchall()
+            cursor.executemany(
+                "UPDATE leases SET owner = ?, expires_at = ? WHERE rowid = ?",
+                [(node_id, now + lease_duration, row[0]) for row in rows],
+            )
+        return [(provider, payment_id, payment_expires_at) for _, provider, payment_id, payment_expires_at in rows]
+
+    def renew(self, node_id: str, items: Iterable[tuple[str, str]], lease_duration: float) -> int:
+        expires_at = time.time() + lease_duration
+        with self._transaction() as cursor:
+            cursor.executemany(
+                "UPDATE leases SET expires_at = ? WHERE provider = ? AND payment_id = ? AND owner = ?",
+                [(expires_at, provider, payment_id, node_id) for provider, payment_id in items],
+            )
+            return cursor.rowcount
+
+    def complete(self, node_id: str, items: Iterable[tuple[str, str]]) -> None:
+        now = time.time()
+        with self._transaction() as cursor:
+            cursor.executemany(
+                "UPDATE leases SET owner = NULL, expires_at = NULL, checked_at = ? "
+                "WHERE provider = ? AND payment_id = ? AND owner = ?",
+                [(now, provider, payment_id, node_id) for provider, payment_id in items],
+            )
+
+    def release(self, node_id: str, items: Iterable[tuple[str, str]]) -> None:
+        with self._transaction() as cursor:
+            cursor.executemany(
+                "UPDATE leases SET owner = NULL, expires_at = NULL WHERE provider = ? AND payment_id = ? AND owner = ?",
+                [(provider, payment_id, node_id) for provider, payment_id in items],
+            )
+
+    def close(self) -> None:
+        """Close database connection."""
+        with self._lock:
+            self._connection.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            else:
+                cursor.execute("COMMIT")
+            finally:
+                cursor.close()
+
+
+class LeaseCoordinator:
+    """Split pending payments between polling nodes, so every payment is checked by one node per interval.
+
+    >>> coordinator = LeaseCoordinator(SQLiteLeaseStore("leases.db"), [QiwiPayment], interval=60)
+    >>> coordinator.add(pending_payments)
+    >>> with coordinator.claim(1000) as targets:
+    ...     for result in poller.poll(targets):
+    ...         ...
+    """
+
+    def __init__(
+        self,
+        store: LeaseStore,
+        payment_classes: Sequence[type[Payment]],
+        interval: float = 60,
+        lease_duration: float = 60,
+        node_id: str | None = None,
+    ) -> None:
+        """Initialize LeaseCoordinator class.
+
+        :param store: Shared lease storage.
+        :param payment_classes: Payment classes of polled payments.
+        :param interval: Minimum number of seconds between two checks of a payment.
+        :param lease_duration: Seconds after which lease of a dead node expires. Live leases are renewed.
+        :param node_id: Unique ID of this node (default: host name, process ID and random suffix).
+        """
+        self.store = store
+        self.interval = interval
+        self.lease_duration = lease_duration
+        self.node_id = node_id or f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._payment_classes = {payment_class.__name__: payment_class for payment_class in payment_classes}
+
+    def add(self, targets: Iterable[Payment | PollTarget]) -> None:
+        """Register pending payments."""
+        self.store.add(self._to_items(targets))
+
+    def remove(self, targets: Iterable[Payment | PollTarget]) -> None:
+        """Forget settled payments."""
+        self.store.remove(item[:2] for item in self._to_items(targets))
+
+    @contextmanager
+    def claim(self, limit: int) -> Iterator[list[PollTarget]]:
+        """Lease a batch of payments due for a check.
+
+        Leases are renewed in background while the block runs. On normal exit payments are marked as checked,
+        on exception leases are released, so other nodes may pick the payments up right away.
+
+        :param limit: Maximum number of payments to lease.
+
+        :raise LeaseLost: On exit, when some leases could not be renewed in time. Leases still held are released
+            and payments are not marked as checked, since other nodes may have checked them meanwhile.
+        """
+        claimed = self.store.claim(self.node_id, limit, self.lease_duration, self.interval)
+        items = [(provider, payment_id) for provider, payment_id, _ in claimed]
+        renewal = _Renewal()
+        renewer = Thread(target=self._renew, args=(items, renewal), daemon=True)
+        renewer.start()
+
+        try:
+            yield [
+                PollTarget(self._payment_classes[provider], payment_id, self._to_datetime(expires_at))
+                for provider, payment_id, expires_at in claimed
+            ]
+        except BaseException:
+            renewal.stop()
+            renewer.join()
+            self.store.release(self.node_id, items)
+            raise
+
+        renewal.stop()
+        renewer.join()
+        if renewal.lost:
+            self.store.release(self.node_id, items)
+            raise LeaseLost(f"Leases of {self.node_id} could not be renewed.") from renewal.error
+        self.store.complete(self.node_id, items)
+
+    def _renew(self, items: list[tuple[str, str]], renewal: _Renewal) -> None:
+        while not renewal.stopped.wait(self.lease_duration / 3):
+            try:
+                renewed = self.store.renew(self.node_id, items, self.lease_duration)
+            except Exception as e:  # noqa: BLE001
+                renewal.error = e
+                renewed = -1
+            if renewed < len(items):
+                renewal.lost = True
+                return
+
+    @staticmethod
+    def _to_items(targets: Iterable[Payment | PollTarget]) -> Iterator[tuple[str, str, float | None]]:
+        for target in targets:
+            if isinstance(target, Payment):
+                payment_class, payment_id = type(target), target.id
+            else:
+                payment_class, payment_id = target.payment_class, target.payment_id
+            yield payment_class.__name__, payment_id, target.expires_at.timestamp() if target.expires_at else None
+
+    @staticmethod
+    def _to_datetime(timestamp: float | None) -> datetime | None:
+        return datetime.fromtimestamp(timestamp, timezone.utc) if timestamp is not None else None  # noqa: UP017
+
+
+class _Renewal:
+    """State of background lease renewal."""
+
+    def __init__(self) -> None:
+        self.stopped = Event()
+        self.lost = False
+        """Some leases were not renewed, or renewal failed."""
+        self.error: Exception | None = None
+
+    def stop(self) -> None:
+        self.stopped.set()
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from pypayment.enums.status import PaymentStatus
+from pypayment.events import PaymentStatusChanged, payment_events
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from pypayment import Payment
+
+    NotificationKey = tuple[str, str, str]
+    """Provider name, payment ID and status of a notification."""
+
+
+class NotificationStore(ABC):
+    """Storage of recently processed provider notifications."""
+
+    @abstractmethod
+    def add(self, key: NotificationKey, now: float, window: float) -> bool:
+        """Remember notification and return True, or return False if it was already added within window seconds.
+
+        Check and insert are atomic, so of concurrent calls with the same key only one returns True.
+        """
+
+    @abstractmethod
+    def contains(self, key: NotificationKey, now: float, window: float) -> bool:
+        """Return True if notification was added within window seconds, without adding it."""
+
+    @abstractmethod
+    def discard(self, key: NotificationKey) -> None:
+        """Forget notification, so its next delivery is processed again."""
+
+
+class MemoryNotificationStore(NotificationStore):
+    """Bounded in-memory storage of notifications of this process.
+
+    Oldest notifications are dropped when maxsize is reached, even if their window has not passed.
+    """
+
+    def __init__(self, maxsize: int = 100_000) -> None:
+        """Initialize MemoryNotificationStore class.
+
+        :param maxsize: Maximum number of remembered notifications.
+        """
+        self.maxsize = maxsize
+        self._added_at: OrderedDict[NotificationKey, float] = OrderedDict()
+        """Notification keys mapped to time they were added, oldest first."""
+        self._lock = Lock()
+
+    def add(self, key: NotificationKey, now: float, window: float) -> bool:
+        with self._lock:
+            while self._added_at:
+                oldest_key, added_at = next(iter(self._added_at.items()))
+                if now - added_at < window and len(self._added_at) < self.maxsize:
+                    break
+                del self._added_at[oldest_key]
+
+            if key in self._added_at:
+                return False
+            self._added_at[key] = now
+            return True
+
+    def contains(self, key: NotificationKey, now: float, window: float) -> bool:
+        with self._lock:
+            added_at = self._added_at.get(key)
+        return added_at is not None and now - added_at < window
+
+    def discard(self, key: NotificationKey) -> None:
+        with self._lock:
+            self._added_at.pop(key, None)
+
+
+class SQLiteNotificationStore(NotificationStore):
+    """Notification storage in a SQLite database, kept across restarts and shared between processes on one host."""
+
+    _PURGE_INTERVAL = 1000
+    """Number of additions between deletions of notifications whose window has passed."""
+
+    def __init__(self, path: str | Path, timeout: float = 30) -> None:
+        """Initialize SQLiteNotificationStore class.
+
+        :param path: Path to database file. Created if it does not exist.
+        :param timeout: Seconds to wait for a lock held by another process.
+        """
+        self._connection = sqlite3.connect(str(path), timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._lock = Lock()
+        self._additions = 0
+        with self._lock:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS notifications ("
+                "provider TEXT NOT NULL, "
+                "payment_id TEXT NOT NULL, "
+                "status TEXT NOT NULL, "
+                "added_at REAL NOT NULL, "
+                "PRIMARY KEY (provider, payment_id, status))",
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS notifications_added_at ON notifications (added_at)")
+
+    def add(self, key: NotificationKey, now: float, window: float) -> bool:
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT INTO notifications (provider, payment_id, status, added_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (provider, payment_id, status) DO UPDATE SET added_at = excluded.added_at "
+                "WHERE added_at <= ?",
+                (*key, now, now - window),
+            )
+            is_added = cursor.rowcount == 1
+
+            self._additions += 1
+            if self._additions >= self._PURGE_INTERVAL:
+                self._additions = 0
+                self._connection.execute("DELETE FROM notifications WHERE added_at <= ?", (now - window,))
+        return is_added
+
+    def contains(self, key: NotificationKey, now: float, window: float) -> bool:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM notifications WHERE provider = ? AND payment_id = ? AND status = ? AND added_at > ?",
+                (*key, now - window),
+            ).fetchone()
+        return row is not None
+
+    def discard(self, key: NotificationKey) -> None:
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM notifications WHERE provider = ? AND payment_id = ? AND status = ?",
+                key,
+            )
+
+    def close(self) -> None:
+        """Close database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class NotificationDeduplicator:
+    """Drop repeated deliveries of provider notifications.
+
+    Providers retry notifications until they get a response they like, so the same payment status
+    may arrive several times. Notification is identified by provider, payment ID and status,
+    which are cheap to read from the raw payload, so seen() drops duplicates before signature checks,
+    status requests or fulfillment.
+
+    Notification must be recorded only after its signature is verified, otherwise one forged notification
+    would make the genuine one be dropped as a duplicate. Use process() and raise inside the block
+    on invalid signature, or call mark() after verification. New verified notification of a payment class
+    with parsed PaymentStatus is published to payment_events as PaymentStatusChanged with unknown old status.
+
+    Recent notifications are kept in memory, so duplicates delivered to this process cost a dict lookup.
+    Store shared between processes, like SQLiteNotificationStore, catches the rest and survives restarts.
+
+    >>> deduplicator = NotificationDeduplicator(SQLiteNotificationStore("notifications.db"))
+    >>> with deduplicator.process(PayOkPayment, payload["payment_id"], payload["status"]) as is_new:
+    ...     if is_new:
+    ...         if not is_signature_valid(payload):
+    ...             raise InvalidSignature()
+    ...         fulfill(payload)
+    """
+
+    def __init__(
+        self,
+        store: NotificationStore | None = None,
+        window: float = 86400,
+        cache_size: int = 10_000,
+    ) -> None:
+        """Initialize NotificationDeduplicator class.
+
+        :param store: Notification storage (default: memory of this process).
+        :param window: Seconds during which repeated notification is considered a duplicate.
+        :param cache_size: Number of notifications remembered in memory in front of store.
+        """
+        self.store = store or MemoryNotificationStore()
+        self.window = window
+        self._cache = (
+            self.store if isinstance(self.store, MemoryNotificationStore) else MemoryNotificationStore(cache_size)
+        )
+
+    def seen(self, provider: type[Payment] | str, payment_id: str, status: PaymentStatus | str) -> bool:
+        """Return True if notification was recorded within window, without recording it.
+
+        Cheap check to drop duplicates before verifying signature.
+
+        :param provider: Payment class or its name.
+        :param payment_id: Payment ID as sent by provider.
+        :param status: Status as sent by provider, or parsed PaymentStatus.
+        """
+        key = self._get_key(provider, payment_id, status)
+        now = time.time()
+        if self._cache.contains(key, now, self.window):
+            return True
+        return self._cache is not self.store and self.store.contains(key, now, self.window)
+
+    def mark(
+        self,
+        provider: type[Payment] | str,
+        payment_id: str,
+        status: PaymentStatus | str,
+        income: float | None = None,
+    ) -> bool:
+        """Record notification with verified signature and return True if it was not recorded within window.
+
+        Check and record are atomic, so of concurrent deliveries only one gets True and should be processed.
+
+        :param provider: Payment class or its name.
+        :param payment_id: Payment ID as sent by provider.
+        :param status: Status as sent by provider, or parsed PaymentStatus.
+        :param income: Income as sent by provider, published with status change.
+        """
+        is_new = self._record(provider, payment_id, status)
+        if is_new:
+            self._publish(provider, payment_id, status, income)
+        return is_new
+
+    def forget(self, provider: type[Payment] | str, payment_id: str, status: PaymentStatus | str) -> None:
+        """Forget notification, so its next delivery is processed again."""
+        key = self._get_key(provider, payment_id, status)
+        self.store.discard(key)
+        self._cache.discard(key)
+
+    @contextmanager
+    def process(
+        self,
+        provider: type[Payment] | str,
+        payment_id: str,
+        status: PaymentStatus | str,
+        income: float | None = None,
+    ) -> Iterator[bool]:
+        """Record notification, return whether it is new, and forget it if the block raises, so its retry is processed.
+
+        Block must verify signature of new notification and raise if it is invalid.
+        Status change is published when the block of new notification finishes.
+
+        :param provider: Payment class or its name.
+        :param payment_id: Payment ID as sent by provider.
+        :param status: Status as sent by provider, or parsed PaymentStatus.
+        :param income: Income as sent by provider, published with status change.
+        """
+        is_new = self._record(provider, payment_id, status)
+        try:
+            yield is_new
+        except BaseException:
+            if is_new:
+                self.forget(provider, payment_id, status)
+            raise
+        if is_new:
+            self._publish(provider, payment_id, status, income)
+
+    def _record(self, provider: type[Payment] | str, payment_id: str, status: PaymentStatus | str) -> bool:
+        key = self._get_key(provider, payment_id, status)
+        now = time.time()
+        if not self._cache.add(key, now, self.window):
+            return False
+        return self._cache is self.store or self.store.add(key, now, self.window)
+
+    @staticmethod
+    def _publish(
+        provider: type[Payment] | str,
+        payment_id: str,
+        status: PaymentStatus | str,
+        income: float | None,
+    ) -> None:
+        """Publish status change of notification, if provider and status are parsed."""
+        if isinstance(provider, type) and isinstance(status, PaymentStatus):
+            payment_events.publish(PaymentStatusChanged(provider, str(payment_id), None, status, income))
+
+    @staticmethod
+    def _get_key(provider: type[Payment] | str, payment_id: str, status: PaymentStatus | str) -> NotificationKey:
+        provider_name = provider if isinstance(provider, str) else provider.__name__
+        status_name = status.name if isinstance(status, PaymentStatus) else str(status)
+        return provider_name, str(payment_id), status_name
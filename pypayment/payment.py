@@ -1,9 +1,51 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager, nullcontext
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from threading import Lock
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
 from uuid import uuid4
 
-from pypayment import NotAuthorized, PaymentNotFound, PaymentStatus
+from requests import RequestException
+
+from pypayment import NotAuthorized, PaymentCreationError, PaymentGettingError, PaymentNotFound, PaymentStatus
+from pypayment.authorization import is_authorization_deferred
+from pypayment.batch import create_many, is_creation_deferred
+from pypayment.coalescing import coalesce_status_checks, status_checks
+from pypayment.connections import prewarm
+from pypayment.enums.operation import PaymentOperation
+from pypayment.events import PaymentStatusChanged, payment_events
+from pypayment.fakes import get_fake_backend
+from pypayment.scheduling import get_request_priority
+from pypayment.timeouts import DEFAULT_TIMEOUT, Timeout, request
+from pypayment.transport import send
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping
+
+    import requests
+
+    from pypayment.batch import BatchCreationResult, P
+    from pypayment.concurrency import AdaptiveConcurrency
+    from pypayment.fakes import FakeBackend
+    from pypayment.hedging import Hedger
+    from pypayment.scheduling import RequestScheduler
+    from pypayment.sync import FeedPosition, FeedRecord
+    from pypayment.transport import HttpRequest, HttpResponse
+
+
+_EXPIRATION_GRACE = timedelta(minutes=1)
+"""Time after expiration during which provider is still asked for payment status."""
+
+
+def is_overdue(expires_at: datetime | None) -> bool:
+    """Return True if expiration time and grace period for late provider updates have passed."""
+    if expires_at is None:
+        return False
+    return datetime.now(timezone.utc) >= expires_at + _EXPIRATION_GRACE  # noqa: UP017
 
 
 class Payment(ABC):
@@ -12,6 +54,23 @@ class Payment(ABC):
     authorized = False
     """Is payment class authorized."""
 
+    _authorization_pending = False
+    _authorization_lock = Lock()
+    _hedger: Hedger | None = None
+    _concurrency: AdaptiveConcurrency | None = None
+    _scheduler: RequestScheduler | None = None
+    _expiration_duration: timedelta | None = None
+    _timeouts: Mapping[PaymentOperation, Timeout] = MappingProxyType({})
+    _fake_backend: FakeBackend | None = None
+    _prewarm_connections = 0
+    _API_ORIGIN: str | None = None
+    """URL of provider API host, connections to which are pre-warmed."""
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:  # noqa: ANN401
+        """Give every payment class its own authorization lock, so deferred checks of providers run in parallel."""
+        super().__init_subclass__(**kwargs)
+        cls._authorization_lock = Lock()
+
     def __init__(self, amount: float, description: str = "", id: str | None = None) -> None:
         """Initialize Payment class."""
         self._check_authorization()
@@ -31,39 +90,420 @@ class Payment(ABC):
         self.income: float | None = None
         """Payment income. Use update() to update it."""
 
+        self.created_at: datetime = datetime.now(timezone.utc).replace(microsecond=0)  # noqa: UP017
+        """Payment creation time."""
+
+        self.expires_at: datetime | None = (
+            self.created_at + self._expiration_duration if self._expiration_duration else None
+        )
+        """Time after which payment can not be paid (None if provider does not expire invoices)."""
+
         self._validate_params()
 
-        self.url: str = self._create_url()
+        self.url: str = "" if is_creation_deferred() else self._make_url()
         """Payment URL."""
 
     @classmethod
-    @abstractmethod
+    @coalesce_status_checks
     def get_status_and_income(cls, payment_id: str) -> tuple[PaymentStatus | None, float]:
         """Return payment status and income.
 
+        Providers implement the status request pair, or override this method.
+
         :param payment_id: Payment ID.
         :raises PaymentNotFound: Payment not found.
+        :raises PaymentGettingError: When request fails.
         :return: Payment status and income.
         """
+        if cls._fake_backend is not None:
+            return cls._fake_backend.get_status_and_income(cls, payment_id)
+
+        request = cls._build_status_request(payment_id)
+        try:
+            return cls._parse_status_response(payment_id, cls._send(request))
+        except RequestException as e:
+            raise PaymentGettingError() from e
+
+    @classmethod
+    def create_many(
+        cls: type[P],
+        batch: Iterable[Mapping[str, Any]],
+        max_concurrency: int = 8,
+        rate_limit: float | None = None,
+    ) -> BatchCreationResult[P]:
+        """Create many payments concurrently.
+
+        All payments are validated locally first, so invalid parameters fail before any request is made.
+        Created payments and failures are returned separately.
+
+        >>> result = QiwiPayment.create_many([{"amount": 100, "description": "Renewal"}] * 1000, max_concurrency=32)
+
+        :param batch: Keyword arguments of the class constructor, one mapping per payment.
+        :param max_concurrency: Maximum number of simultaneous creation requests.
+        :param rate_limit: Maximum number of creation requests per second (default: unlimited).
+
+        :raises ValueError: When max_concurrency is not positive.
+        :raises NotAuthorized: When class was not authorized.
+        """
+        return create_many(cls, batch, max_concurrency, rate_limit)
+
+    @classmethod
+    def get_balance(cls) -> float:
+        """Return merchant account balance.
+
+        Supported by AaioPayment, PayOkPayment and YooMoneyPayment.
+
+        :raises PaymentGettingError: When request fails.
+        :raises NotImplementedError: When provider API does not report balance.
+        """
+        if cls._fake_backend is not None:
+            return cls._fake_backend.get_balance(cls)
+
+        request = cls._build_balance_request()
+        try:
+            return cls._parse_balance_response(cls._send(request))
+        except RequestException as e:
+            raise PaymentGettingError() from e
+
+    @classmethod
+    async def aget_status_and_income(cls, payment_id: str) -> tuple[PaymentStatus | None, float]:
+        """Return payment status and income without blocking event loop.
+
+        Runs get_status_and_income() in the default executor, so the request goes through the same scheduler,
+        concurrency limit, hedging, timeouts and deadline as sync status checks.
+        Shares the request with every sync or async status check of the same payment that is already in flight.
+
+        :param payment_id: Payment ID.
+        :raises PaymentNotFound: Payment not found.
+        :return: Payment status and income.
+        """
+        return await status_checks.acall(
+            cls._get_status_check_key(payment_id),
+            partial(cls.get_status_and_income, payment_id),
+        )
+
+    @classmethod
+    def set_hedging(cls, hedger: Hedger | None) -> None:
+        """Enable hedged status checks for the class, or disable them with None.
+
+        Slow get_status_and_income() requests are duplicated according to hedger settings.
+
+        :param hedger: Hedger instance. May be shared between classes to share its budget and latency window.
+        """
+        cls._hedger = hedger
+
+    @classmethod
+    def set_adaptive_concurrency(cls, concurrency: AdaptiveConcurrency | None) -> None:
+        """Adapt number of simultaneous requests of the class to provider throttling, or stop with None.
+
+        Payment creation and status requests wait for a free slot of the account limit, which grows while
+        provider answers normally and shrinks on 429 and 5xx responses, request errors and rising latency.
+
+        :param concurrency: AdaptiveConcurrency instance. May be shared between classes.
+        """
+        cls._concurrency = concurrency
+
+    @classmethod
+    def set_scheduler(cls, scheduler: RequestScheduler | None) -> None:
+        """Send requests of the class through priority scheduler, or directly with None.
+
+        Set on Payment itself to share one scheduler between all providers.
+        Priority of requests is chosen with request_priority().
+
+        :param scheduler: RequestScheduler instance. May be shared between classes.
+        """
+        cls._scheduler = scheduler
+
+    @classmethod
+    def set_prewarming(cls, connections: int) -> None:
+        """Open connections to provider API in background on every authorize() call, or stop with 0.
+
+        Connections are shared by all classes of the process and kept alive between requests,
+        so the first payment after start does not wait for DNS, TCP and TLS. Use ConnectionWarmer
+        to keep them open during idle periods.
+
+        :param connections: Number of connections to open.
+        """
+        cls._prewarm_connections = connections
+
+    @classmethod
+    def set_timeouts(
+        cls,
+        timeout: Timeout | float | None = None,
+        authorization: Timeout | float | None = None,
+        creation: Timeout | float | None = None,
+        status: Timeout | float | None = None,
+    ) -> None:
+        """Set timeouts of the class requests to provider API.
+
+        Numbers are used for both connect and read timeouts.
+        Timeouts of single calls can be overridden with request_timeout(), and total time limited with deadline().
+
+        :param timeout: Timeout of operations without their own timeout (default: 10 seconds).
+        :param authorization: Timeout of credentials check requests.
+        :param creation: Timeout of payment creation requests.
+        :param status: Timeout of status and history requests.
+        """
+        operation_timeouts = {
+            PaymentOperation.AUTHORIZATION: authorization,
+            PaymentOperation.CREATION: creation,
+            PaymentOperation.STATUS: status,
+        }
+        timeouts = {}
+        for operation, operation_timeout in operation_timeouts.items():
+            value = operation_timeout if operation_timeout is not None else timeout
+            if value is not None:
+                timeouts[operation] = value if isinstance(value, Timeout) else Timeout(value, value)
+        cls._timeouts = MappingProxyType(timeouts)
+
+    @property
+    def is_overdue(self) -> bool:
+        """Is payment still WAITING, though it has expired."""
+        return self.status == PaymentStatus.WAITING and is_overdue(self.expires_at)
+
+    def update(self, confirm_expiration: bool = False) -> None:
+        """Update payment status and income.
+
+        Overdue WAITING payment is resolved as EXPIRED without a request to provider API.
+
+        :param confirm_expiration: Make one request for overdue payment anyway, in case it was paid at the last moment.
+        """
+        if self.is_overdue and not confirm_expiration:
+            self._change_status(PaymentStatus.EXPIRED, self.income)
+            return
 
-    def update(self) -> None:
         try:
             status, income = self.__class__.get_status_and_income(self.id)
         except PaymentNotFound:
-            return
+            status, income = None, self.income
+
+        status = status or self.status
+        if status == PaymentStatus.WAITING and is_overdue(self.expires_at):
+            status = PaymentStatus.EXPIRED
+        self._change_status(status, income)
 
-        if status:
-            self.status = status
+    def _change_status(self, status: PaymentStatus | None, income: float | None) -> None:
+        """Set payment status and income, and publish PaymentStatusChanged if status is different."""
+        old = self.status
+        self.status = status
         self.income = income
 
-    @abstractmethod
+        if status != old:
+            payment_events.publish(PaymentStatusChanged(type(self), self.id, old, status, income, self))
+
+    def _make_url(self) -> str:
+        """Create payment URL with provider API, or with fake backend if class is fake."""
+        if self._fake_backend is not None:
+            return self._fake_backend.create(self)
+        return self._create_url()
+
     def _create_url(self) -> str:
-        """Create payment URL."""
+        """Create payment URL.
+
+        Providers implement the creation request pair, or override this method if they build URLs without requests.
+        """
+        request = self._build_creation_request()
+        try:
+            return self._parse_creation_response(self._send(request))
+        except RequestException as e:
+            raise PaymentCreationError() from e
+
+    def _build_creation_request(self) -> HttpRequest:
+        """Return request that creates the payment.
+
+        :raises PaymentCreationError: When payment parameters are invalid.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not create payments with requests.")
+
+    def _parse_creation_response(self, response: HttpResponse) -> str:
+        """Return payment URL from creation response.
+
+        :raises PaymentCreationError: When provider rejected the payment.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not create payments with requests.")
+
+    @classmethod
+    def _build_status_request(cls, payment_id: str) -> HttpRequest:
+        """Return request that fetches payment status."""
+        raise NotImplementedError(f"{cls.__name__} does not check status with requests.")
+
+    @classmethod
+    def _parse_status_response(cls, payment_id: str, response: HttpResponse) -> tuple[PaymentStatus | None, float]:
+        """Return payment status and income from status response.
+
+        :raises PaymentNotFound: Payment not found.
+        :raises PaymentGettingError: When provider returned an error.
+        """
+        raise NotImplementedError(f"{cls.__name__} does not check status with requests.")
+
+    @classmethod
+    def _build_balance_request(cls) -> HttpRequest:
+        """Return request that fetches merchant account balance."""
+        raise NotImplementedError(f"{cls.__name__} does not report balance.")
+
+    @classmethod
+    def _parse_balance_response(cls, response: HttpResponse) -> float:
+        """Return merchant account balance from balance response.
+
+        :raises PaymentGettingError: When provider returned an error.
+        """
+        raise NotImplementedError(f"{cls.__name__} does not report balance.")
+
+    @classmethod
+    def _send(cls, request: HttpRequest) -> HttpResponse:
+        """Send request with the operation timeout, within the current deadline.
+
+        :raises RequestException: When request fails.
+        :raises DeadlineExceeded: When deadline has passed.
+        """
+        timeout = cls._timeouts.get(request.operation, DEFAULT_TIMEOUT)
+        if cls._concurrency is None:
+            with cls._schedule(request.operation):
+                return send(request, timeout)
+
+        # Scheduler slot is taken only after the provider limit allows the request,
+        # so requests throttled by one provider do not hold slots other providers wait for.
+        limiter = cls._concurrency.get_limiter((cls, cls._get_credentials()))
+        with limiter.acquire() as permit, cls._schedule(request.operation):
+            permit.start()
+            response = send(request, timeout)
+            permit.set_response(response.status_code)
+        return response
+
+    @classmethod
+    def _iter_feed(cls, since: FeedPosition | None) -> Iterator[FeedRecord]:
+        """Iterate over provider transaction feed, newest records first.
+
+        :param since: Stop at records older than this position (default: iterate over the whole feed).
+        """
+        raise NotImplementedError(f"{cls.__name__} does not provide transaction feed.")
+
+    @classmethod
+    def _request(cls, operation: PaymentOperation, method: str, url: str, **kwargs: Any) -> requests.Response:  # noqa: ANN401
+        """Send request to provider API with the operation timeout, within the current deadline.
+
+        :raise DeadlineExceeded: When deadline has passed.
+        """
+        with cls._schedule(operation):
+            return request(method, url, cls._timeouts.get(operation, DEFAULT_TIMEOUT), **kwargs)
+
+    @classmethod
+    def _schedule(cls, operation: PaymentOperation) -> AbstractContextManager[None]:
+        """Return context holding request slot of the class scheduler, if it is set."""
+        if cls._scheduler is None:
+            return nullcontext()
+        return cls._scheduler.slot(get_request_priority(operation))
+
+    @classmethod
+    def _get_credentials(cls) -> tuple[Hashable, ...]:
+        """Return credentials which identify provider account."""
+        return ()
+
+    @classmethod
+    def _call_status_check(
+        cls,
+        function: Callable[[], tuple[PaymentStatus | None, float]],
+    ) -> tuple[PaymentStatus | None, float]:
+        """Run status check request, hedged if hedging is enabled."""
+        if cls._hedger is None:
+            return function()
+        return cls._hedger.call(function)
+
+    @classmethod
+    def _get_status_check_key(cls, payment_id: str) -> Hashable:
+        """Return key under which concurrent status checks of the payment are shared."""
+        return cls, cls._get_credentials(), payment_id
+
+    @classmethod
+    def _try_authorize(cls) -> None:
+        """Check credentials with provider API and mark class as authorized.
+
+        :raises AuthorizationError: When authorization fails.
+        """
+        cls._check_credentials()
+        cls.authorized = True
+
+    @classmethod
+    @abstractmethod
+    def _check_credentials(cls) -> None:
+        """Make the cheapest request showing that provider API is reachable and accepts credentials.
+
+        Class state is not changed, so the check may run at any time.
+
+        :raises AuthorizationError: When provider API is unreachable or rejects credentials.
+        """
+
+    @classmethod
+    def _probe(cls) -> None:
+        """Check credentials with provider API, or with the fake backend the class is switched to.
+
+        :raises AuthorizationError: When provider API is unreachable or rejects credentials.
+        """
+        if cls._fake_backend is not None:
+            cls._fake_backend.probe()
+            return
+        cls._check_credentials()
+
+    @classmethod
+    def _finish_authorization(cls) -> None:
+        """Check credentials right away or, in deferred mode, on the first use of the class.
+
+        Inside fake_providers() block class is switched to the fake backend instead.
+        """
+        cls._fake_backend = get_fake_backend()
+        if cls._fake_backend is not None:
+            cls._authorization_pending = False
+            cls.authorized = True
+            return
+
+        if cls._prewarm_connections:
+            prewarm([cls], cls._prewarm_connections, wait=False)
+
+        if is_authorization_deferred():
+            cls._authorization_pending = True
+            cls.authorized = True
+            return
+
+        cls._authorization_pending = False
+        cls._try_authorize()
+
+    @classmethod
+    def _verify_pending_authorization(cls) -> None:
+        """Run postponed credentials check once.
+
+        Threads using the class meanwhile wait for the check on the lock, so none of them sees the class
+        unauthorized before the check finishes.
+        """
+        with cls._authorization_lock:
+            if not cls._authorization_pending:
+                return
+
+            try:
+                cls._try_authorize()
+            except BaseException:
+                cls.authorized = False
+                raise
+            finally:
+                cls._authorization_pending = False
+
+    @classmethod
+    def _check_authorization(cls) -> None:
+        """Raise NotAuthorized if class was not authorized, running postponed credentials check first."""
+        if cls._authorization_pending:
+            cls._verify_pending_authorization()
+
+        if not cls.authorized:
+            raise NotAuthorized(f"You need to authorize first: {cls.__name__}.authorize()")
+
+    def _get_method(self) -> str | None:
+        """Return name of payment method, or None if payment does not choose it."""
+        payment_type = getattr(self, "_payment_type", None)
+        return payment_type.name if payment_type else None
 
-    def _check_authorization(self) -> None:
-        """Raise NotAuthorized if class was not authorized."""
-        if not self.authorized:
-            raise NotAuthorized(f"You need to authorize first: {self.__class__.__name__}.authorize()")
+    def _get_currency(self) -> str | None:
+        """Return currency code of payment amount, or None if provider does not tell it."""
+        currency = getattr(self, "_currency", None)
+        return currency.value if currency else None
 
     def _validate_params(self) -> None:
         """Validate payment parameters."""
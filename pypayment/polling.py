@@ -0,0 +1,384 @@
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import os
+import queue
+from bisect import bisect
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import partial
+from threading import Event, Thread
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from pypayment import PaymentGettingError, PaymentNotFound, PaymentStatus, PollerWorkerDied, authorize_all
+from pypayment.fakes import FakeBackend, fake_providers, get_fake_backend
+from pypayment.payment import Payment, is_overdue
+from pypayment.ratelimit import RateLimiter
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+    from datetime import datetime
+    from multiprocessing.process import BaseProcess
+    from multiprocessing.queues import Queue
+
+    from pypayment.concurrency import AdaptiveConcurrency
+
+    _Task = tuple[int, str]
+    """Index of payment class and payment ID."""
+    _Result = tuple[int, str, int, float | None, str | None]
+    """Index of payment class, payment ID, status value (-1 if unknown), income and error."""
+    _Message = tuple[int, Any]
+    """Generation of poll and its batch, or None marking the end of poll."""
+
+_NO_STATUS = -1
+_NOT_FOUND = "Payment not found."
+_LIVENESS_INTERVAL = 1.0
+"""Seconds of waiting for results after which worker processes are checked to be alive."""
+
+
+class PollTarget(NamedTuple):
+    """Payment to be polled."""
+
+    payment_class: type[Payment]
+    payment_id: str
+    expires_at: datetime | None = None
+    """Time after which WAITING payment is resolved as EXPIRED without a request."""
+
+
+@dataclass
+class PollResult:
+    """Payment status and income fetched by poller."""
+
+    payment_class: type[Payment]
+    payment_id: str
+    status: PaymentStatus | None
+    income: float | None
+    error: str | None = None
+    """Error message if status could not be fetched."""
+
+    @property
+    def found(self) -> bool:
+        """Is payment known by provider."""
+        return self.error != _NOT_FOUND
+
+
+class _HashRing:
+    """Consistent hash ring mapping payment IDs to shards."""
+
+    def __init__(self, shards: int, replicas: int = 64) -> None:
+        points = sorted(
+            (self._hash(f"{shard}:{replica}"), shard) for shard in range(shards) for replica in range(replicas)
+        )
+        self._keys = [key for key, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    def get_shard(self, payment_id: str) -> int:
+        index = bisect(self._keys, self._hash(payment_id)) % len(self._keys)
+        return self._shards[index]
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], "big")  # noqa: S324
+
+
+class ShardedPoller:
+    """Poll statuses of many payments from a pool of worker processes.
+
+    Payments are assigned to workers by consistent hash of their ID, so the same payment is always
+    polled by the same worker. Every worker authorizes payment classes on its own, owns its connections
+    and thread pool, and gets an equal share of the rate limit. Results come back in compact batches.
+
+    >>> with ShardedPoller({QiwiPayment: {"secret_key": "..."}}, processes=4) as poller:
+    ...     for result in poller.poll(pending_payments):
+    ...         ...
+    """
+
+    def __init__(
+        self,
+        authorizations: Mapping[type[Payment], Mapping[str, Any]],
+        processes: int | None = None,
+        *,
+        threads_per_process: int = 8,
+        rate_limit: float | None = None,
+        batch_size: int = 256,
+        concurrency: AdaptiveConcurrency | None = None,
+    ) -> None:
+        """Initialize ShardedPoller class and start worker processes.
+
+        :param authorizations: Payment classes mapped to keyword arguments of their authorize() method.
+        :param processes: Number of worker processes (default: number of CPUs).
+        :param threads_per_process: Number of simultaneous requests made by every worker.
+        :param rate_limit: Maximum total number of requests per second across all workers (default: unlimited).
+        :param batch_size: Number of payments and results sent between processes at once.
+        :param concurrency: Adapt number of simultaneous requests of every worker to provider throttling,
+            up to threads_per_process. Every worker learns its own limits.
+
+        Poller created inside fake_providers() block polls its fake backend. Workers get a copy of the backend
+        at the start of every poll(), so with spawned worker processes the backend must be picklable.
+        """
+        self._classes: list[type[Payment]] = list(authorizations)
+        self._class_indexes = {payment_class: index for index, payment_class in enumerate(self._classes)}
+        self._processes = processes or os.cpu_count() or 1
+        self._batch_size = batch_size
+        self._ring = _HashRing(self._processes)
+        self._fake_backend = get_fake_backend()
+        self._generation = 0
+        """Number of the latest poll. Results of abandoned polls still in queues are discarded by it."""
+
+        context = multiprocessing.get_context()
+        self._results: Queue[_Message] = context.Queue()
+        self._inputs: list[Queue[_Message | FakeBackend | None]] = []
+        self._workers: list[BaseProcess] = []
+
+        worker_rate_limit = rate_limit / self._processes if rate_limit else None
+        for _ in range(self._processes):
+            inputs: Queue[_Message | FakeBackend | None] = context.Queue()
+            worker = context.Process(
+                target=_run_worker,
+                args=(dict(authorizations), inputs, self._results),
+                kwargs={
+                    "threads": threads_per_process,
+                    "rate_limit": worker_rate_limit,
+                    "concurrency": concurrency,
+                    "fake_backend": self._fake_backend,
+                },
+                daemon=True,
+            )
+            worker.start()
+            self._inputs.append(inputs)
+            self._workers.append(worker)
+
+    def poll(self, targets: Iterable[Payment | PollTarget], confirm_expiration: bool = False) -> Iterator[PollResult]:
+        """Fetch statuses of payments.
+
+        Results are yielded as soon as workers send them back, not in order of targets.
+        Overdue WAITING payments are resolved as EXPIRED without a request.
+        Payment targets are updated in place like with Payment.update(), publishing status changes.
+        Only one poll() may run at a time. Poll abandoned before all results are received is stopped,
+        and its results still in flight are discarded by the next one.
+
+        :param targets: Payments or PollTarget tuples. Payment classes must be passed to the poller on creation.
+        :param confirm_expiration: Make one request for overdue payments anyway, in case they were paid at the last
+            moment. Payments provider still reports as WAITING are resolved as EXPIRED.
+
+        :raise PollerWorkerDied: When worker process exits while poll is running.
+        """
+        if self._fake_backend is not None:
+            for inputs in self._inputs:
+                inputs.put(self._fake_backend)
+
+        self._generation += 1
+        generation = self._generation
+        sent: list[int] = []
+        overdue: set[tuple[int, str]] = set()
+        payments: dict[tuple[int, str], Payment] = {}
+        stop = Event()
+        feeder = Thread(
+            target=self._feed,
+            args=(targets, generation, sent, payments, overdue if confirm_expiration else None),
+            kwargs={"stop": stop},
+            daemon=True,
+        )
+        feeder.start()
+
+        try:
+            received = 0
+            is_fed = False
+            while not is_fed or received < sum(sent):
+                result_generation, results = self._receive()
+                if result_generation != generation:
+                    continue
+                if results is None:
+                    is_fed = True
+                    continue
+
+                received += len(results)
+                yield from self._unpack_results(results, payments, overdue)
+        finally:
+            stop.set()
+            feeder.join()
+
+    def close(self) -> None:
+        """Stop worker processes."""
+        for inputs in self._inputs:
+            inputs.put(None)
+        for worker in self._workers:
+            worker.join()
+
+    def __enter__(self) -> ShardedPoller:  # noqa: PYI034
+        """Return poller itself."""
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Stop worker processes."""
+        self.close()
+
+    def _receive(self) -> _Message:
+        """Wait for the next message from workers or feeder.
+
+        :raise PollerWorkerDied: When worker process has exited.
+        """
+        while True:
+            try:
+                return self._results.get(timeout=_LIVENESS_INTERVAL)
+            except queue.Empty:
+                for worker in self._workers:
+                    if not worker.is_alive():
+                        raise PollerWorkerDied(
+                            f"Worker process {worker.pid} exited with code {worker.exitcode}.",
+                        ) from None
+
+    def _unpack_results(
+        self,
+        results: list[_Result],
+        payments: dict[tuple[int, str], Payment],
+        overdue: set[tuple[int, str]],
+    ) -> Iterator[PollResult]:
+        """Yield PollResult of every result, updating Payment targets."""
+        for class_index, payment_id, status_value, income, error in results:
+            if status_value == PaymentStatus.WAITING.value and (class_index, payment_id) in overdue:
+                status_value = PaymentStatus.EXPIRED.value  # noqa: PLW2901
+
+            result = PollResult(
+                payment_class=self._classes[class_index],
+                payment_id=payment_id,
+                status=PaymentStatus(status_value) if status_value != _NO_STATUS else None,
+                income=income if error is None else None,
+                error=error,
+            )
+
+            payment = payments.pop((class_index, payment_id), None)
+            if payment is not None and error is None:
+                payment._change_status(result.status or payment.status, result.income)  # noqa: SLF001
+
+            yield result
+
+    def _feed(
+        self,
+        targets: Iterable[Payment | PollTarget],
+        generation: int,
+        sent: list[int],
+        payments: dict[tuple[int, str], Payment],
+        overdue: set[tuple[int, str]] | None,
+        *,
+        stop: Event,
+    ) -> None:
+        """Partition targets by shard and send them to workers in batches, until stop is set.
+
+        Payment targets are collected to payments. Overdue targets are resolved right here,
+        unless overdue set to collect them is passed.
+        """
+        batches: list[list[_Task]] = [[] for _ in range(self._processes)]
+        expired: list[_Result] = []
+
+        try:
+            for target in targets:
+                if stop.is_set():
+                    return
+                class_index, payment_id, expires_at = self._unpack(target, payments)
+
+                if is_overdue(expires_at):
+                    if overdue is not None:
+                        overdue.add((class_index, payment_id))
+                    else:
+                        payment = payments.get((class_index, payment_id))
+                        income = payment.income if payment is not None else 0.0
+                        expired.append((class_index, payment_id, PaymentStatus.EXPIRED.value, income, None))
+                        if len(expired) >= self._batch_size:
+                            sent.append(len(expired))
+                            self._results.put((generation, expired))
+                            expired = []
+                        continue
+
+                shard = self._ring.get_shard(payment_id)
+                batches[shard].append((class_index, payment_id))
+
+                if len(batches[shard]) >= self._batch_size:
+                    self._send(shard, generation, batches[shard], sent)
+                    batches[shard] = []
+
+            for shard, batch in enumerate(batches):
+                if batch:
+                    self._send(shard, generation, batch, sent)
+
+            if expired:
+                sent.append(len(expired))
+                self._results.put((generation, expired))
+        finally:
+            self._results.put((generation, None))
+
+    def _unpack(
+        self,
+        target: Payment | PollTarget,
+        payments: dict[tuple[int, str], Payment],
+    ) -> tuple[int, str, datetime | None]:
+        """Return class index, payment ID and expiration time of target, collecting Payment targets to payments."""
+        if not isinstance(target, Payment):
+            payment_class, payment_id, expires_at = target
+            return self._class_indexes[payment_class], payment_id, expires_at
+
+        class_index = self._class_indexes[type(target)]
+        payments[class_index, target.id] = target
+        expires_at = target.expires_at if target.status == PaymentStatus.WAITING else None
+        return class_index, target.id, expires_at
+
+    def _send(self, shard: int, generation: int, batch: list[_Task], sent: list[int]) -> None:
+        sent.append(len(batch))
+        self._inputs[shard].put((generation, batch))
+
+
+def _run_worker(
+    authorizations: Mapping[type[Payment], Mapping[str, Any]],
+    inputs: Queue[_Message | FakeBackend | None],
+    results: Queue[_Message],
+    *,
+    threads: int,
+    rate_limit: float | None,
+    concurrency: AdaptiveConcurrency | None,
+    fake_backend: FakeBackend | None,
+) -> None:
+    """Poll payments received from parent process until None is received.
+
+    Fake backend received from parent process replaces the one classes use.
+    """
+    with fake_providers(fake_backend) if fake_backend is not None else nullcontext():
+        authorize_all(authorizations, lazy=True)
+    classes = list(authorizations)
+    if concurrency is not None:
+        for payment_class in classes:
+            payment_class.set_adaptive_concurrency(concurrency)
+    rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+
+    check = partial(_check_status, classes, rate_limiter)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        while True:
+            message = inputs.get()
+            if message is None:
+                return
+            if isinstance(message, FakeBackend):
+                for payment_class in classes:
+                    payment_class._fake_backend = message  # noqa: SLF001
+                continue
+            generation, batch = message
+            results.put((generation, list(executor.map(check, batch))))
+
+
+def _check_status(classes: list[type[Payment]], rate_limiter: RateLimiter | None, task: _Task) -> _Result:
+    class_index, payment_id = task
+    if rate_limiter:
+        rate_limiter.acquire()
+
+    try:
+        status, income = classes[class_index].get_status_and_income(payment_id)
+    except PaymentNotFound:
+        return class_index, payment_id, _NO_STATUS, 0.0, _NOT_FOUND
+    except PaymentGettingError as e:
+        return class_index, payment_id, _NO_STATUS, 0.0, str(e) or repr(e.__cause__)
+    except Exception as e:  # noqa: BLE001
+        return class_index, payment_id, _NO_STATUS, 0.0, repr(e)
+
+    status_value = status.value if status else _NO_STATUS
+    return class_index, payment_id, status_value, float(income or 0), None
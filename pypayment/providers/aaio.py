@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import hashlib
 from enum import Enum
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
+    from pypayment.transport import HttpResponse
+
 import requests
 from requests import RequestException
 
@@ -16,8 +17,12 @@ from pypayment import (
     PaymentCreationError,
     PaymentGettingError,
     PaymentNotFound,
+    PaymentOperation,
     PaymentStatus,
 )
+from pypayment.responses import parse_json
+from pypayment.signing import get_signature_context
+from pypayment.transport import HttpRequest
 
 
 class AaioCurrency(Enum):
@@ -121,6 +126,7 @@ class AaioPayment(Payment):
     _payment_type: AaioPaymentType | None
     _currency: AaioCurrency | None
     _BASE_URL = "https://aaio.so"
+    _API_ORIGIN = _BASE_URL
     _PAYMENT_URL = _BASE_URL + "/merchant/get_pay_url"
     _INFO_URL = _BASE_URL + "/api/info-pay"
     _PAY_METHODS_URL = _BASE_URL + "/api/methods-pay"
@@ -187,9 +193,9 @@ class AaioPayment(Payment):
         cls._payment_type = payment_type
         cls._currency = currency
 
-        cls._try_authorize()
+        cls._finish_authorization()
 
-    def _create_url(self) -> str:
+    def _build_creation_request(self) -> HttpRequest:
         if not self._merchant_id or not self._currency:
             raise PaymentCreationError("You must specify merchant_id and currency!")
 
@@ -203,47 +209,44 @@ class AaioPayment(Payment):
             "method": self._payment_type.value,
         }
 
-        print(data)
-
-        try:
-            response = requests.post(
-                self._PAYMENT_URL,
-                headers=self._get_headers(),
-                data=data,
-                timeout=10,
-            )
-        except RequestException as e:
-            raise PaymentCreationError() from e
+        return HttpRequest(
+            PaymentOperation.CREATION,
+            "POST",
+            self._PAYMENT_URL,
+            headers=self._get_headers(),
+            data=data,
+        )
 
+    def _parse_creation_response(self, response: HttpResponse) -> str:
         if response.status_code != requests.codes.ok:
             raise PaymentCreationError(response.text)
 
-        return response.json().get("url")
+        return parse_json(response).get("url")
 
     @classmethod
-    def get_status_and_income(cls, payment_id: str) -> tuple[PaymentStatus | None, float]:
+    def _build_status_request(cls, payment_id: str) -> HttpRequest:
         params = {
             "order_id": payment_id,
             "merchant_id": cls._merchant_id,
         }
 
-        try:
-            response = requests.get(
-                cls._INFO_URL,
-                headers=cls._get_headers(),
-                params=params,
-                timeout=10,
-            )
-        except RequestException as e:
-            raise PaymentGettingError() from e
+        return HttpRequest(
+            PaymentOperation.STATUS,
+            "GET",
+            cls._INFO_URL,
+            headers=cls._get_headers(),
+            params=params,
+        )
 
+    @classmethod
+    def _parse_status_response(cls, payment_id: str, response: HttpResponse) -> tuple[PaymentStatus | None, float]:
         if response.status_code == requests.codes.not_found:
             raise PaymentNotFound(f"Payment with id {payment_id} not found.")
 
         if response.status_code != requests.codes.ok:
             raise PaymentGettingError(response.text)
 
-        payment: Mapping[str, Any] = response.json()
+        payment: Mapping[str, Any] = parse_json(response)
 
         status = payment.get("status")
         if status:
@@ -252,6 +255,30 @@ class AaioPayment(Payment):
 
         return status, income
 
+    @classmethod
+    def _build_balance_request(cls) -> HttpRequest:
+        return HttpRequest(
+            PaymentOperation.STATUS,
+            "POST",
+            cls._BALANCE_URL,
+            headers=cls._get_headers(),
+        )
+
+    @classmethod
+    def _parse_balance_response(cls, response: HttpResponse) -> float:
+        if response.status_code != requests.codes.ok:
+            raise PaymentGettingError(response.text)
+
+        balance: Mapping[str, Any] = parse_json(response)
+        if balance.get("type") != "success":
+            raise PaymentGettingError(balance.get("message"))
+
+        return float(balance.get("balance") or 0) + float(balance.get("hold") or 0)
+
+    @classmethod
+    def _get_credentials(cls) -> tuple[str | int | None, ...]:
+        return (cls._api_key, cls._merchant_id)
+
     @classmethod
     def _get_headers(cls) -> Mapping[str, str]:
         return {
@@ -261,17 +288,18 @@ class AaioPayment(Payment):
         }
 
     @classmethod
-    def _try_authorize(cls) -> None:
+    def _check_credentials(cls) -> None:
         params = {
             "merchant_id": cls._merchant_id,
         }
 
         try:
-            response = requests.get(
+            response = cls._request(
+                PaymentOperation.AUTHORIZATION,
+                "GET",
                 cls._PAY_METHODS_URL,
                 headers=cls._get_headers(),
                 params=params,
-                timeout=10,
             )
         except RequestException as e:
             raise AuthorizationError() from e
@@ -279,18 +307,7 @@ class AaioPayment(Payment):
         if response.status_code != requests.codes.ok:
             raise AuthorizationError(response.text)
 
-        cls.authorized = True
-
     @property
     def _sign(self) -> str:
-        return hashlib.sha256(
-            ":".join(
-                [
-                    self._merchant_id,
-                    str(self.amount),
-                    self._currency.value,
-                    self._secret_1,
-                    self.id,
-                ],
-            ).encode("utf-8"),
-        ).hexdigest()
+        context = get_signature_context("sha256", self._secret_1, ":", (self._merchant_id,))
+        return context.sign((self.amount, self._currency.value), after=(self.id,))
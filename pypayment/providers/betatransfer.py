@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import hashlib
 from dataclasses import dataclass
 from enum import Enum
 from typing import TYPE_CHECKING, Any
@@ -8,6 +7,8 @@ from typing import TYPE_CHECKING, Any
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
+    from pypayment.transport import HttpResponse
+
 import requests
 from requests import RequestException
 
@@ -18,8 +19,12 @@ from pypayment import (
     PaymentCreationError,
     PaymentGettingError,
     PaymentNotFound,
+    PaymentOperation,
     PaymentStatus,
 )
+from pypayment.responses import parse_json
+from pypayment.signing import SignatureContext, get_signature_context
+from pypayment.transport import HttpRequest
 
 
 class BetaTransferCurrency(Enum):
@@ -244,7 +249,8 @@ class BetaTransferPayment(Payment):
     _locale: BetaTransferLocale | None = None
     _charge_commission: ChargeCommission | None = None
     _do_params_validation: bool = True
-    _BASE_URL = "https://merchant.betatransfer.io/api"
+    _API_ORIGIN = "https://merchant.betatransfer.io"
+    _BASE_URL = _API_ORIGIN + "/api"
     _PAYMENT_URL = _BASE_URL + "/payment"
     _INFO_URL = _BASE_URL + "/info"
     _ACCOUNT_INFO_URL = _BASE_URL + "/account-info"
@@ -333,7 +339,7 @@ class BetaTransferPayment(Payment):
             payment_type_name = f"{self._payment_type.name} ({self._payment_type.value.name})"
             currency_name = self._payment_type.value.currency.value
             raise PaymentCreationError(
-                f"Amount for {payment_type_name} must be between {min_amount} and {max_amount} {currency_name}!"
+                f"Amount for {payment_type_name} must be between {min_amount} and {max_amount} {currency_name}!",
             )
 
     @classmethod
@@ -378,9 +384,12 @@ class BetaTransferPayment(Payment):
         cls._charge_commission = charge_commission
         cls._do_params_validation = do_params_validation
 
-        cls._try_authorize()
+        cls._finish_authorization()
+
+    def _get_currency(self) -> str | None:
+        return self._payment_type.value.currency.value if self._payment_type else None
 
-    def _create_url(self) -> str:
+    def _build_creation_request(self) -> HttpRequest:
         if not self._payment_type or not self._locale:
             raise PaymentCreationError("You must specify payment_type and locale!")
 
@@ -401,24 +410,23 @@ class BetaTransferPayment(Payment):
             "payerId": self.payer_id,
         }
 
-        try:
-            response = requests.post(
-                self._PAYMENT_URL,
-                headers=self._get_headers(),
-                params=params,
-                data=data,
-                timeout=10,
-            )
-        except RequestException as e:
-            raise PaymentCreationError() from e
+        return HttpRequest(
+            PaymentOperation.CREATION,
+            "POST",
+            self._PAYMENT_URL,
+            headers=self._get_headers(),
+            params=params,
+            data=data,
+        )
 
+    def _parse_creation_response(self, response: HttpResponse) -> str:
         if response.status_code != requests.codes.ok:
             raise PaymentCreationError(response.text)
 
-        return str(response.json().get("url"))
+        return str(parse_json(response).get("url"))
 
     @classmethod
-    def get_status_and_income(cls, payment_id: str) -> tuple[PaymentStatus | None, float]:
+    def _build_status_request(cls, payment_id: str) -> HttpRequest:
         params = {
             "token": cls._public_key,
         }
@@ -428,24 +436,24 @@ class BetaTransferPayment(Payment):
         }
         data["sign"] = cls._get_sign(data)
 
-        try:
-            response = requests.get(
-                cls._INFO_URL,
-                headers=cls._get_headers(),
-                data=data,
-                params=params,
-                timeout=10,
-            )
-        except RequestException as e:
-            raise PaymentGettingError() from e
+        return HttpRequest(
+            PaymentOperation.STATUS,
+            "GET",
+            cls._INFO_URL,
+            headers=cls._get_headers(),
+            data=data,
+            params=params,
+        )
 
+    @classmethod
+    def _parse_status_response(cls, payment_id: str, response: HttpResponse) -> tuple[PaymentStatus | None, float]:
         if response.status_code == requests.codes.not_found:
             raise PaymentNotFound(f"Payment with id {payment_id} not found.")
 
         if response.status_code != requests.codes.ok:
             raise PaymentGettingError(response.text)
 
-        payment: Mapping[str, Any] = response.json()
+        payment: Mapping[str, Any] = parse_json(response)
 
         status = payment.get("status")
         if status:
@@ -453,6 +461,10 @@ class BetaTransferPayment(Payment):
         income = float(str(payment.get("balanceAmount")))
         return status, income
 
+    @classmethod
+    def _get_credentials(cls) -> tuple[str | int | None, ...]:
+        return (cls._public_key, cls._private_key)
+
     @classmethod
     def _get_headers(cls) -> Mapping[str, str]:
         return {
@@ -461,18 +473,19 @@ class BetaTransferPayment(Payment):
         }
 
     @classmethod
-    def _try_authorize(cls) -> None:
+    def _check_credentials(cls) -> None:
         params = {
             "token": str(cls._public_key),
         }
         params["sign"] = cls._get_sign(params)
 
         try:
-            response = requests.get(
+            response = cls._request(
+                PaymentOperation.AUTHORIZATION,
+                "GET",
                 cls._ACCOUNT_INFO_URL,
                 headers=cls._get_headers(),
                 params=params,
-                timeout=10,
             )
         except RequestException as e:
             raise AuthorizationError() from e
@@ -480,12 +493,13 @@ class BetaTransferPayment(Payment):
         if response.status_code != requests.codes.ok:
             raise AuthorizationError(response.text)
 
-        cls.authorized = True
-
     @classmethod
     def _get_sign(cls, data: Mapping[str, str]) -> str:
-        sign = "".join(str(value) for value in data.values()) + str(cls._private_key)
-        return hashlib.md5(sign.encode()).hexdigest()  # noqa
+        return cls._get_signature_context().sign(data.values())
+
+    @classmethod
+    def _get_signature_context(cls) -> SignatureContext:
+        return get_signature_context("md5", str(cls._private_key))
 
     @property
     def _amount_with_commission(self) -> float:
@@ -12,12 +12,19 @@ from pypayment import (
     Payment,
     PaymentCreationError,
     PaymentGettingError,
+    PaymentNotFound,
+    PaymentOperation,
     PaymentStatus,
 )
+from pypayment.responses import parse_json
+from pypayment.transport import HttpRequest
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
+    from pypayment.transport import HttpResponse
+
+
 class LavaPayment(Payment):
     """Lava payment class."""
 
@@ -28,6 +35,7 @@ class LavaPayment(Payment):
     _success_url: str | None = None
     _fail_url: str | None = None
     _BASE_URL = "https://api.lava.ru"
+    _API_ORIGIN = _BASE_URL
     _PING_URL = _BASE_URL + "/test/ping"
     _INVOICE_URL = _BASE_URL + "/invoice"
     _CREATING_URL = _INVOICE_URL + "/create"
@@ -110,62 +118,75 @@ class LavaPayment(Payment):
         cls._success_url = success_url
         cls._fail_url = fail_url
 
-        cls._try_authorize()
+        cls._finish_authorization()
 
-    def _create_url(self) -> str:
+    def _build_creation_request(self) -> HttpRequest:
         data = {
             "wallet_to": self._wallet_to,
             "sum": self.amount,
             "order_id": self.id,
             "success_url": self._success_url,
             "fail_url": self._fail_url,
-            "expire": int(self._expiration_duration.seconds / 60) if self._expiration_duration else 0,
+            "expire": int(self._expiration_duration.total_seconds() / 60) if self._expiration_duration else 0,
             "subtract": 1 if self._charge_commission == ChargeCommission.FROM_CUSTOMER else 0,
             "comment": self.description,
         }
 
+        return HttpRequest(
+            PaymentOperation.CREATION,
+            "POST",
+            self._CREATING_URL,
+            headers=self._get_headers(),
+            data=data,
+        )
+
+    def _parse_creation_response(self, response: HttpResponse) -> str:
         try:
-            response = requests.post(
-                self._CREATING_URL,
-                headers=self._get_headers(),
-                data=data,
-                timeout=10,
-            )
+            response_json = parse_json(response)
         except RequestException as e:
-            raise PaymentCreationError() from e
+            raise PaymentCreationError(response.text) from e
 
-        if response.status_code != requests.codes.ok or response.json().get("status") != "success":
+        if response.status_code != requests.codes.ok or response_json.get("status") != "success":
             raise PaymentCreationError(response.text)
 
-        return str(response.json().get("url"))
+        return str(response_json.get("url"))
+
+    @classmethod
+    def _build_status_request(cls, payment_id: str) -> HttpRequest:
+        return HttpRequest(
+            PaymentOperation.STATUS,
+            "POST",
+            cls._INFO_URL,
+            headers=cls._get_headers(),
+            data={"order_id": payment_id},
+        )
 
-    def update(self) -> None:
+    @classmethod
+    def _parse_status_response(cls, payment_id: str, response: HttpResponse) -> tuple[PaymentStatus | None, float]:
         try:
-            response = requests.post(
-                self._INFO_URL,
-                headers=self._get_headers(),
-                data={"order_id": self.id},
-                timeout=10,
-            )
+            response_json = parse_json(response)
         except RequestException as e:
-            raise PaymentGettingError() from e
+            raise PaymentGettingError(response.text) from e
 
-        response_json = response.json()
         if response.status_code != requests.codes.ok or response_json.get("status") != "success":
-            raise PaymentCreationError(response.text)
+            raise PaymentGettingError(response.text)
 
         payment: Mapping[str, Any] = response_json.get("invoice")
 
         if not payment:
-            return
+            raise PaymentNotFound(f"Payment with id {payment_id} not found.")
 
+        status = None
         status_literal = payment.get("status")
         if status_literal:
-            status = self._STATUS_MAP.get(str(status_literal))
-            if status:
-                self.status = status
+            status = cls._STATUS_MAP.get(str(status_literal))
 
-        self.income = float(str(payment.get("sum")))
+        income = float(str(payment.get("sum")))
+        return status, income
+
+    @classmethod
+    def _get_credentials(cls) -> tuple[str | int | None, ...]:
+        return (cls._token,)
 
     @classmethod
     def _get_headers(cls) -> Mapping[str, str]:
@@ -175,17 +196,18 @@ class LavaPayment(Payment):
         }
 
     @classmethod
-    def _try_authorize(cls) -> None:
+    def _check_credentials(cls) -> None:
         try:
-            response = requests.get(
-                cls._PING_URL,
-                headers=cls._get_headers(),
-                timeout=10,
-            ).json()
+            response = parse_json(
+                cls._request(
+                    PaymentOperation.AUTHORIZATION,
+                    "GET",
+                    cls._PING_URL,
+                    headers=cls._get_headers(),
+                ),
+            )
         except RequestException as e:
             raise AuthorizationError() from e
 
         if response.get("status") is not True:
             raise AuthorizationError(response.get("message"))
-
-        cls.authorized = True
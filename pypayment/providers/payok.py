@@ -1,17 +1,31 @@
 from __future__ import annotations
 
-import hashlib
 import urllib.parse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
+from itertools import islice
 from typing import TYPE_CHECKING, Any
+from uuid import uuid4
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Iterable, Iterator, Mapping
+    from concurrent.futures import Future
+
+    from pypayment.sync import FeedPosition
+    from pypayment.transport import HttpResponse
+
+    Row = tuple[float, str | None, str]
+    """Amount, ID and description of a payment URL."""
 
 import requests
 from requests import RequestException
 
-from pypayment import AuthorizationError, Payment, PaymentGettingError, PaymentNotFound, PaymentStatus
+from pypayment import AuthorizationError, Payment, PaymentGettingError, PaymentNotFound, PaymentOperation, PaymentStatus
+from pypayment.responses import parse_json
+from pypayment.signing import SignatureContext, get_signature_context
+from pypayment.sync import FeedRecord
+from pypayment.transport import HttpRequest
 
 
 class PayOkPaymentType(Enum):
@@ -70,6 +84,58 @@ class PayOkCurrency(Enum):
     """Russian ruble. (Alternative Gateway)"""
 
 
+class _PayOkUrlBuilder:
+    """Payment URL maker with shop, currency and redirect parts encoded once.
+
+    Holds plain strings and the signature context, which is resolved again after being sent to a worker process.
+    """
+
+    def __init__(
+        self,
+        pay_url: str,
+        shop_id: int,
+        shop_secret_key: str,
+        *,
+        currency: str | None,
+        success_url: str | None,
+        method: str | None,
+    ) -> None:
+        quote = urllib.parse.quote_plus
+        self._shop_id = shop_id
+        self._shop_secret_key = shop_secret_key
+        self._currency = currency
+        self._signature_context = get_signature_context("md5", shop_secret_key, "|")
+        self._prefix = pay_url + "?amount="
+        self._shop_part = "&shop=" + quote(str(shop_id)) + "&desc="
+        self._tail_part = (
+            f"&currency={quote(str(currency))}&success_url={quote(str(success_url))}&method={quote(str(method))}&sign="
+        )
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_signature_context"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._signature_context = get_signature_context("md5", self._shop_secret_key, "|")
+
+    def build(self, amount: float, payment_id: str, description: str) -> str:
+        quote = urllib.parse.quote_plus
+        sign = self._signature_context.sign((amount, payment_id, self._shop_id, self._currency, description))
+        return (
+            f"{self._prefix}{quote(str(amount))}&payment={quote(payment_id)}"
+            f"{self._shop_part}{quote(description)}{self._tail_part}{sign}"
+        )
+
+    def build_many(self, rows: Iterable[Row]) -> list[str]:
+        urls = []
+        for amount, row_id, description in rows:
+            payment_id = row_id or str(uuid4())
+            urls.append(self.build(round(amount, 2), payment_id, description or payment_id))
+        return urls
+
+
 class PayOkPayment(Payment):
     """PayOk payment class."""
 
@@ -81,10 +147,12 @@ class PayOkPayment(Payment):
     _currency: PayOkCurrency | None = None
     _success_url: str | None = None
     _BASE_URL = "https://payok.io"
+    _API_ORIGIN = _BASE_URL
     _PAY_URL = _BASE_URL + "/pay"
     _API_URL = _BASE_URL + "/api"
     _TRANSACTION_URL = _API_URL + "/transaction"
     _BALANCE_URL = _API_URL + "/balance"
+    _TRANSACTIONS_PAGE_SIZE = 100
     _STATUS_MAP = {
         "0": PaymentStatus.WAITING,
         "1": PaymentStatus.PAID,
@@ -159,48 +227,109 @@ class PayOkPayment(Payment):
         cls._currency = currency
         cls._success_url = success_url
 
-        cls._try_authorize()
+        cls._finish_authorization()
 
     def _create_url(self) -> str:
-        data = {
-            "amount": self.amount,
-            "payment": self.id,
-            "shop": self._shop_id,
-            "desc": self.description,
-            "currency": self._currency.value if self._currency else None,
-            "success_url": self._success_url,
-            "method": self._payment_type.value if self._payment_type else None,
-        }
+        url_builder = self._get_url_builder(self._payment_type, self._currency, self._success_url)
+        return url_builder.build(self.amount, self.id, self.description)
+
+    @classmethod
+    def generate_urls(
+        cls,
+        rows: Iterable[Row],
+        *,
+        payment_type: PayOkPaymentType | None = None,
+        currency: PayOkCurrency | None = None,
+        success_url: str | None = None,
+        processes: int | None = None,
+        chunk_size: int = 10_000,
+    ) -> Iterator[str]:
+        """Generate signed payment URLs without creating PayOkPayment instances.
 
-        sign_str = "|".join(map(str, (
-            data["amount"], data["payment"], data["shop"], data["currency"], data["desc"],
-            self._shop_secret_key)))
-        data["sign"] = hashlib.md5(sign_str.encode()).hexdigest()  # noqa
+        URLs are the same as PayOkPayment(amount, description, id).url and are yielded in order of rows.
 
-        return self._PAY_URL + "?" + urllib.parse.urlencode(data)
+        :param rows: Iterable of (amount, id, description). Empty id is generated with uuid4,
+            empty description is replaced with id.
+        :param payment_type: PayOkPaymentType enum.
+        :param currency: PayOkCurrency enum.
+        :param success_url: User will be redirected to this url after paying.
+        :param processes: Number of worker processes for very large batches (default: generate in current process).
+        :param chunk_size: Number of rows sent to a worker process at once.
+
+        :raise NotAuthorized: When class was not authorized with PayOkPayment.authorize()
+        :raise ValueError: When processes or chunk_size is negative or chunk_size is zero.
+        """
+        cls._check_authorization()
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be positive.")
+        if processes is not None and processes < 0:
+            raise ValueError("Number of processes must not be negative.")
+
+        url_builder = cls._get_url_builder(
+            payment_type or cls._payment_type,
+            currency or cls._currency,
+            success_url or cls._success_url,
+        )
+        if not processes:
+            return cls._generate_urls_here(url_builder, iter(rows), chunk_size)
+        return cls._generate_urls_in_processes(url_builder, iter(rows), chunk_size, processes)
+
+    @staticmethod
+    def _generate_urls_here(url_builder: _PayOkUrlBuilder, rows: Iterator[Row], chunk_size: int) -> Iterator[str]:
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield from url_builder.build_many(chunk)
+
+    @staticmethod
+    def _generate_urls_in_processes(
+        url_builder: _PayOkUrlBuilder,
+        rows: Iterator[Row],
+        chunk_size: int,
+        processes: int,
+    ) -> Iterator[str]:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            pending: deque[Future[list[str]]] = deque()
+            while True:
+                while len(pending) < processes * 2:
+                    chunk = list(islice(rows, chunk_size))
+                    if not chunk:
+                        break
+                    pending.append(executor.submit(url_builder.build_many, chunk))
+
+                if not pending:
+                    return
+                yield from pending.popleft().result()
 
     @classmethod
-    def get_status_and_income(cls, payment_id: str) -> tuple[PaymentStatus | None, float]:
-        data = {
-            "API_ID": cls._api_id,
-            "API_KEY": cls._api_key,
-            "shop": cls._shop_id,
-            "payment": payment_id,
-        }
+    def _get_url_builder(
+        cls,
+        payment_type: PayOkPaymentType | None,
+        currency: PayOkCurrency | None,
+        success_url: str | None,
+    ) -> _PayOkUrlBuilder:
+        return _PayOkUrlBuilder(
+            cls._PAY_URL,
+            cls._shop_id,
+            str(cls._shop_secret_key),
+            currency=currency.value if currency else None,
+            success_url=success_url,
+            method=payment_type.value if payment_type else None,
+        )
 
-        try:
-            response = requests.post(
-                cls._TRANSACTION_URL,
-                data=data,
-                timeout=10,
-            ).json()
-        except RequestException as e:
-            raise PaymentGettingError() from e
+    @classmethod
+    def _build_status_request(cls, payment_id: str) -> HttpRequest:
+        return cls._build_transactions_request({"payment": payment_id})
+
+    @classmethod
+    def _parse_status_response(cls, payment_id: str, response: HttpResponse) -> tuple[PaymentStatus | None, float]:
+        transactions: Mapping[str, Any] = parse_json(response)
 
-        if response.get("status") != "success":
+        if transactions.get("status") != "success":
             raise PaymentNotFound(f"Payment with id {payment_id} not found")
 
-        payment: Mapping[str, Any] = response.get("1")
+        payment: Mapping[str, Any] = transactions.get("1")
 
         transaction_status = payment.get("transaction_status")
         status = None
@@ -210,24 +339,120 @@ class PayOkPayment(Payment):
         return status, income
 
     @classmethod
-    def _try_authorize(cls) -> None:
+    def iter_transactions(cls) -> Iterator[Mapping[str, Any]]:
+        """Iterate over shop transactions, newest transactions first.
+
+        Pages of transactions are requested lazily.
+
+        :raise PaymentGettingError: When transactions request fails or API returns an error.
+        """
+        offset = 0
+        while True:
+            response = cls._get_transactions({"offset": offset})
+            if response.get("status") != "success":
+                raise PaymentGettingError(response.get("text") or response)
+
+            transactions = [value for key, value in response.items() if key.isdigit()]
+            transactions.sort(key=lambda transaction: int(transaction["transaction"]), reverse=True)
+            yield from transactions
+
+            if len(transactions) < cls._TRANSACTIONS_PAGE_SIZE:
+                return
+            offset += len(transactions)
+
+    @classmethod
+    def _iter_feed(cls, since: FeedPosition | None) -> Iterator[FeedRecord]:
+        for transaction in cls.iter_transactions():
+            position = int(transaction["transaction"])
+            if since is not None and position < int(since):
+                return
+
+            yield FeedRecord(
+                payment_id=str(transaction.get("payment_id")),
+                status=cls._STATUS_MAP.get(str(transaction.get("transaction_status"))),
+                income=float(str(transaction.get("amount_profit"))),
+                position=position,
+            )
+
+    @classmethod
+    def _get_transactions(cls, data: Mapping[str, Any]) -> Mapping[str, Any]:
+        try:
+            response: Mapping[str, Any] = parse_json(cls._send(cls._build_transactions_request(data)))
+        except RequestException as e:
+            raise PaymentGettingError() from e
+
+        return response
+
+    @classmethod
+    def _build_transactions_request(cls, data: Mapping[str, Any]) -> HttpRequest:
+        return HttpRequest(
+            PaymentOperation.STATUS,
+            "POST",
+            cls._TRANSACTION_URL,
+            data={
+                "API_ID": cls._api_id,
+                "API_KEY": cls._api_key,
+                "shop": cls._shop_id,
+                **data,
+            },
+        )
+
+    @classmethod
+    def _build_balance_request(cls) -> HttpRequest:
+        return HttpRequest(
+            PaymentOperation.STATUS,
+            "POST",
+            cls._BALANCE_URL,
+            data={
+                "API_ID": cls._api_id,
+                "API_KEY": cls._api_key,
+            },
+        )
+
+    @classmethod
+    def _parse_balance_response(cls, response: HttpResponse) -> float:
+        if response.status_code != requests.codes.ok:
+            raise PaymentGettingError(response.text)
+
+        balance: Mapping[str, Any] = parse_json(response)
+        if balance.get("status") == "error":
+            raise PaymentGettingError(balance)
+
+        return float(str(balance.get("balance")))
+
+    @classmethod
+    def _get_credentials(cls) -> tuple[str | int | None, ...]:
+        return (cls._api_id, cls._api_key, cls._shop_id)
+
+    @classmethod
+    def _check_credentials(cls) -> None:
         data = {
             "API_ID": cls._api_id,
             "API_KEY": cls._api_key,
         }
         try:
-            response = requests.post(
+            response = cls._request(
+                PaymentOperation.AUTHORIZATION,
+                "POST",
                 cls._BALANCE_URL,
                 data=data,
-                timeout=10,
             )
         except RequestException as e:
             raise AuthorizationError() from e
 
         if response.status_code != requests.codes.ok:
             raise AuthorizationError(response.text)
-        if response.json().get("status") == "error":
-            raise AuthorizationError(response.json())
+        try:
+            response_json = parse_json(response)
+        except RequestException as e:
+            raise AuthorizationError(response.text) from e
+
+        if response_json.get("status") == "error":
+            raise AuthorizationError(response_json)
+
+    @classmethod
+    def _try_authorize(cls) -> None:
+        cls._check_credentials()
 
         data = {
             "amount": 1,
@@ -236,15 +461,13 @@ class PayOkPayment(Payment):
             "desc": "test",
             "currency": "RUB",
         }
-        sign_str = "|".join(map(str, (
-            data["amount"], data["payment"], data["shop"], data["currency"], data["desc"],
-            cls._shop_secret_key)))
-        data["sign"] = hashlib.md5(sign_str.encode()).hexdigest()  # noqa
+        data["sign"] = cls._get_sign(data)
         try:
-            response = requests.post(
+            response = cls._request(
+                PaymentOperation.AUTHORIZATION,
+                "POST",
                 cls._PAY_URL,
                 data=data,
-                timeout=10,
             )
         except RequestException as e:
             raise AuthorizationError() from e
@@ -257,3 +480,13 @@ class PayOkPayment(Payment):
             raise AuthorizationError("Invalid shop secret key")
 
         cls.authorized = True
+
+    @classmethod
+    def _get_sign(cls, data: Mapping[str, Any]) -> str:
+        return cls._get_signature_context().sign(
+            (data["amount"], data["payment"], data["shop"], data["currency"], data["desc"]),
+        )
+
+    @classmethod
+    def _get_signature_context(cls) -> SignatureContext:
+        return get_signature_context("md5", str(cls._shop_secret_key), "|")
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import json
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
-from datetime import datetime, timedelta
+
+    from pypayment.transport import HttpResponse
+from datetime import timedelta
 from enum import Enum
 from typing import Any
 
@@ -18,8 +19,11 @@ from pypayment import (
     PaymentCreationError,
     PaymentGettingError,
     PaymentNotFound,
+    PaymentOperation,
     PaymentStatus,
 )
+from pypayment.responses import dumps, parse_json
+from pypayment.transport import HttpRequest
 
 
 class QiwiPaymentType(Enum):
@@ -40,7 +44,8 @@ class QiwiPayment(Payment):
     _theme_code: str | None = None
     _expiration_duration: timedelta | None = None
     _payment_type: QiwiPaymentType | None = None
-    _API_URL = "https://api.qiwi.com/partner/bill/v1/bills/"
+    _API_ORIGIN = "https://api.qiwi.com"
+    _API_URL = _API_ORIGIN + "/partner/bill/v1/bills/"
     _STATUS_MAP = {
         "WAITING": PaymentStatus.WAITING,
         "PAID": PaymentStatus.PAID,
@@ -108,57 +113,57 @@ class QiwiPayment(Payment):
         cls._expiration_duration = expiration_duration
         cls._payment_type = payment_type
 
-        cls._try_authorize()
+        cls._finish_authorization()
+
+    def _get_currency(self) -> str | None:
+        return "RUB"
 
-    def _create_url(self) -> str:
+    def _build_creation_request(self) -> HttpRequest:
         data = {
             "amount": {
                 "currency": "RUB",
                 "value": self.amount,
             },
             "comment": self.description,
-            "expirationDateTime": (
-                datetime.now().replace(microsecond=0).astimezone() + self._expiration_duration
-            ).isoformat() if self._expiration_duration else None,
+            "expirationDateTime": self.expires_at.astimezone().isoformat() if self.expires_at else None,
             "customFields": {
                 "themeCode": self._theme_code,
                 "paySourcesFilter": self._payment_type.value if self._payment_type else None,
             },
         }
 
-        try:
-            response = requests.put(
-                self._API_URL + self.id,
-                headers=self._get_headers(),
-                data=json.dumps(data),
-                timeout=10,
-            )
-        except RequestException as e:
-            raise PaymentCreationError() from e
+        return HttpRequest(
+            PaymentOperation.CREATION,
+            "PUT",
+            self._API_URL + self.id,
+            headers=self._get_headers(),
+            data=dumps(data),
+        )
 
+    def _parse_creation_response(self, response: HttpResponse) -> str:
         if response.status_code != requests.codes.ok:
             raise PaymentCreationError(response.text)
 
-        return str(response.json().get("payUrl"))
+        return str(parse_json(response).get("payUrl"))
 
     @classmethod
-    def get_status_and_income(cls, payment_id: str) -> tuple[PaymentStatus | None, float]:
-        try:
-            response = requests.get(
-                cls._API_URL + payment_id,
-                headers=cls._get_headers(),
-                timeout=10,
-            )
-        except RequestException as e:
-            raise PaymentGettingError() from e
+    def _build_status_request(cls, payment_id: str) -> HttpRequest:
+        return HttpRequest(
+            PaymentOperation.STATUS,
+            "GET",
+            cls._API_URL + payment_id,
+            headers=cls._get_headers(),
+        )
 
+    @classmethod
+    def _parse_status_response(cls, payment_id: str, response: HttpResponse) -> tuple[PaymentStatus | None, float]:
         if response.status_code != requests.codes.ok:
             raise PaymentGettingError(response.text)
 
         if not response:
             raise PaymentNotFound(f"Payment with id {payment_id} not found.")
 
-        payment: Mapping[str, Any] = response.json()
+        payment: Mapping[str, Any] = parse_json(response)
 
         status_literal = payment.get("status")
         status = None
@@ -172,6 +177,10 @@ class QiwiPayment(Payment):
 
         return status, income
 
+    @classmethod
+    def _get_credentials(cls) -> tuple[str | int | None, ...]:
+        return (cls._secret_key,)
+
     @classmethod
     def _get_headers(cls) -> Mapping[str, str]:
         return {
@@ -181,17 +190,16 @@ class QiwiPayment(Payment):
         }
 
     @classmethod
-    def _try_authorize(cls) -> None:
+    def _check_credentials(cls) -> None:
         try:
-            response = requests.get(
+            response = cls._request(
+                PaymentOperation.AUTHORIZATION,
+                "GET",
                 cls._API_URL,
                 headers=cls._get_headers(),
-                timeout=10,
             )
         except RequestException as e:
             raise AuthorizationError() from e
 
         if response.status_code == requests.codes.unauthorized:
             raise AuthorizationError("Secret key is invalid.")
-
-        cls.authorized = True
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
 import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Iterable, Iterator, Mapping
+    from concurrent.futures import Future
+
+    from pypayment.sync import FeedPosition
+    from pypayment.transport import HttpResponse
 
 from enum import Enum
 
@@ -18,8 +25,12 @@ from pypayment import (
     PaymentCreationError,
     PaymentGettingError,
     PaymentNotFound,
+    PaymentOperation,
     PaymentStatus,
 )
+from pypayment.responses import parse_json
+from pypayment.sync import FeedRecord
+from pypayment.transport import HttpRequest
 
 
 class YooMoneyPaymentType(Enum):
@@ -33,6 +44,15 @@ class YooMoneyPaymentType(Enum):
     """Payment from phone balance."""
 
 
+class YooMoneyOperationType(Enum):
+    """YooMoney operation type enum."""
+
+    DEPOSITION = "deposition"
+    """Incoming transfer to the wallet."""
+    PAYMENT = "payment"
+    """Outgoing payment from the wallet."""
+
+
 class YooMoneyPayment(Payment):
     """YooMoney payment class."""
 
@@ -42,6 +62,7 @@ class YooMoneyPayment(Payment):
     _charge_commission: ChargeCommission | None = None
     _success_url: str | None = None
     _BASE_URL = "https://yoomoney.ru"
+    _API_ORIGIN = _BASE_URL
     _OAUTH_URL = _BASE_URL + "/oauth"
     _API_URL = _BASE_URL + "/api"
     _QUICKPAY_URL = _BASE_URL + "/quickpay/confirm.xml"
@@ -114,36 +135,164 @@ class YooMoneyPayment(Payment):
         cls._charge_commission = charge_commission
         cls._success_url = success_url
 
-        cls._try_authorize()
+        cls._finish_authorization()
+
+    @classmethod
+    def _build_status_request(cls, payment_id: str) -> HttpRequest:
+        return cls._build_operation_history_request({"label": payment_id})
+
+    @classmethod
+    def _parse_status_response(cls, payment_id: str, response: HttpResponse) -> tuple[PaymentStatus | None, float]:
+        operations = cls._parse_operation_history(response).get("operations")
+
+        if not operations:
+            raise PaymentNotFound(f"Payment with id {payment_id} not found for {cls.__name__}.")
+
+        payment: Mapping[str, Any] = operations[0]
+
+        status = cls._STATUS_MAP.get(str(payment.get("status")))
+        income = float(str(payment.get("amount")))
+        return status, income
 
     @classmethod
-    def get_status_and_income(cls, payment_id: str) -> tuple[PaymentStatus | None, float]:
+    def iter_operations(
+        cls,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        types: Iterable[YooMoneyOperationType] | None = None,
+        page_size: int = 100,
+        prefetch: bool = False,
+    ) -> Iterator[Mapping[str, Any]]:
+        """Iterate over wallet operation history, newest operations first.
+
+        Pages are requested lazily, only the current page is kept in memory.
+
+        :param since: Return operations made at or after this time.
+        :param until: Return operations made before this time.
+        :param types: YooMoneyOperationType enums (default: all types).
+        :param page_size: Number of operations requested per page (1-100).
+        :param prefetch: Request the next page in background while the current one is being iterated.
+
+        :raise PaymentGettingError: When operation history request fails.
+        """
+        data: dict[str, str | int] = {"records": page_size}
+        if since:
+            data["from"] = since.astimezone().isoformat()
+        if until:
+            data["till"] = until.astimezone().isoformat()
+        if types:
+            data["type"] = " ".join(operation_type.value for operation_type in types)
+
+        if not prefetch:
+            while True:
+                page = cls._get_operation_history(data)
+                yield from page.get("operations") or ()
+
+                if not page.get("next_record"):
+                    return
+                data["start_record"] = page["next_record"]
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pypayment-yoomoney")
         try:
-            response = requests.post(
-                cls._OPERATION_HISTORY_URL,
-                headers=cls._get_headers(),
-                data={"label": payment_id},
-                timeout=10,
+            next_page: Future[Mapping[str, Any]] = executor.submit(
+                copy_context().run,
+                cls._get_operation_history,
+                dict(data),
             )
-            print(response.json())
+            while True:
+                page = next_page.result()
+
+                if page.get("next_record"):
+                    data["start_record"] = page["next_record"]
+                    next_page = executor.submit(copy_context().run, cls._get_operation_history, dict(data))
+
+                yield from page.get("operations") or ()
+
+                if not page.get("next_record"):
+                    return
+        finally:
+            executor.shutdown(wait=False)
+
+    @classmethod
+    def _iter_feed(cls, since: FeedPosition | None) -> Iterator[FeedRecord]:
+        operations = cls.iter_operations(
+            since=datetime.fromisoformat(str(since)) if since is not None else None,
+            types=[YooMoneyOperationType.DEPOSITION],
+        )
+        for operation in operations:
+            if not operation.get("label"):
+                continue
+
+            yield FeedRecord(
+                payment_id=str(operation["label"]),
+                status=cls._STATUS_MAP.get(str(operation.get("status"))),
+                income=float(str(operation.get("amount"))),
+                position=cls._parse_datetime(str(operation.get("datetime"))).isoformat(),
+            )
+
+    @staticmethod
+    def _parse_datetime(value: str) -> datetime:
+        """Parse operation datetime to UTC."""
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(timezone.utc)  # noqa: UP017
+
+    @classmethod
+    def _get_operation_history(cls, data: Mapping[str, str | int]) -> Mapping[str, Any]:
+        try:
+            response = cls._send(cls._build_operation_history_request(data))
         except RequestException as e:
             raise PaymentGettingError() from e
 
+        return cls._parse_operation_history(response)
+
+    @classmethod
+    def _build_balance_request(cls) -> HttpRequest:
+        return HttpRequest(
+            PaymentOperation.STATUS,
+            "GET",
+            cls._ACCOUNT_INFO_URL,
+            headers=cls._get_headers(),
+        )
+
+    @classmethod
+    def _parse_balance_response(cls, response: HttpResponse) -> float:
         if response.status_code != requests.codes.ok:
             raise PaymentGettingError(response.text)
 
-        operations = response.json().get("operations")
+        account: Mapping[str, Any] = parse_json(response)
+        if "error" in account:
+            raise PaymentGettingError(account["error"])
 
-        if not operations:
-            raise PaymentNotFound(f"Payment with id {payment_id} not found for {cls.__name__}.")
+        return float(str(account.get("balance")))
 
-        payment: Mapping[str, Any] = operations[0]
+    @classmethod
+    def _build_operation_history_request(cls, data: Mapping[str, str | int]) -> HttpRequest:
+        return HttpRequest(
+            PaymentOperation.STATUS,
+            "POST",
+            cls._OPERATION_HISTORY_URL,
+            headers=cls._get_headers(),
+            data=data,
+        )
 
-        status = cls._STATUS_MAP.get(str(payment.get("status")))
-        income = float(str(payment.get("amount")))
-        return status, income
+    @classmethod
+    def _parse_operation_history(cls, response: HttpResponse) -> Mapping[str, Any]:
+        if response.status_code != requests.codes.ok:
+            raise PaymentGettingError(response.text)
+
+        try:
+            history: Mapping[str, Any] = parse_json(response)
+        except RequestException as e:
+            raise PaymentGettingError(response.text) from e
 
-    def _create_url(self) -> str:
+        if "error" in history:
+            raise PaymentGettingError(history["error"])
+
+        return history
+
+    def _get_currency(self) -> str | None:
+        return "RUB"
+
+    def _build_creation_request(self) -> HttpRequest:
         data = {
             "receiver": self._account_id,
             "quickpay-form": "shop",
@@ -156,28 +305,37 @@ class YooMoneyPayment(Payment):
             "successURL": self._success_url,
         }
 
-        try:
-            response = requests.post(
-                self._QUICKPAY_URL,
-                headers=self._get_headers(),
-                data=data,
-                timeout=10,
-            )
-        except RequestException as e:
-            raise PaymentCreationError() from e
+        return HttpRequest(
+            PaymentOperation.CREATION,
+            "POST",
+            self._QUICKPAY_URL,
+            headers=self._get_headers(),
+            data=data,
+        )
 
+    def _parse_creation_response(self, response: HttpResponse) -> str:
         if response.status_code != requests.codes.ok:
             raise PaymentCreationError(response.text)
 
         return str(response.url)
 
+    @classmethod
+    def _check_credentials(cls) -> None:
+        cls._get_account_info()
+
     @classmethod
     def _try_authorize(cls) -> None:
+        cls._account_id = cls._get_account_info().get("account")
+        cls.authorized = True
+
+    @classmethod
+    def _get_account_info(cls) -> Mapping[str, Any]:
         try:
-            response = requests.get(
+            response = cls._request(
+                PaymentOperation.AUTHORIZATION,
+                "GET",
                 cls._ACCOUNT_INFO_URL,
                 headers=cls._get_headers(),
-                timeout=10,
             )
         except RequestException as e:
             raise AuthorizationError() from e
@@ -185,8 +343,11 @@ class YooMoneyPayment(Payment):
         if response.status_code != requests.codes.ok:
             raise AuthorizationError("Access Token is invalid.")
 
-        cls._account_id = response.json().get("account")
-        cls.authorized = True
+        return parse_json(response)
+
+    @classmethod
+    def _get_credentials(cls) -> tuple[str | int | None, ...]:
+        return (cls._access_token,)
 
     @classmethod
     def _get_headers(cls) -> Mapping[str, str]:
@@ -235,19 +396,22 @@ class YooMoneyPayment(Payment):
         if instance_name:
             data["instance_name"] = instance_name
 
-        response = requests.post(
+        response = cls._request(
+            PaymentOperation.AUTHORIZATION,
+            "POST",
             cls._AUTHORIZE_URL,
             data=data,
-            timeout=10,
         )
-        print("1)\tGo to this URL and give access to the application\n",
-              f"\t{response.url}\n\n",
-              f'2)\tAfter accepting you will be redirected to {redirect_uri}?code=YOUR_CODE_VALUE with "code" '
-              f"as query parameter")
+        print(
+            "1)\tGo to this URL and give access to the application\n",
+            f"\t{response.url}\n\n",
+            f'2)\tAfter accepting you will be redirected to {redirect_uri}?code=YOUR_CODE_VALUE with "code" '
+            f"as query parameter",
+        )
         code = input("\tCopy YOUR_CODE_VALUE OR whole redirect url and paste it here: ")
 
         with contextlib.suppress(ValueError):
-            code = code[code.index("code=") + 5:].replace(" ", "")
+            code = code[code.index("code=") + 5 :].replace(" ", "")
 
         data = {
             "code": code,
@@ -256,19 +420,18 @@ class YooMoneyPayment(Payment):
             "redirect_uri": redirect_uri,
         }
 
-        response = requests.post(
+        response = cls._request(
+            PaymentOperation.AUTHORIZATION,
+            "POST",
             cls._TOKEN_URL,
             data=data,
-            timeout=10,
         )
-        access_token: str = response.json()["access_token"]
+        access_token: str = parse_json(response)["access_token"]
 
         if access_token == "":
             print("\n3)\tSomething went wrong, try again")
             return ""
 
-        print("\n3)\tYour access token:\n",
-              "\t(Save it and use in YooMoneyPayment.authorize())\n",
-              access_token)
+        print("\n3)\tYour access token:\n", "\t(Save it and use in YooMoneyPayment.authorize())\n", access_token)
 
         return access_token
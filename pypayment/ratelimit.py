@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import time
+from threading import Lock
+
+
+class RateLimiter:
+    """Token bucket limiting the rate of requests made from the current process."""
+
+    def __init__(self, rate: float, burst: int | None = None) -> None:
+        """Initialize RateLimiter class.
+
+        :param rate: Maximum number of requests per second.
+        :param burst: Maximum number of requests made at once after idle time (default: max(1, rate)).
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive.")
+
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self) -> None:
+        """Block until a request is allowed."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                delay = (1 - self._tokens) / self.rate
+
+            time.sleep(delay)
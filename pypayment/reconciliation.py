@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import csv
+import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import asdict, dataclass
+from enum import Enum
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+from pypayment import PaymentGettingError, PaymentNotFound, PaymentStatus
+from pypayment.ratelimit import RateLimiter
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from concurrent.futures import Future
+
+    from pypayment import Payment
+
+
+class DiscrepancyKind(Enum):
+    """Reconciliation discrepancy kind enum."""
+
+    MISSING = "missing"
+    """Provider does not know the payment."""
+    AMOUNT_MISMATCH = "amount_mismatch"
+    """Provider income differs from ledger income."""
+    STATUS_MISMATCH = "status_mismatch"
+    """Provider status differs from ledger status."""
+    FETCH_FAILED = "fetch_failed"
+    """Provider API request failed, timed out or returned malformed response, payment was not checked."""
+
+
+@dataclass
+class LedgerEntry:
+    """Payment as recorded in merchant's ledger."""
+
+    payment_id: str
+    income: float | None = None
+    """Expected income (default: not compared)."""
+    status: PaymentStatus | None = None
+    """Expected status (default: not compared)."""
+
+
+@dataclass
+class Discrepancy:
+    """Difference between ledger and provider view of a payment."""
+
+    kind: DiscrepancyKind
+    payment_id: str
+    provider: str
+    expected_income: float | None = None
+    actual_income: float | None = None
+    expected_status: PaymentStatus | None = None
+    actual_status: PaymentStatus | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, str | float | None]:
+        """Return discrepancy as flat dict of plain values."""
+        record = asdict(self)
+        record["kind"] = self.kind.value
+        record["expected_status"] = self.expected_status.name if self.expected_status else None
+        record["actual_status"] = self.actual_status.name if self.actual_status else None
+        return record
+
+
+_FIELDS = (
+    "kind",
+    "payment_id",
+    "provider",
+    "expected_income",
+    "actual_income",
+    "expected_status",
+    "actual_status",
+    "error",
+)
+
+
+def reconcile(
+    payment_class: type[Payment],
+    entries: Iterable[LedgerEntry | str],
+    max_concurrency: int = 8,
+    tolerance: float = 0.01,
+    rate_limit: float | None = None,
+    *,
+    on_compared: Callable[[LedgerEntry], None] | None = None,
+) -> Iterator[Discrepancy]:
+    """Compare ledger with provider statuses and incomes.
+
+    Statuses are fetched concurrently, while only a small window of entries is kept in memory,
+    so entries may come from a lazy iterator of any size.
+    Discrepancies are yielded in order of entries as soon as they are found.
+
+    :param payment_class: Authorized payment class (e.x. QiwiPayment).
+    :param entries: Ledger entries or bare payment IDs.
+    :param max_concurrency: Maximum number of simultaneous requests to provider API.
+    :param tolerance: Maximum allowed difference between expected and actual income.
+    :param rate_limit: Maximum number of requests per second (default: unlimited).
+    :param on_compared: Called with every entry once it is compared, e.g. to show progress.
+    """
+    pending: deque[tuple[LedgerEntry, Future[tuple[PaymentStatus | None, float]]]] = deque()
+    window = max_concurrency * 2
+    rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+
+    def get_status_and_income(payment_id: str) -> tuple[PaymentStatus | None, float]:
+        if rate_limiter:
+            rate_limiter.acquire()
+        return payment_class.get_status_and_income(payment_id)
+
+    def compare(entry: LedgerEntry, future: Future[tuple[PaymentStatus | None, float]]) -> Discrepancy | None:
+        discrepancy = _compare(payment_class, entry, future, tolerance)
+        if on_compared:
+            on_compared(entry)
+        return discrepancy
+
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="pypayment-reconcile") as executor:
+        for entry in entries:
+            ledger_entry = LedgerEntry(entry) if isinstance(entry, str) else entry
+            future = executor.submit(copy_context().run, get_status_and_income, ledger_entry.payment_id)
+            pending.append((ledger_entry, future))
+
+            if len(pending) >= window:
+                discrepancy = compare(*pending.popleft())
+                if discrepancy:
+                    yield discrepancy
+
+        while pending:
+            discrepancy = compare(*pending.popleft())
+            if discrepancy:
+                yield discrepancy
+
+
+def _compare(
+    payment_class: type[Payment],
+    entry: LedgerEntry,
+    future: Future[tuple[PaymentStatus | None, float]],
+    tolerance: float,
+) -> Discrepancy | None:
+    discrepancy = Discrepancy(
+        kind=DiscrepancyKind.MISSING,
+        payment_id=entry.payment_id,
+        provider=payment_class.__name__,
+        expected_income=entry.income,
+        expected_status=entry.status,
+    )
+
+    try:
+        status, income = future.result()
+    except PaymentNotFound:
+        return discrepancy
+    except PaymentGettingError as e:
+        discrepancy.kind = DiscrepancyKind.FETCH_FAILED
+        discrepancy.error = str(e) or repr(e.__cause__)
+        return discrepancy
+    except Exception as e:  # noqa: BLE001
+        discrepancy.kind = DiscrepancyKind.FETCH_FAILED
+        discrepancy.error = repr(e)
+        return discrepancy
+
+    discrepancy.actual_status = status
+    discrepancy.actual_income = float(income) if income is not None else None
+
+    if entry.status is not None and status != entry.status:
+        discrepancy.kind = DiscrepancyKind.STATUS_MISMATCH
+        return discrepancy
+
+    if entry.income is not None and (
+        discrepancy.actual_income is None or abs(discrepancy.actual_income - entry.income) > tolerance
+    ):
+        discrepancy.kind = DiscrepancyKind.AMOUNT_MISMATCH
+        return discrepancy
+
+    return None
+
+
+def read_ledger(source: str | Path | IO[str]) -> Iterator[LedgerEntry]:
+    """Lazily read ledger entries from file.
+
+    File is either CSV with header containing ``id`` and optional ``income`` and ``status`` columns,
+    or plain text with one payment ID per line.
+
+    :param source: Path to file or opened text file.
+    """
+    if isinstance(source, (str, Path)):
+        with Path(source).open(newline="", encoding="utf-8") as file:
+            yield from read_ledger(file)
+        return
+
+    first_line = source.readline()
+    if not first_line:
+        return
+
+    header = next(csv.reader([first_line]))
+    if "id" not in header:
+        if first_line.strip():
+            yield LedgerEntry(first_line.strip())
+        for line in source:
+            if line.strip():
+                yield LedgerEntry(line.strip())
+        return
+
+    for row in csv.DictReader(source, fieldnames=header):
+        income = row.get("income")
+        status = row.get("status")
+        yield LedgerEntry(
+            payment_id=row["id"],
+            income=float(income) if income else None,
+            status=PaymentStatus[status.upper()] if status else None,
+        )
+
+
+def write_csv(discrepancies: Iterable[Discrepancy], file: IO[str]) -> int:
+    """Write discrepancies to CSV file as they come.
+
+    :param discrepancies: Discrepancies, e.x. from reconcile().
+    :param file: Opened text file.
+    :return: Number of written discrepancies.
+    """
+    writer = csv.DictWriter(file, fieldnames=_FIELDS)
+    writer.writeheader()
+
+    count = 0
+    for discrepancy in discrepancies:
+        writer.writerow(discrepancy.to_dict())
+        count += 1
+    return count
+
+
+def write_jsonl(discrepancies: Iterable[Discrepancy], file: IO[str]) -> int:
+    """Write discrepancies to JSON Lines file as they come.
+
+    :param discrepancies: Discrepancies, e.x. from reconcile().
+    :param file: Opened text file.
+    :return: Number of written discrepancies.
+    """
+    count = 0
+    for discrepancy in discrepancies:
+        file.write(json.dumps(discrepancy.to_dict(), ensure_ascii=False) + "\n")
+        count += 1
+    return count
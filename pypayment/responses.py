@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+from requests.exceptions import InvalidJSONError
+
+if TYPE_CHECKING:
+    import requests
+
+    from pypayment.transport import HttpResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def loads(data: bytes | str) -> Any:  # noqa: ANN401
+    """Deserialize JSON document with orjson if it is installed, otherwise with json."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:  # noqa: ANN401
+    """Serialize object to UTF-8 encoded JSON document with orjson if it is installed, otherwise with json."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode()
+
+
+def parse_json(response: requests.Response | HttpResponse) -> Any:  # noqa: ANN401
+    """Deserialize JSON body of response.
+
+    Call it once per response and keep the result, body is parsed on every call.
+
+    :raise InvalidJSONError: When body is not a valid JSON document.
+    """
+    try:
+        return loads(response.content)
+    except ValueError as e:
+        raise InvalidJSONError(str(e), response=response) from e
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Condition, Lock
+from typing import TYPE_CHECKING
+
+from pypayment.enums.operation import PaymentOperation
+from pypayment.enums.priority import RequestPriority
+from pypayment.exceptions import DeadlineExceeded
+from pypayment.timeouts import get_remaining_time
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+_priority: ContextVar[RequestPriority | None] = ContextVar("priority", default=None)
+
+_DEFAULT_PRIORITIES = {
+    PaymentOperation.AUTHORIZATION: RequestPriority.INTERACTIVE,
+    PaymentOperation.CREATION: RequestPriority.INTERACTIVE,
+    PaymentOperation.STATUS: RequestPriority.BACKGROUND,
+}
+
+
+@contextmanager
+def request_priority(priority: RequestPriority) -> Iterator[None]:
+    """Send provider requests made inside the block in the given RequestScheduler lane.
+
+    Outside of such block, payment creation and authorization are INTERACTIVE, and status checks are BACKGROUND.
+
+    >>> with request_priority(RequestPriority.INTERACTIVE):
+    ...     payment.update()
+
+    :param priority: Lane of the requests.
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def get_request_priority(operation: PaymentOperation) -> RequestPriority:
+    """Return lane of request of the current context."""
+    return _priority.get() or _DEFAULT_PRIORITIES[operation]
+
+
+class _Ticket:
+    __slots__ = ("is_granted",)
+
+    def __init__(self) -> None:
+        self.is_granted = False
+
+
+class RequestScheduler:
+    """Limit simultaneous provider requests of the process, serving lanes by weighted fair queuing.
+
+    When all slots are taken, requests wait in the lane of their priority. Free slots go to lanes
+    in proportion to their weights, and reserved slots are never given to BACKGROUND requests,
+    so payment creation stays fast while large status polls and reconciliations run.
+
+    >>> Payment.set_scheduler(RequestScheduler(capacity=32, reserved=8))
+    """
+
+    def __init__(
+        self,
+        capacity: int = 16,
+        reserved: int = 4,
+        weights: Mapping[RequestPriority, float] | None = None,
+    ) -> None:
+        """Initialize RequestScheduler class.
+
+        :param capacity: Maximum number of simultaneous requests.
+        :param reserved: Number of slots only INTERACTIVE requests may take.
+        :param weights: Share of free slots every lane gets when several lanes wait (default: INTERACTIVE 4,
+            BACKGROUND 1).
+        """
+        if not 0 <= reserved < capacity:
+            raise ValueError("Reserved slots must be fewer than capacity.")
+
+        self.capacity = capacity
+        self.reserved = reserved
+        self.weights = dict(weights or {RequestPriority.INTERACTIVE: 4, RequestPriority.BACKGROUND: 1})
+        self._queues: dict[RequestPriority, deque[_Ticket]] = {priority: deque() for priority in RequestPriority}
+        self._running: dict[RequestPriority, int] = dict.fromkeys(RequestPriority, 0)
+        self._virtual_times: dict[RequestPriority, float] = dict.fromkeys(RequestPriority, 0.0)
+        self._virtual_time = 0.0
+        """Virtual time of the latest granted slot."""
+        self._condition = Condition(Lock())
+
+    def get_waiting(self, priority: RequestPriority) -> int:
+        """Return number of requests waiting in lane."""
+        return len(self._queues[priority])
+
+    def get_running(self, priority: RequestPriority) -> int:
+        """Return number of requests of lane running now."""
+        return self._running[priority]
+
+    @contextmanager
+    def slot(self, priority: RequestPriority) -> Iterator[None]:
+        """Hold a slot while the block runs, waiting for it in the lane of priority.
+
+        :raise DeadlineExceeded: When deadline of the current context passes while waiting.
+        """
+        self._acquire(priority)
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._running[priority] -= 1
+                self._dispatch()
+
+    def _acquire(self, priority: RequestPriority) -> None:
+        ticket = _Ticket()
+        with self._condition:
+            queue = self._queues[priority]
+            if not queue:
+                self._virtual_times[priority] = max(self._virtual_times[priority], self._virtual_time)
+            queue.append(ticket)
+            self._dispatch()
+
+            while not ticket.is_granted:
+                remaining = get_remaining_time()
+                if remaining is not None and remaining <= 0:
+                    queue.remove(ticket)
+                    self._dispatch()
+                    raise DeadlineExceeded("Deadline passed while waiting for request slot.")
+                self._condition.wait(remaining)
+
+    def _dispatch(self) -> None:
+        """Grant free slots to waiting requests of lanes with the lowest virtual time."""
+        is_granted = False
+        while True:
+            running = sum(self._running.values())
+            lanes = [
+                priority for priority, queue in self._queues.items() if queue and running < self._get_capacity(priority)
+            ]
+            if not lanes:
+                break
+
+            priority = min(lanes, key=self._virtual_times.__getitem__)
+            self._queues[priority].popleft().is_granted = True
+            self._running[priority] += 1
+            self._virtual_time = self._virtual_times[priority]
+            self._virtual_times[priority] += 1 / self.weights.get(priority, 1)
+            is_granted = True
+
+        if is_granted:
+            self._condition.notify_all()
+
+    def _get_capacity(self, priority: RequestPriority) -> int:
+        if priority == RequestPriority.INTERACTIVE:
+            return self.capacity
+        return self.capacity - self.reserved
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import hashlib
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Iterable, Iterator
+
+
+class SignatureContext:
+    """Precomputed hashing state for a single set of credentials.
+
+    Signature is a hash of values and secret key joined with separator:
+    ``hash(value_1 | value_2 | ... | secret | after_1 | ...)``.
+    Secret key, separator and static leading values are encoded and hashed only once,
+    so every signature hashes just its own values.
+    """
+
+    __slots__ = ("_new", "_secret", "_separator", "_tail")
+
+    def __init__(self, algorithm: str, secret: str, separator: str = "", prefix: Iterable[object] = ()) -> None:
+        """Initialize SignatureContext class.
+
+        :param algorithm: Name of hashlib algorithm (e.x. md5, sha256).
+        :param secret: Secret key.
+        :param separator: String placed between values.
+        :param prefix: Static values which every signature starts with.
+        """
+        prefix = "".join(str(value) + separator for value in prefix)
+        if prefix:
+            base = hashlib.new(algorithm, prefix.encode())
+            self._new: Callable[[], Any] = base.copy
+        else:
+            self._new = getattr(hashlib, algorithm, None) or partial(hashlib.new, algorithm)
+
+        self._separator = separator
+        self._secret = secret.encode()
+        self._tail = separator.encode() + self._secret
+
+    def sign(self, values: Collection[object], after: Collection[object] = ()) -> str:
+        """Return hex signature.
+
+        :param values: Values placed before secret key.
+        :param after: Values placed after secret key.
+        """
+        digest = self._new()
+        if values:
+            digest.update(self._separator.join(map(str, values)).encode())
+            digest.update(self._tail)
+        else:
+            digest.update(self._secret)
+
+        if after:
+            digest.update((self._separator + self._separator.join(map(str, after))).encode())
+
+        return digest.hexdigest()
+
+    def sign_many(self, rows: Iterable[Collection[object]]) -> Iterator[str]:
+        """Lazily sign many rows of values placed before secret key.
+
+        :param rows: Iterable of values for every signature.
+        """
+        new = self._new
+        join = self._separator.join
+        tail = self._tail
+
+        for values in rows:
+            digest = new()
+            digest.update(join(map(str, values)).encode())
+            digest.update(tail)
+            yield digest.hexdigest()
+
+
+@lru_cache(maxsize=64)
+def get_signature_context(
+    algorithm: str,
+    secret: str,
+    separator: str = "",
+    prefix: tuple[object, ...] = (),
+) -> SignatureContext:
+    """Return cached SignatureContext for passed credentials.
+
+    :param algorithm: Name of hashlib algorithm (e.x. md5, sha256).
+    :param secret: Secret key.
+    :param separator: String placed between values.
+    :param prefix: Static values which every signature starts with.
+    """
+    return SignatureContext(algorithm, secret, separator, prefix)
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, Union
+
+from pypayment import PaymentStatus
+from pypayment.events import PaymentStatusChanged, payment_events
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+    from pypayment import Payment
+
+FeedPosition = Union[int, str]  # noqa: UP007
+"""Position of a record in provider feed. Newer records have greater positions."""
+
+
+@dataclass
+class FeedRecord:
+    """Payment record from provider transaction feed."""
+
+    payment_id: str
+    status: PaymentStatus | None
+    income: float
+    position: FeedPosition
+
+
+@dataclass
+class SyncCursor:
+    """Point in provider feed up to which records have been processed."""
+
+    position: FeedPosition | None = None
+    """Position of the newest processed record."""
+    boundary: list[str] = field(default_factory=list)
+    """IDs of processed records at the newest position."""
+    unsettled: dict[str, tuple[FeedPosition, float]] = field(default_factory=dict)
+    """WAITING payments mapped to their feed position and the time they were first seen."""
+
+    def to_dict(self) -> dict[str, object]:
+        """Return cursor as JSON serializable dict."""
+        return {
+            "position": self.position,
+            "boundary": self.boundary,
+            "unsettled": {payment_id: list(value) for payment_id, value in self.unsettled.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, object]) -> SyncCursor:
+        """Create cursor from dict made by to_dict()."""
+        unsettled: Mapping[str, list[FeedPosition | float]] = data.get("unsettled") or {}  # type: ignore[assignment]
+        return cls(
+            position=data.get("position"),  # type: ignore[arg-type]
+            boundary=list(data.get("boundary") or ()),  # type: ignore[call-overload]
+            unsettled={payment_id: (value[0], float(value[1])) for payment_id, value in unsettled.items()},
+        )
+
+
+@dataclass
+class StatusTransition:
+    """Payment status change found in provider feed."""
+
+    payment_id: str
+    provider: str
+    old: PaymentStatus | None
+    new: PaymentStatus | None
+    income: float
+
+
+class CursorStore(ABC):
+    """Storage of sync cursors."""
+
+    @abstractmethod
+    def load(self, key: str) -> SyncCursor | None:
+        """Return saved cursor or None if there is no cursor for the key yet."""
+
+    @abstractmethod
+    def save(self, key: str, cursor: SyncCursor) -> None:
+        """Save cursor under the key."""
+
+
+class FileCursorStore(CursorStore):
+    """Cursor storage in a JSON file.
+
+    File is replaced atomically on every save, so a crash never leaves a half-written cursor.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Initialize FileCursorStore class.
+
+        :param path: Path to JSON file. Created on the first save.
+        """
+        self._path = Path(path)
+        self._lock = Lock()
+
+    def load(self, key: str) -> SyncCursor | None:
+        data = self._read().get(key)
+        return SyncCursor.from_dict(data) if data else None
+
+    def save(self, key: str, cursor: SyncCursor) -> None:
+        with self._lock:
+            data = self._read()
+            data[key] = cursor.to_dict()
+
+            temporary_path = self._path.with_name(self._path.name + ".tmp")
+            temporary_path.write_text(json.dumps(data), encoding="utf-8")
+            temporary_path.replace(self._path)
+
+    def _read(self) -> dict[str, dict[str, object]]:
+        if not self._path.exists():
+            return {}
+        return json.loads(self._path.read_text(encoding="utf-8"))
+
+
+def sync_transitions(
+    payment_class: type[Payment],
+    store: CursorStore,
+    known_statuses: Mapping[str, PaymentStatus] | None = None,
+    settle_timeout: timedelta = timedelta(days=1),
+) -> Iterator[StatusTransition]:
+    """Fetch provider feed records added or changed since the last run and yield status transitions.
+
+    Only records newer than the saved cursor, and payments that were still WAITING on previous runs, are requested.
+    Cursor is saved when iteration finishes, so an interrupted run is repeated in full next time.
+    Every transition is also published to payment_events.
+
+    Supported by YooMoneyPayment (operation history) and PayOkPayment (transactions).
+
+    :param payment_class: Authorized payment class.
+    :param store: Cursor storage.
+    :param known_statuses: Statuses of payments tracked by merchant. If passed,
+        transitions are yielded only for these payments and are computed against these statuses.
+    :param settle_timeout: Time after which a payment that is still WAITING stops being rechecked.
+    """
+    key = _get_cursor_key(payment_class)
+    cursor = store.load(key) or SyncCursor()
+    now = time.time()
+
+    unsettled = {
+        payment_id: value
+        for payment_id, value in cursor.unsettled.items()
+        if now - value[1] < settle_timeout.total_seconds()
+    }
+    since = cursor.position
+    if since is not None and unsettled:
+        since = min(since, *(position for position, _ in unsettled.values()))
+
+    new_position = cursor.position
+    new_boundary = set(cursor.boundary)
+
+    for record in payment_class._iter_feed(since):  # noqa: SLF001
+        if _is_processed(record, cursor, unsettled):
+            continue
+
+        if new_position is None or record.position > new_position:
+            new_position = record.position
+            new_boundary = {record.payment_id}
+        elif record.position == new_position:
+            new_boundary.add(record.payment_id)
+
+        if record.status == PaymentStatus.WAITING:
+            first_seen = unsettled[record.payment_id][1] if record.payment_id in unsettled else now
+            unsettled[record.payment_id] = (record.position, first_seen)
+        else:
+            unsettled.pop(record.payment_id, None)
+
+        if known_statuses is None:
+            old = PaymentStatus.WAITING if record.payment_id in cursor.unsettled else None
+        elif record.payment_id in known_statuses:
+            old = known_statuses[record.payment_id]
+        else:
+            continue
+
+        if record.status != old:
+            payment_events.publish(
+                PaymentStatusChanged(payment_class, record.payment_id, old, record.status, record.income),
+            )
+            yield StatusTransition(record.payment_id, payment_class.__name__, old, record.status, record.income)
+
+    store.save(key, SyncCursor(new_position, sorted(new_boundary), unsettled))
+
+
+def _is_processed(record: FeedRecord, cursor: SyncCursor, unsettled: Mapping[str, object]) -> bool:
+    """Return True if record was fully processed on a previous run and can not have changed since."""
+    if cursor.position is None or record.payment_id in unsettled:
+        return False
+    if record.position < cursor.position:
+        return True
+    return record.position == cursor.position and record.payment_id in cursor.boundary
+
+
+def _get_cursor_key(payment_class: type[Payment]) -> str:
+    """Return cursor key of payment class account, without exposing credentials."""
+    credentials = repr(payment_class._get_credentials()).encode()  # noqa: SLF001
+    return f"{payment_class.__name__}:{hashlib.sha256(credentials).hexdigest()[:16]}"
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import requests
+
+from pypayment.connections import get_session
+from pypayment.exceptions import DeadlineExceeded
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class Timeout(NamedTuple):
+    """Connect and read timeouts of a request in seconds."""
+
+    connect: float = 10
+    read: float = 10
+
+
+DEFAULT_TIMEOUT = Timeout()
+
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+_timeout_override: ContextVar[Timeout | None] = ContextVar("timeout_override", default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Limit total time of all provider requests made inside the block.
+
+    Every request gets at most the time left, and no request is sent once the deadline has passed.
+    Nested deadlines can only shorten the outer one.
+
+    >>> with deadline(2):
+    ...     payment = QiwiPayment(100)
+
+    :param seconds: Time budget of the block.
+    """
+    expires_at = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(expires_at if outer is None else min(outer, expires_at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def request_timeout(timeout: Timeout | float) -> Iterator[None]:
+    """Override timeouts of provider requests made inside the block.
+
+    :param timeout: Timeout, or one number used for both connect and read timeouts.
+    """
+    token = _timeout_override.set(timeout if isinstance(timeout, Timeout) else Timeout(timeout, timeout))
+    try:
+        yield
+    finally:
+        _timeout_override.reset(token)
+
+
+def get_remaining_time() -> float | None:
+    """Return seconds left until the current deadline, or None if there is no deadline."""
+    expires_at = _deadline.get()
+    return None if expires_at is None else expires_at - time.monotonic()
+
+
+def request(method: str, url: str, timeout: Timeout, **kwargs: Any) -> requests.Response:  # noqa: ANN401
+    """Send HTTP request within timeout override and deadline of the current context.
+
+    Read timeout limits every wait for data, so a server sending data slowly may overrun the deadline
+    by up to one read timeout.
+
+    :param method: HTTP method.
+    :param url: Request URL.
+    :param timeout: Timeout of the operation, used unless overridden with request_timeout().
+    :param kwargs: Other requests.request() arguments.
+
+    :raise DeadlineExceeded: When deadline has passed before or during the request.
+    """
+    connect, read = _timeout_override.get() or timeout
+    remaining = get_remaining_time()
+    if remaining is None:
+        return get_session().request(method, url, timeout=(connect, read), **kwargs)
+
+    if remaining <= 0:
+        raise DeadlineExceeded(f"Deadline passed before {method} {url}.")
+
+    try:
+        return get_session().request(method, url, timeout=(min(connect, remaining), min(read, remaining)), **kwargs)
+    except requests.Timeout as e:
+        if remaining <= connect or remaining <= read:
+            raise DeadlineExceeded(f"Deadline passed during {method} {url}.") from e
+        raise
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import requests
+
+from pypayment.timeouts import request
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from pypayment import PaymentOperation
+    from pypayment.timeouts import Timeout
+
+
+@dataclass
+class HttpRequest:
+    """Request to provider API as plain data, ready to be sent by any HTTP client."""
+
+    operation: PaymentOperation
+    method: str
+    url: str
+    params: Mapping[str, Any] | None = None
+    data: Mapping[str, Any] | bytes | None = None
+    """Form fields, or raw body."""
+    headers: Mapping[str, str] | None = None
+
+
+@dataclass
+class HttpResponse:
+    """Response of provider API as plain data."""
+
+    status_code: int
+    content: bytes
+    url: str = ""
+    """Final URL after redirects."""
+
+    @property
+    def text(self) -> str:
+        """Body decoded as UTF-8."""
+        return self.content.decode("utf-8", "replace")
+
+    def __bool__(self) -> bool:
+        """Return True if status code is not an error."""
+        return self.status_code < requests.codes.bad_request
+
+
+def send(http_request: HttpRequest, timeout: Timeout) -> HttpResponse:
+    """Send request with requests, within timeout override and deadline of the current context.
+
+    :raise RequestException: When request fails.
+    :raise DeadlineExceeded: When deadline has passed.
+    """
+    response = request(
+        http_request.method,
+        http_request.url,
+        timeout,
+        params=http_request.params,
+        data=http_request.data,
+        headers=http_request.headers,
+    )
+    return HttpResponse(response.status_code, response.content, response.url)
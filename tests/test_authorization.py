@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import TYPE_CHECKING, Any
+from unittest import mock
+
+import pytest
+import requests
+
+from pypayment import AuthorizationError, QiwiPayment, YooMoneyPayment, authorize_all
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+AUTHORIZATIONS: dict[type, dict[str, Any]] = {
+    QiwiPayment: {"secret_key": "key"},
+    YooMoneyPayment: {"access_token": "token"},
+}
+
+
+@pytest.fixture
+def api() -> Iterator[dict[str, Any]]:
+    """Serve Qiwi and YooMoney credentials checks from a mocked session."""
+    api: dict[str, Any] = {"status_code": requests.codes.ok, "delay": 0.0, "requests": []}
+
+    def respond(method: str, url: str, **_: Any) -> requests.Response:  # noqa: ANN401
+        api["requests"].append(url)
+        threading.Event().wait(api["delay"] if "qiwi" in url else 0.0)
+        response = requests.Response()
+        response.status_code = api["status_code"] if "qiwi" in url else requests.codes.ok
+        response.url = url
+        response._content = json.dumps({"account": "4100"}).encode()
+        return response
+
+    with mock.patch.object(requests.Session, "request", side_effect=respond):
+        yield api
+
+
+def test_authorize_all(api: dict[str, Any]) -> None:
+    authorize_all(AUTHORIZATIONS, timeout=5)
+
+    assert QiwiPayment.authorized
+    assert YooMoneyPayment.authorized
+    assert len(api["requests"]) == 2
+
+
+def test_authorize_all_failure(api: dict[str, Any]) -> None:
+    api["status_code"] = requests.codes.unauthorized
+
+    with pytest.raises(AuthorizationError, match=r"QiwiPayment \(Secret key is invalid.\)") as error:
+        authorize_all(AUTHORIZATIONS)
+
+    assert "YooMoneyPayment" not in str(error.value)
+    assert YooMoneyPayment.authorized
+
+
+def test_authorize_all_timeout(api: dict[str, Any]) -> None:
+    api["delay"] = 0.3
+
+    with pytest.raises(AuthorizationError, match=r"QiwiPayment \(timed out\)"):
+        authorize_all(AUTHORIZATIONS, timeout=0.05)
+
+    assert not QiwiPayment.authorized
+    threading.Event().wait(0.5)
+    # Late success of the check does not authorize the class.
+    assert not QiwiPayment.authorized
+
+
+def test_authorize_all_lazy(api: dict[str, Any]) -> None:
+    authorize_all({QiwiPayment: {"secret_key": "key"}}, lazy=True)
+
+    assert QiwiPayment.authorized
+    assert api["requests"] == []
+
+    QiwiPayment._verify_pending_authorization()
+    assert len(api["requests"]) == 1
+    QiwiPayment._verify_pending_authorization()
+    assert len(api["requests"]) == 1
+
+
+def test_authorize_all_lazy_failure(api: dict[str, Any]) -> None:
+    api["status_code"] = requests.codes.unauthorized
+    authorize_all({QiwiPayment: {"secret_key": "key"}}, lazy=True)
+
+    with pytest.raises(AuthorizationError, match="Secret key is invalid"):
+        QiwiPayment._verify_pending_authorization()
+    assert not QiwiPayment.authorized
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+from unittest import mock
+
+import pytest
+import requests
+
+from pypayment import PaymentCreationError, QiwiPayment
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture
+def api() -> Iterator[dict[str, Any]]:
+    """Serve Qiwi API from a mocked session and return status code of invoice creation."""
+    api: dict[str, Any] = {"status_code": requests.codes.ok}
+
+    def respond(method: str, url: str, **_: Any) -> requests.Response:  # noqa: ANN401
+        response = requests.Response()
+        response.status_code = api["status_code"] if method.upper() == "PUT" else requests.codes.ok
+        response.url = url
+        response._content = json.dumps({"payUrl": "https://qiwi.invalid/"}).encode()
+        return response
+
+    with mock.patch.object(requests.Session, "request", side_effect=respond):
+        QiwiPayment.authorize(secret_key="key")
+        yield api
+
+
+def test_create_many(api: dict[str, Any]) -> None:
+    result = QiwiPayment.create_many([{"amount": 1}, {"amount": 2, "unknown": True}, {"amount": 3}])
+
+    assert [payment.amount for payment in result.created] == [1, 3]
+    assert all(payment.url for payment in result.created)
+    assert [failure.index for failure in result.failed] == [1]
+    assert isinstance(result.failed[0].error, TypeError)
+
+
+def test_create_many_collects_creation_errors(api: dict[str, Any]) -> None:
+    api["status_code"] = requests.codes.bad_request
+    result = QiwiPayment.create_many([{"amount": 1}, {"amount": 2}])
+
+    assert result.created == []
+    assert [failure.index for failure in result.failed] == [0, 1]
+    assert all(isinstance(failure.error, PaymentCreationError) for failure in result.failed)
+
+
+@pytest.mark.parametrize("max_concurrency", [0, -1])
+def test_create_many_max_concurrency(max_concurrency: int) -> None:
+    with pytest.raises(ValueError, match="Max concurrency must be positive"):
+        QiwiPayment.create_many([{"amount": 1}], max_concurrency=max_concurrency)
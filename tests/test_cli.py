@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import io
+import json
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pypayment import PaymentStatus, QiwiPayment
+from pypayment.cli import _get_parser, _Progress, _reconcile, main
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def run(tmp_path: Path, *args: str, lines: list[str]) -> tuple[int, list[dict]]:
+    source = tmp_path / "input.txt"
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    output = tmp_path / "output.jsonl"
+    code = main([*args, "-i", str(source), "-o", str(output), "-q"])
+    return code, [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+
+
+def test_create_links_fake_without_credentials(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("PYPAYMENT_QIWI_SECRET_KEY", raising=False)
+    code, records = run(
+        tmp_path,
+        "create-links",
+        "qiwi",
+        "--fake",
+        lines=["1", '{"amount": 2, "payment_type": "card"}'],
+    )
+
+    assert code == 0
+    assert [record["amount"] for record in records] == [1, 2]
+    assert all(record["url"] and record["error"] is None for record in records)
+
+
+def test_status_fake_without_credentials(tmp_path: Path) -> None:
+    code, records = run(tmp_path, "status", "qiwi", "--fake", lines=["unknown"])
+
+    assert code == 1
+    assert records == [{"payment_id": "unknown", "status": None, "income": None, "error": "not_found"}]
+
+
+@pytest.mark.parametrize("spec", ['{"amount": 1, "payment_type": "bitcoin"}', '{"amount": 1, "payment_type": 5}'])
+def test_create_links_invalid_enum(tmp_path: Path, capsys: pytest.CaptureFixture[str], spec: str) -> None:
+    with pytest.raises(SystemExit) as error:
+        run(tmp_path, "create-links", "qiwi", "--fake", lines=[spec])
+
+    assert error.value.code == 2
+    assert "invalid payment_type value" in capsys.readouterr().err
+
+
+def test_invalid_credential(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("PYPAYMENT_PAYOK_API_ID", "first")
+    with pytest.raises(SystemExit) as error:
+        run(tmp_path, "status", "payok", "--fake", lines=["id"])
+
+    assert error.value.code == 2
+    assert "invalid api_id value: 'first'" in capsys.readouterr().err
+
+
+def test_reconcile_progress_counts_compared_rows(monkeypatch: pytest.MonkeyPatch) -> None:
+    progress = _Progress(None)
+    seen: list[int] = []
+    lock = threading.Lock()
+
+    def get_status_and_income(payment_id: str) -> tuple[PaymentStatus, float]:
+        with lock:
+            seen.append(progress.done)
+        return PaymentStatus.PAID, 1.0
+
+    monkeypatch.setattr(QiwiPayment, "get_status_and_income", get_status_and_income)
+    args = _get_parser().parse_args(["reconcile", "qiwi", "-c", "1"])
+    _reconcile(QiwiPayment, args, io.StringIO("first\nsecond\nthird\n"), io.StringIO(), progress)
+
+    assert seen[0] == 0
+    assert progress.done == 3
+    assert progress.errors == 0
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pypayment import DeadlineExceeded, deadline
+from pypayment.coalescing import SingleFlight
+
+
+def test_concurrent_calls_share_one_call() -> None:
+    flight = SingleFlight()
+    release = threading.Event()
+    is_started = threading.Event()
+    calls = []
+
+    def function() -> int:
+        calls.append(None)
+        is_started.set()
+        release.wait()
+        return len(calls)
+
+    with ThreadPoolExecutor(4) as executor:
+        owner = executor.submit(flight.call, "key", function)
+        is_started.wait()
+        waiters = [executor.submit(flight.call, "key", function) for _ in range(3)]
+        release.set()
+
+    assert [future.result() for future in [owner, *waiters]] == [1, 1, 1, 1]
+    assert len(calls) == 1
+
+
+def test_waiters_get_exception() -> None:
+    flight = SingleFlight()
+    release = threading.Event()
+    is_started = threading.Event()
+
+    def function() -> int:
+        is_started.set()
+        release.wait()
+        raise KeyError("failure")
+
+    with ThreadPoolExecutor(2) as executor:
+        owner = executor.submit(flight.call, "key", function)
+        is_started.wait()
+        waiter = executor.submit(flight.call, "key", function)
+        release.set()
+
+    for future in [owner, waiter]:
+        with pytest.raises(KeyError):
+            future.result()
+
+
+def test_results_are_not_cached() -> None:
+    flight = SingleFlight()
+    results = iter([1, 2])
+    assert flight.call("key", lambda: next(results)) == 1
+    assert flight.call("key", lambda: next(results)) == 2
+
+
+def test_different_keys_do_not_share() -> None:
+    flight = SingleFlight()
+    assert flight.call("first", lambda: 1) == 1
+    assert flight.call("second", lambda: 2) == 2
+
+
+def test_async_call_joins_call_in_flight() -> None:
+    flight = SingleFlight()
+    release = threading.Event()
+    is_started = threading.Event()
+
+    def function() -> str:
+        is_started.set()
+        release.wait()
+        return "shared"
+
+    async def main() -> list[str]:
+        owner = asyncio.get_running_loop().run_in_executor(None, flight.call, "key", function)
+        await asyncio.get_running_loop().run_in_executor(None, is_started.wait)
+        waiter = asyncio.ensure_future(flight.acall("key", lambda: "own"))
+        await asyncio.sleep(0.01)
+        release.set()
+        return [await owner, await waiter]
+
+    assert asyncio.run(main()) == ["shared", "shared"]
+
+
+def test_waiter_gives_up_at_deadline() -> None:
+    flight = SingleFlight()
+    release = threading.Event()
+    is_started = threading.Event()
+
+    def function() -> str:
+        is_started.set()
+        release.wait()
+        return "shared"
+
+    with ThreadPoolExecutor(1) as executor:
+        owner = executor.submit(flight.call, "key", function)
+        is_started.wait()
+        with deadline(0.05), pytest.raises(DeadlineExceeded):
+            flight.call("key", function)
+        release.set()
+
+    assert owner.result() == "shared"
+
+
+def test_async_waiter_gives_up_at_deadline() -> None:
+    flight = SingleFlight()
+    release = threading.Event()
+    is_started = threading.Event()
+
+    def function() -> str:
+        is_started.set()
+        release.wait()
+        return "shared"
+
+    async def main() -> str:
+        owner = asyncio.get_running_loop().run_in_executor(None, flight.call, "key", function)
+        await asyncio.get_running_loop().run_in_executor(None, is_started.wait)
+        with deadline(0.05), pytest.raises(DeadlineExceeded):
+            await flight.acall("key", function)
+        release.set()
+        return await owner
+
+    # Shared call is not cancelled by the waiter giving up.
+    assert asyncio.run(main()) == "shared"
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import math
+import threading
+from typing import TYPE_CHECKING, Any
+from unittest import mock
+
+import pytest
+import requests
+
+from pypayment import (
+    AdaptiveConcurrency,
+    AdaptiveLimiter,
+    DeadlineExceeded,
+    PaymentGettingError,
+    QiwiPayment,
+    deadline,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+def make_limiter(**settings: Any) -> AdaptiveLimiter:  # noqa: ANN401
+    """Return limiter that ignores latency, which is too noisy in tests to signal overload."""
+    return AdaptiveLimiter(latency_tolerance=math.inf, **settings)
+
+
+def complete(limiter: AdaptiveLimiter, count: int, status_code: int = requests.codes.ok) -> None:
+    """Run count requests at once, all answered with status code."""
+    permits = [limiter.acquire() for _ in range(count)]
+    for permit in permits:
+        with permit:
+            permit.set_response(status_code)
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [{"initial_limit": 0}, {"min_limit": 5, "initial_limit": 4}, {"max_limit": 2}, {"backoff": 1.0}],
+)
+def test_invalid_settings(settings: dict[str, Any]) -> None:
+    with pytest.raises(ValueError):  # noqa: PT011
+        AdaptiveConcurrency(**settings)
+
+
+def test_additive_increase() -> None:
+    limiter = make_limiter(initial_limit=2, max_limit=3)
+
+    complete(limiter, 2)
+    complete(limiter, 2)
+    assert limiter.limit == 2
+    complete(limiter, 2)
+    assert limiter.limit == 3
+    for _ in range(10):
+        complete(limiter, 3)
+    assert limiter.limit == 3
+    assert limiter.in_flight == 0
+
+
+def test_no_increase_below_limit() -> None:
+    limiter = make_limiter(initial_limit=4)
+    for _ in range(20):
+        complete(limiter, 1)
+    assert limiter.limit == 4
+
+
+@pytest.mark.parametrize("status_code", [requests.codes.too_many_requests, requests.codes.bad_gateway])
+def test_multiplicative_decrease(status_code: int) -> None:
+    limiter = make_limiter(initial_limit=16, min_limit=3)
+
+    # One burst of throttled requests decreases limit once.
+    complete(limiter, 8, status_code)
+    assert limiter.limit == 8
+    complete(limiter, 8, status_code)
+    assert limiter.limit == 4
+    complete(limiter, 4, status_code)
+    assert limiter.limit == 3
+
+
+def test_errors() -> None:
+    limiter = make_limiter(initial_limit=8)
+
+    with pytest.raises(KeyError), limiter.acquire():
+        raise KeyError
+    assert limiter.limit == 8
+
+    with pytest.raises(requests.ConnectionError), limiter.acquire():
+        raise requests.ConnectionError
+    assert limiter.limit == 4
+
+
+def test_latency_increase() -> None:
+    limiter = AdaptiveLimiter(initial_limit=8, latency_tolerance=2.0, window=10)
+    clock = iter([0.0, 0.1, 0.0, 0.15, 0.0, 0.5])
+
+    with mock.patch("pypayment.concurrency.time") as time:
+        time.monotonic.side_effect = lambda: next(clock)
+        complete(limiter, 1)
+        complete(limiter, 1)
+        assert limiter.limit == 8
+        complete(limiter, 1)
+    assert limiter.limit == 4
+
+
+def test_acquire_waits_for_free_slot() -> None:
+    limiter = make_limiter(initial_limit=1)
+    permit = limiter.acquire()
+
+    with deadline(0.05), pytest.raises(DeadlineExceeded):
+        limiter.acquire()
+
+    threading.Timer(0.05, permit.__exit__, (None, None, None)).start()
+    with limiter.acquire():
+        assert limiter.in_flight == 1
+    assert limiter.in_flight == 0
+
+
+@pytest.fixture
+def throttled() -> Iterator[None]:
+    """Answer every Qiwi request with 429 Too Many Requests."""
+
+    def respond(method: str, url: str, **_: Any) -> requests.Response:  # noqa: ANN401
+        response = requests.Response()
+        response.status_code = requests.codes.ok if method == "GET" and url == QiwiPayment._API_URL else 429
+        response.url = url
+        response._content = json.dumps({}).encode()
+        return response
+
+    with mock.patch.object(requests.Session, "request", side_effect=respond):
+        QiwiPayment.authorize(secret_key="key")
+        yield
+    QiwiPayment.set_adaptive_concurrency(None)
+
+
+def test_payment_class_limits(throttled: None) -> None:
+    concurrency = AdaptiveConcurrency(initial_limit=8, latency_tolerance=math.inf)
+    QiwiPayment.set_adaptive_concurrency(concurrency)
+
+    with pytest.raises(PaymentGettingError):
+        QiwiPayment.get_status_and_income("id")
+
+    assert list(concurrency.get_limits().values()) == [4]
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import socket
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, Any
+from unittest import mock
+
+import pytest
+
+from pypayment import configure_connections, prewarm
+from pypayment.connections import get_session
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Answer every request with an empty response, keeping connection alive."""
+
+    protocol_version = "HTTP/1.1"
+    server: Server
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self) -> None:
+        self._respond()
+
+    def do_HEAD(self) -> None:
+        with self.server.lock:
+            self.server.heads += 1
+        self._respond()
+
+    def _respond(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *_: Any) -> None:  # noqa: ANN401
+        pass
+
+
+class Server(ThreadingHTTPServer):
+    """Local HTTP server counting opened connections and HEAD requests."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        """Listen on a free port of 127.0.0.1."""
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.lock = Lock()
+        self.connections = 0
+        self.heads = 0
+
+
+@pytest.fixture
+def server() -> Iterator[Server]:
+    server = Server()
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    configure_connections()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        configure_connections()
+
+
+def test_prewarm(server: Server) -> None:
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    prewarm([url], connections=2)
+    assert server.heads == 2
+    connections = server.connections
+
+    get_session().get(url, timeout=5)
+    assert server.connections == connections
+
+
+def test_prewarm_ignores_failures() -> None:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    prewarm([f"http://127.0.0.1:{port}"], connections=1, timeout=1)
+
+
+def test_dns_cache_falls_back_to_next_address(server: Server) -> None:
+    getaddrinfo = socket.getaddrinfo
+    resolved: list[str] = []
+
+    def resolve(host: str, port: int, *args: Any) -> list[Any]:  # noqa: ANN401
+        if host != "provider.invalid":
+            return getaddrinfo(host, port, *args)
+        resolved.append(host)
+        # The first address does not accept connections on the server port.
+        return [
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.2", port)),
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port)),
+        ]
+
+    url = f"http://provider.invalid:{server.server_address[1]}"
+    with mock.patch("socket.getaddrinfo", side_effect=resolve):
+        assert get_session().get(url, timeout=5).ok
+        configure_connections()
+        assert get_session().get(url, timeout=5).ok
+    assert resolved == ["provider.invalid"]
+
+
+def test_configure_connections_retires_session() -> None:
+    session = get_session()
+    with mock.patch.object(session, "close") as close:
+        configure_connections(pool_size=4)
+    assert get_session() is not session
+    close.assert_not_called()
+    configure_connections()
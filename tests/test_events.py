@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from typing import TYPE_CHECKING, Any
+from unittest import mock
+
+import pytest
+import requests
+
+from pypayment import (
+    EventBufferFull,
+    EventBus,
+    PaymentStatus,
+    PaymentStatusChanged,
+    QiwiPayment,
+    payment_events,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+def event(payment_id: str = "id") -> PaymentStatusChanged:
+    return PaymentStatusChanged(QiwiPayment, payment_id, PaymentStatus.WAITING, PaymentStatus.PAID, 10.0)
+
+
+def publish_later(bus: EventBus, *events: PaymentStatusChanged) -> threading.Thread:
+    thread = threading.Thread(target=lambda: [bus.publish(event) for event in events])
+    thread.start()
+    return thread
+
+
+def test_subscribe() -> None:
+    bus = EventBus()
+    received: list[PaymentStatusChanged] = []
+    unsubscribe = bus.subscribe(received.append)
+
+    bus.publish(event("first"))
+    unsubscribe()
+    bus.publish(event("second"))
+    bus.unsubscribe(received.append)
+
+    assert [event.payment_id for event in received] == ["first"]
+
+
+def test_buffer() -> None:
+    bus = EventBus()
+    with bus.buffer(maxsize=2) as events:
+        publisher = publish_later(bus, *(event(str(index)) for index in range(5)))
+        received = [events.get(timeout=5).payment_id for _ in range(5)]  # type: ignore[union-attr]
+        publisher.join()
+        assert events.get(timeout=0.01) is None
+
+    assert received == ["0", "1", "2", "3", "4"]
+    assert bus._subscribers == ()
+
+
+def test_buffer_close_keeps_buffered_events() -> None:
+    bus = EventBus()
+    events = bus.buffer()
+    bus.publish(event("first"))
+    events.close()
+    bus.publish(event("second"))
+
+    assert [event.payment_id for event in events] == ["first"]
+
+
+def test_buffer_full() -> None:
+    bus = EventBus()
+    with bus.buffer(maxsize=1, timeout=0.01):
+        bus.publish(event())
+        with pytest.raises(EventBufferFull):
+            bus.publish(event())
+
+
+def test_stream() -> None:
+    bus = EventBus()
+
+    async def consume() -> list[str]:
+        async with bus.stream(maxsize=2) as events:
+            bus.publish(event("loop"))
+            publisher = publish_later(bus, *(event(str(index)) for index in range(3)))
+            received = []
+            async for received_event in events:
+                received.append(received_event.payment_id)
+                if len(received) == 4:
+                    break
+            await asyncio.get_running_loop().run_in_executor(None, publisher.join)
+            return received
+
+    assert asyncio.run(consume()) == ["loop", "0", "1", "2"]
+    assert bus._subscribers == ()
+
+
+def test_stream_full_in_loop_thread() -> None:
+    bus = EventBus()
+
+    async def publish() -> None:
+        async with bus.stream(maxsize=1):
+            bus.publish(event())
+            bus.publish(event())
+
+    with pytest.raises(EventBufferFull):
+        asyncio.run(publish())
+
+
+@pytest.fixture
+def qiwi() -> Iterator[dict[str, Any]]:
+    """Serve Qiwi API from a mocked session and return status reported by it."""
+    api: dict[str, Any] = {"status": "WAITING"}
+
+    def respond(method: str, url: str, **_: Any) -> requests.Response:  # noqa: ANN401
+        body = {"status": {"value": api["status"]}, "amount": {"value": "10.00"}, "payUrl": "https://qiwi.invalid/"}
+        response = requests.Response()
+        response.status_code = requests.codes.ok
+        response.url = url
+        response._content = json.dumps(body).encode()
+        return response
+
+    with mock.patch.object(requests.Session, "request", side_effect=respond):
+        QiwiPayment.authorize(secret_key="key")
+        yield api
+
+
+def test_update_publishes_changes(qiwi: dict[str, Any]) -> None:
+    payment = QiwiPayment(10)
+    received: list[PaymentStatusChanged] = []
+    unsubscribe = payment_events.subscribe(received.append)
+    try:
+        payment.update()
+        qiwi["status"] = "PAID"
+        payment.update()
+        payment.update()
+    finally:
+        unsubscribe()
+
+    assert received == [
+        PaymentStatusChanged(QiwiPayment, payment.id, PaymentStatus.WAITING, PaymentStatus.PAID, 10.0, payment),
+    ]
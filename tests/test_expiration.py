@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any
+from unittest import mock
+
+import pytest
+import requests
+
+from pypayment import PaymentStatus, QiwiPayment
+from pypayment.polling import PollTarget, ShardedPoller
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture
+def api() -> Iterator[dict[str, Any]]:
+    """Serve Qiwi API from a mocked session and return provider status and sent requests."""
+    api: dict[str, Any] = {"status": "WAITING", "requests": []}
+
+    def respond(method: str, url: str, data: bytes | None = None, **_: Any) -> requests.Response:  # noqa: ANN401
+        api["requests"].append((method.upper(), json.loads(data) if data else None))
+        body = {"status": {"value": api["status"]}, "amount": {"value": "10.00"}, "payUrl": "https://qiwi.invalid/"}
+        response = requests.Response()
+        response.status_code = requests.codes.ok
+        response.url = url
+        response._content = json.dumps(body).encode()
+        return response
+
+    with mock.patch.object(requests.Session, "request", side_effect=respond):
+        QiwiPayment.authorize(secret_key="key", expiration_duration=timedelta(minutes=30))
+        api["requests"].clear()
+        yield api
+
+
+def ago(**duration: float) -> datetime:
+    return datetime.now(timezone.utc) - timedelta(**duration)  # noqa: UP017
+
+
+def test_expires_at(api: dict[str, Any]) -> None:
+    payment = QiwiPayment(10)
+
+    assert payment.expires_at == payment.created_at + timedelta(minutes=30)
+    method, data = api["requests"][0]
+    assert method == "PUT"
+    assert datetime.fromisoformat(data["expirationDateTime"]) == payment.expires_at
+
+
+def test_update_overdue(api: dict[str, Any]) -> None:
+    payment = QiwiPayment(10)
+    payment.expires_at = ago(hours=1)
+    api["requests"].clear()
+
+    payment.update()
+
+    assert payment.status == PaymentStatus.EXPIRED
+    assert not payment.is_overdue
+    assert api["requests"] == []
+
+
+@pytest.mark.parametrize(
+    ("provider_status", "status"),
+    [("WAITING", PaymentStatus.EXPIRED), ("PAID", PaymentStatus.PAID)],
+)
+def test_update_overdue_confirmed(api: dict[str, Any], provider_status: str, status: PaymentStatus) -> None:
+    payment = QiwiPayment(10)
+    payment.expires_at = ago(hours=1)
+    api["requests"].clear()
+    api["status"] = provider_status
+
+    payment.update(confirm_expiration=True)
+
+    assert payment.status == status
+    assert len(api["requests"]) == 1
+
+
+def test_update_within_grace_period(api: dict[str, Any]) -> None:
+    payment = QiwiPayment(10)
+    payment.expires_at = ago(seconds=30)
+    api["requests"].clear()
+
+    assert not payment.is_overdue
+    payment.update()
+
+    assert payment.status == PaymentStatus.WAITING
+    assert len(api["requests"]) == 1
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="Workers inherit mocked provider only when forked.",
+)
+@pytest.mark.parametrize(("confirm_expiration", "status"), [(False, PaymentStatus.EXPIRED), (True, PaymentStatus.PAID)])
+def test_poll_overdue(confirm_expiration: bool, status: PaymentStatus) -> None:
+    status_checks = mock.patch.object(QiwiPayment, "get_status_and_income", return_value=(PaymentStatus.PAID, 10.0))
+    targets = [PollTarget(QiwiPayment, "overdue", ago(hours=1)), PollTarget(QiwiPayment, "fresh", ago(seconds=30))]
+
+    with mock.patch.object(QiwiPayment, "_try_authorize"), status_checks:
+        poller = ShardedPoller({QiwiPayment: {"secret_key": "key"}}, processes=1)
+        with poller:
+            results = {result.payment_id: result for result in poller.poll(targets, confirm_expiration)}
+
+    assert results["overdue"].status == status
+    assert results["fresh"].status == PaymentStatus.PAID
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import threading
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pytest
+import requests
+
+from pypayment import (
+    AuthorizationError,
+    DeadlineExceeded,
+    FakeBackend,
+    PaymentCreationError,
+    PaymentGettingError,
+    PaymentNotFound,
+    PaymentStatus,
+    QiwiPayment,
+    deadline,
+    fake_providers,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture(autouse=True)
+def session() -> Iterator[mock.Mock]:
+    """Fail every real request to provider API."""
+    with mock.patch.object(requests.Session, "request", side_effect=requests.ConnectionError) as request:
+        yield request
+
+
+def authorize(backend: FakeBackend, **parameters: timedelta) -> None:
+    with fake_providers(backend):
+        QiwiPayment.authorize(secret_key="fake", **parameters)
+
+
+def test_fake_payment(session: mock.Mock) -> None:
+    backend = FakeBackend(pay_rate=1.0, time_to_pay=0.05)
+    authorize(backend)
+    payment = QiwiPayment(10)
+
+    assert payment.url == f"https://pypayment.invalid/QiwiPayment/{payment.id}"
+    assert QiwiPayment.get_status_and_income(payment.id) == (PaymentStatus.WAITING, 0.0)
+    assert QiwiPayment.get_balance() == 0
+
+    threading.Event().wait(0.1)
+    payment.update()
+    assert (payment.status, payment.income) == (PaymentStatus.PAID, 10.0)
+    assert QiwiPayment.get_balance() == 10.0
+    session.assert_not_called()
+
+
+def test_fake_payment_expires() -> None:
+    authorize(FakeBackend(pay_rate=0.0), expiration_duration=timedelta(seconds=0.05))
+    payment = QiwiPayment(10)
+
+    threading.Event().wait(0.1)
+    assert QiwiPayment.get_status_and_income(payment.id) == (PaymentStatus.EXPIRED, 0.0)
+
+
+def test_fake_payment_not_found() -> None:
+    backend = FakeBackend()
+    authorize(backend)
+    payment = QiwiPayment(10)
+    backend.clear()
+
+    with pytest.raises(PaymentNotFound):
+        QiwiPayment.get_status_and_income(payment.id)
+
+
+def test_fake_failures() -> None:
+    backend = FakeBackend(failure_rate=1.0)
+    authorize(backend)
+
+    with pytest.raises(PaymentCreationError, match="Simulated failure"):
+        QiwiPayment(10)
+    with pytest.raises(PaymentGettingError, match="Simulated failure"):
+        QiwiPayment.get_status_and_income("id")
+    with pytest.raises(PaymentGettingError, match="Simulated failure"):
+        QiwiPayment.get_balance()
+
+
+def test_fake_latency_respects_deadline() -> None:
+    authorize(FakeBackend(latency=lambda: 1.0))
+
+    with deadline(0.05), pytest.raises(DeadlineExceeded):
+        QiwiPayment(10)
+
+
+def test_authorize_outside_block_switches_back(session: mock.Mock) -> None:
+    authorize(FakeBackend())
+    QiwiPayment(10)
+    session.assert_not_called()
+
+    with pytest.raises(AuthorizationError):
+        QiwiPayment.authorize(secret_key="real")
+    session.assert_called()
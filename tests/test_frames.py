@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from pypayment import (
+    FakeBackend,
+    PaymentFrame,
+    PaymentStatus,
+    QiwiPayment,
+    QiwiPaymentType,
+    YooMoneyPayment,
+    YooMoneyPaymentType,
+    fake_providers,
+)
+from pypayment import frames as frames_module
+
+
+@pytest.fixture(params=["numpy", "array"], autouse=True)
+def _backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Run every test with NumPy, when it is installed, and with standard library arrays."""
+    if request.param == "numpy":
+        monkeypatch.setattr(frames_module, "np", pytest.importorskip("numpy"))
+    else:
+        monkeypatch.setattr(frames_module, "np", None)
+
+
+@pytest.fixture
+def frame() -> PaymentFrame:
+    with fake_providers(FakeBackend()):
+        QiwiPayment.authorize(secret_key="fake", payment_type=QiwiPaymentType.CARD)
+        YooMoneyPayment.authorize(access_token="fake", payment_type=YooMoneyPaymentType.WALLET)
+
+    payments = [
+        QiwiPayment(100),
+        QiwiPayment(200),
+        QiwiPayment(300, payment_type=QiwiPaymentType.WALLET),
+        YooMoneyPayment(50),
+        YooMoneyPayment(70),
+    ]
+    outcomes = [
+        (PaymentStatus.PAID, 97.0),
+        (PaymentStatus.WAITING, None),
+        (PaymentStatus.PAID, 291.0),
+        (PaymentStatus.PAID, 49.5),
+        (PaymentStatus.EXPIRED, 0.0),
+    ]
+    for payment, (status, income) in zip(payments, outcomes):  # noqa: B905
+        payment.status = status
+        payment.income = income
+    return PaymentFrame.from_payments(payments)
+
+
+def test_columns(frame: PaymentFrame) -> None:
+    assert len(frame) == frame.count() == 5
+    assert list(frame.get_column("amount")) == [100, 200, 300, 50, 70]
+    assert math.isnan(frame.get_column("income")[1])
+    assert frame.get_labels("provider") == ["QiwiPayment", "YooMoneyPayment"]
+    assert list(frame.get_column("provider")) == [0, 0, 0, 1, 1]
+    assert frame.get_labels("currency") == ["RUB"]
+    assert frame.get_labels("status") == list(PaymentStatus)
+
+
+def test_sum(frame: PaymentFrame) -> None:
+    assert frame.sum() == 437.5
+    assert frame.sum("amount") == 720
+
+
+def test_filter(frame: PaymentFrame) -> None:
+    paid = frame.filter(status=PaymentStatus.PAID)
+    assert paid.count() == 3
+    assert paid.sum("amount") == 450
+
+    assert frame.filter(provider=QiwiPayment, status=[PaymentStatus.PAID, PaymentStatus.WAITING]).count() == 3
+    assert frame.filter(provider="YooMoneyPayment", status=PaymentStatus.PAID).sum() == 49.5
+    assert frame.filter(method="WALLET").count() == 3
+    assert frame.filter(currency="USD").count() == 0
+    assert frame.filter() is frame
+
+
+def test_group_by(frame: PaymentFrame) -> None:
+    assert frame.group_by("provider").count() == {"QiwiPayment": 3, "YooMoneyPayment": 2}
+    assert frame.group_by("provider").sum() == {"QiwiPayment": 388.0, "YooMoneyPayment": 49.5}
+    assert frame.filter(status=PaymentStatus.PAID).group_by("provider", "method").sum("amount") == {
+        ("QiwiPayment", "CARD"): 100.0,
+        ("QiwiPayment", "WALLET"): 300.0,
+        ("YooMoneyPayment", "WALLET"): 50.0,
+    }
+
+
+def test_group_by_empty(frame: PaymentFrame) -> None:
+    assert frame.filter(currency="USD").group_by("status").count() == {}
+
+
+@pytest.mark.parametrize("categories", [(), ("amount",)])
+def test_group_by_invalid(frame: PaymentFrame, categories: tuple[str, ...]) -> None:
+    with pytest.raises(ValueError, match="group by"):
+        frame.group_by(*categories)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pytest
+
+from pypayment import BalanceGate, PaymentGettingError, PayOkPayment
+from pypayment.polling import PollTarget
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+TARGETS = [PollTarget(PayOkPayment, "first"), PollTarget(PayOkPayment, "second")]
+
+
+@pytest.fixture(autouse=True)
+def merchant() -> Iterator[None]:
+    """Identify PayOk merchant without authorizing the class."""
+    with mock.patch.object(PayOkPayment, "_get_credentials", return_value=(1, "key", 2)):
+        yield
+
+
+def filter_ids(gate: BalanceGate, targets: list[PollTarget]) -> list[str]:
+    return [target.payment_id for target in gate.filter(targets)]
+
+
+def test_unchanged_balance_skips_merchant() -> None:
+    gate = BalanceGate()
+    with mock.patch.object(PayOkPayment, "get_balance", return_value=100.0):
+        assert filter_ids(gate, TARGETS) == ["first", "second"]
+        assert filter_ids(gate, TARGETS) == []
+
+
+def test_changed_balance_checks_merchant() -> None:
+    gate = BalanceGate()
+    with mock.patch.object(PayOkPayment, "get_balance", side_effect=[100.0, 150.0]):
+        filter_ids(gate, TARGETS)
+        assert filter_ids(gate, TARGETS) == ["first", "second"]
+
+
+def test_due_expiration_is_checked() -> None:
+    gate = BalanceGate()
+    expired = PollTarget(PayOkPayment, "expired", datetime.now(timezone.utc) - timedelta(seconds=1))  # noqa: UP017
+    with mock.patch.object(PayOkPayment, "get_balance", return_value=100.0):
+        filter_ids(gate, TARGETS)
+        assert filter_ids(gate, [*TARGETS, expired]) == ["expired"]
+
+
+def test_quiet_merchant_is_checked_in_full() -> None:
+    gate = BalanceGate(max_quiet_time=timedelta(0))
+    with mock.patch.object(PayOkPayment, "get_balance", return_value=100.0):
+        filter_ids(gate, TARGETS)
+        assert filter_ids(gate, TARGETS) == ["first", "second"]
+
+
+def test_interrupted_tick_is_repeated() -> None:
+    gate = BalanceGate()
+    with mock.patch.object(PayOkPayment, "get_balance", return_value=100.0):
+        next(gate.filter(TARGETS))
+        assert filter_ids(gate, TARGETS) == ["first", "second"]
+
+
+@pytest.mark.parametrize("error", [PaymentGettingError("Unavailable"), ValueError("Malformed balance")])
+def test_failed_balance_falls_back_to_full_check(error: Exception) -> None:
+    gate = BalanceGate()
+    with mock.patch.object(PayOkPayment, "get_balance", side_effect=[100.0, error]):
+        filter_ids(gate, TARGETS)
+        assert filter_ids(gate, TARGETS) == ["first", "second"]
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+from unittest import mock
+
+import pytest
+import requests
+
+from pypayment import HealthMonitor, YooMoneyPayment
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture
+def account() -> Iterator[dict[str, Any]]:
+    """Serve YooMoney account info from a mocked session and authorize YooMoneyPayment against it."""
+    account: dict[str, Any] = {"status_code": requests.codes.ok, "account": "4100"}
+
+    def respond(method: str, url: str, **_: Any) -> requests.Response:  # noqa: ANN401
+        response = requests.Response()
+        response.status_code = account["status_code"]
+        response.url = url
+        response._content = json.dumps({"account": account["account"]}).encode()
+        return response
+
+    with mock.patch.object(requests.Session, "request", side_effect=respond):
+        YooMoneyPayment.authorize(access_token="token")
+        yield account
+
+
+def test_probe(account: dict[str, Any]) -> None:
+    monitor = HealthMonitor([YooMoneyPayment])
+    assert not monitor.is_ready()
+
+    account["account"] = "4200"
+    monitor.probe()
+
+    health = monitor.get(YooMoneyPayment)
+    assert health.healthy
+    assert health.samples == 1
+    assert health.last_error is None
+    assert health.latency_p50 is not None
+    assert monitor.is_ready()
+    # Probe does not change state of the class.
+    assert YooMoneyPayment._account_id == "4100"
+
+
+def test_failed_probe(account: dict[str, Any]) -> None:
+    monitor = HealthMonitor([YooMoneyPayment], max_error_rate=0.5)
+    monitor.probe()
+    account["status_code"] = requests.codes.unauthorized
+    monitor.probe()
+
+    health = monitor.get(YooMoneyPayment)
+    assert not health.healthy
+    assert health.error_rate == 0.5
+    assert health.last_error == "Access Token is invalid."
+    assert monitor.snapshot() == {"YooMoneyPayment": health}
+    assert YooMoneyPayment.authorized
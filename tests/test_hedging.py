@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import time
+from itertools import count
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pypayment import Hedger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def slow_first(latencies: list[float]) -> Callable[[], int]:
+    """Return function whose calls take the given latencies in turn and return their number."""
+    calls = count()
+
+    def function() -> int:
+        call = next(calls)
+        time.sleep(latencies[call])
+        return call
+
+    return function
+
+
+def test_fast_call_is_not_hedged() -> None:
+    hedger = Hedger(budget=1, initial_delay=0.5)
+    assert hedger.call(lambda: "result") == "result"
+    assert hedger.hedge_ratio == 0
+
+
+def test_slow_call_is_hedged() -> None:
+    hedger = Hedger(budget=1, initial_delay=0.05, min_samples=1)
+    started_at = time.monotonic()
+    assert hedger.call(slow_first([1.0, 0.01])) == 1
+    assert time.monotonic() - started_at < 0.5
+    assert hedger.hedge_ratio == 1
+    # Latency of the duplicate that answered is observed, without the delay before it was sent.
+    assert hedger.delay < 0.05
+
+
+def test_budget() -> None:
+    hedger = Hedger(budget=0, initial_delay=0.01)
+    assert hedger.call(slow_first([0.1, 0.01])) == 0
+    assert hedger.hedge_ratio == 0
+
+
+def test_failed_primary_waits_for_duplicate() -> None:
+    hedger = Hedger(budget=1, initial_delay=0.01)
+    calls = count()
+
+    def function() -> str:
+        if next(calls) == 0:
+            time.sleep(0.05)
+            raise KeyError("failure")
+        time.sleep(0.1)
+        return "duplicate"
+
+    assert hedger.call(function) == "duplicate"
+
+
+def test_both_failed() -> None:
+    hedger = Hedger(budget=1, initial_delay=0.01)
+
+    def function() -> str:
+        time.sleep(0.05)
+        raise KeyError("failure")
+
+    with pytest.raises(KeyError):
+        hedger.call(function)
+
+
+def test_busy_workers_do_not_trigger_duplicates() -> None:
+    hedger = Hedger(budget=1, initial_delay=0.05, min_samples=100, max_workers=1)
+    # Duplicate of the first call keeps the only worker busy after the call returns.
+    hedger.call(slow_first([0.2, 0.5]))
+    assert hedger.hedge_ratio == 1
+
+    hedger.call(lambda: None)
+    assert hedger.hedge_ratio == 0.5
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pypayment import LeaseCoordinator, LeaseLost, PollTarget, QiwiPayment, SQLiteLeaseStore
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Path:
+    return tmp_path / "leases.db"
+
+
+@pytest.fixture
+def store(path: Path) -> Iterator[SQLiteLeaseStore]:
+    store = SQLiteLeaseStore(path)
+    yield store
+    store.close()
+
+
+def coordinator(store: SQLiteLeaseStore, node_id: str, lease_duration: float = 60) -> LeaseCoordinator:
+    return LeaseCoordinator(store, [QiwiPayment], interval=60, lease_duration=lease_duration, node_id=node_id)
+
+
+def targets(count: int) -> list[PollTarget]:
+    return [PollTarget(QiwiPayment, f"payment-{index}") for index in range(count)]
+
+
+def ids(claimed: list[PollTarget]) -> set[str]:
+    return {target.payment_id for target in claimed}
+
+
+def test_claim_splits_payments_between_nodes(store: SQLiteLeaseStore, path: Path) -> None:
+    first = coordinator(store, "first")
+    other_store = SQLiteLeaseStore(path)
+    second = coordinator(other_store, "second")
+    first.add(targets(10))
+    second.add(targets(10))
+
+    with first.claim(6) as first_claimed, second.claim(10) as second_claimed:
+        assert len(first_claimed) == 6
+        assert len(second_claimed) == 4
+        assert ids(first_claimed) | ids(second_claimed) == ids(targets(10))
+
+    # Checked payments are not due again until the interval passes.
+    with first.claim(10) as claimed:
+        assert claimed == []
+    other_store.close()
+
+
+def test_claim_releases_leases_on_error(store: SQLiteLeaseStore) -> None:
+    first = coordinator(store, "first")
+    first.add(targets(3))
+
+    with pytest.raises(RuntimeError), first.claim(3):
+        raise RuntimeError
+
+    with coordinator(store, "second").claim(3) as claimed:
+        assert ids(claimed) == ids(targets(3))
+
+
+def test_claim_expired_lease_of_dead_node(store: SQLiteLeaseStore) -> None:
+    first = coordinator(store, "first")
+    first.add(targets(2))
+    store.claim("dead", 2, lease_duration=0.01, interval=60)
+
+    with first.claim(2) as claimed:
+        assert claimed == []
+    threading.Event().wait(0.05)
+    with first.claim(2) as claimed:
+        assert len(claimed) == 2
+
+
+def test_claim_renews_leases(store: SQLiteLeaseStore) -> None:
+    first = coordinator(store, "first", lease_duration=0.3)
+    first.add(targets(2))
+
+    with first.claim(2) as claimed:
+        threading.Event().wait(0.6)
+        with coordinator(store, "second").claim(2) as stolen:
+            assert stolen == []
+    assert len(claimed) == 2
+
+
+def test_claim_lost_leases(store: SQLiteLeaseStore) -> None:
+    first = coordinator(store, "first", lease_duration=0.06)
+    first.add(targets(2))
+
+    def poll_while_lease_is_taken_over() -> None:
+        with first.claim(2) as claimed:
+            store.release("first", [(QiwiPayment.__name__, claimed[0].payment_id)])
+            store.claim("second", 1, lease_duration=60, interval=60)
+            threading.Event().wait(0.1)
+
+    with pytest.raises(LeaseLost):
+        poll_while_lease_is_taken_over()
+
+    # Lease that was still held is released, not marked as checked.
+    with coordinator(store, "third").claim(2) as claimed:
+        assert len(claimed) == 1
+
+
+def test_claim_keeps_expiration(store: SQLiteLeaseStore) -> None:
+    expires_at = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(hours=1)  # noqa: UP017
+    first = coordinator(store, "first")
+    first.add([PollTarget(QiwiPayment, "expiring", expires_at), PollTarget(QiwiPayment, "eternal")])
+
+    with first.claim(2) as claimed:
+        assert set(claimed) == {PollTarget(QiwiPayment, "expiring", expires_at), PollTarget(QiwiPayment, "eternal")}
+
+
+def test_remove(store: SQLiteLeaseStore) -> None:
+    first = coordinator(store, "first")
+    first.add(targets(3))
+    first.remove(targets(2))
+
+    with first.claim(3) as claimed:
+        assert ids(claimed) == {"payment-2"}
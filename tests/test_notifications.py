@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pypayment import (
+    MemoryNotificationStore,
+    NotificationDeduplicator,
+    PaymentStatus,
+    PaymentStatusChanged,
+    PayOkPayment,
+    SQLiteNotificationStore,
+    payment_events,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+class InvalidSignatureError(Exception):
+    """Notification signature is invalid."""
+
+
+def deliver(
+    deduplicator: NotificationDeduplicator,
+    is_signature_valid: bool,
+    status: PaymentStatus | str = "paid",
+) -> bool:
+    """Handle notification like a webhook endpoint and return True if it was fulfilled."""
+    with deduplicator.process(PayOkPayment, "1", status, income=95.5) as is_new:
+        if not is_new:
+            return False
+        if not is_signature_valid:
+            raise InvalidSignatureError
+        return True
+
+
+@pytest.fixture
+def events() -> Iterator[list[PaymentStatusChanged]]:
+    events: list[PaymentStatusChanged] = []
+    unsubscribe = payment_events.subscribe(events.append)
+    yield events
+    unsubscribe()
+
+
+def test_mark() -> None:
+    deduplicator = NotificationDeduplicator()
+    assert not deduplicator.seen(PayOkPayment, "1", "paid")
+    assert deduplicator.mark(PayOkPayment, "1", "paid")
+    assert deduplicator.seen("PayOkPayment", "1", "paid")
+    assert not deduplicator.mark(PayOkPayment, "1", "paid")
+    assert deduplicator.mark(PayOkPayment, "1", "expired")
+    assert deduplicator.mark(PayOkPayment, "2", "paid")
+
+
+def test_concurrent_deliveries() -> None:
+    deduplicator = NotificationDeduplicator()
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: deduplicator.mark(PayOkPayment, "1", "paid"), range(32)))
+    assert results.count(True) == 1
+
+
+def test_forged_notification_does_not_block_genuine_one() -> None:
+    deduplicator = NotificationDeduplicator()
+    with pytest.raises(InvalidSignatureError):
+        deliver(deduplicator, is_signature_valid=False)
+
+    assert not deduplicator.seen(PayOkPayment, "1", "paid")
+    assert deliver(deduplicator, is_signature_valid=True)
+    assert not deliver(deduplicator, is_signature_valid=True)
+
+
+def test_window() -> None:
+    deduplicator = NotificationDeduplicator(window=0)
+    assert deduplicator.mark(PayOkPayment, "1", "paid")
+    assert deduplicator.mark(PayOkPayment, "1", "paid")
+
+
+def test_memory_store_is_bounded() -> None:
+    deduplicator = NotificationDeduplicator(MemoryNotificationStore(maxsize=2))
+    for payment_id in ["1", "2", "3"]:
+        deduplicator.mark(PayOkPayment, payment_id, "paid")
+    assert not deduplicator.seen(PayOkPayment, "1", "paid")
+    assert deduplicator.seen(PayOkPayment, "3", "paid")
+
+
+def test_sqlite_store_is_shared(tmp_path: Path) -> None:
+    first = NotificationDeduplicator(SQLiteNotificationStore(tmp_path / "notifications.db"))
+    second = NotificationDeduplicator(SQLiteNotificationStore(tmp_path / "notifications.db"))
+
+    assert first.mark(PayOkPayment, "1", "paid")
+    assert second.seen(PayOkPayment, "1", "paid")
+    assert not second.mark(PayOkPayment, "1", "paid")
+
+    first.forget(PayOkPayment, "1", "paid")
+    assert first.mark(PayOkPayment, "1", "paid")
+
+
+def test_verified_notification_is_published(events: list[PaymentStatusChanged]) -> None:
+    deduplicator = NotificationDeduplicator()
+    with pytest.raises(InvalidSignatureError):
+        deliver(deduplicator, is_signature_valid=False, status=PaymentStatus.PAID)
+    assert events == []
+
+    deliver(deduplicator, is_signature_valid=True, status=PaymentStatus.PAID)
+    deliver(deduplicator, is_signature_valid=True, status=PaymentStatus.PAID)
+    deduplicator.mark(PayOkPayment, "2", PaymentStatus.EXPIRED)
+    deduplicator.mark("PayOkPayment", "3", "paid")
+
+    assert events == [
+        PaymentStatusChanged(PayOkPayment, "1", None, PaymentStatus.PAID, 95.5),
+        PaymentStatusChanged(PayOkPayment, "2", None, PaymentStatus.EXPIRED, None),
+    ]
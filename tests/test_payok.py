@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+from unittest import mock
+
+import pytest
+import requests
+
+from pypayment import (
+    AuthorizationError,
+    FakeBackend,
+    FileCursorStore,
+    PaymentGettingError,
+    PaymentStatus,
+    PayOkPayment,
+    fake_providers,
+    sync_transitions,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+TRANSACTIONS = {
+    "status": "success",
+    "1": {"transaction": "2", "payment_id": "second", "transaction_status": "1", "amount_profit": "95.5"},
+    "2": {"transaction": "1", "payment_id": "first", "transaction_status": "0", "amount_profit": "0"},
+}
+
+
+@pytest.fixture
+def responses() -> Iterator[dict[str, Any]]:
+    """Serve PayOk API from a mocked session and authorize PayOkPayment against it."""
+    responses: dict[str, Any] = {
+        PayOkPayment._BALANCE_URL: {"status": "success", "balance": "150.25"},
+        PayOkPayment._PAY_URL: "<html></html>",
+        PayOkPayment._TRANSACTION_URL: TRANSACTIONS,
+    }
+
+    def respond(method: str, url: str, **_: Any) -> requests.Response:  # noqa: ANN401
+        body = responses[url]
+        response = requests.Response()
+        response.status_code = requests.codes.ok
+        response.url = url
+        response._content = (body if isinstance(body, str) else json.dumps(body)).encode()
+        return response
+
+    with mock.patch.object(requests.Session, "request", side_effect=respond):
+        PayOkPayment.authorize(api_key="key", api_id=1, shop_id=2, shop_secret_key="secret")
+        yield responses
+
+
+def test_authorize(responses: dict[str, Any]) -> None:
+    assert PayOkPayment.authorized
+
+
+def test_probe(responses: dict[str, Any]) -> None:
+    PayOkPayment._probe()
+
+
+def test_get_status_and_income(responses: dict[str, Any]) -> None:
+    assert PayOkPayment.get_status_and_income("second") == (PaymentStatus.PAID, 95.5)
+
+
+def test_get_balance(responses: dict[str, Any]) -> None:
+    assert PayOkPayment.get_balance() == 150.25
+
+
+def test_iter_transactions(responses: dict[str, Any]) -> None:
+    transactions = list(PayOkPayment.iter_transactions())
+    assert [transaction["payment_id"] for transaction in transactions] == ["second", "first"]
+
+
+def test_iter_transactions_error(responses: dict[str, Any]) -> None:
+    responses[PayOkPayment._TRANSACTION_URL] = {"status": "error", "text": "Invalid API key"}
+    with pytest.raises(PaymentGettingError, match="Invalid API key"):
+        list(PayOkPayment.iter_transactions())
+
+
+def test_sync_transitions(responses: dict[str, Any], tmp_path: Path) -> None:
+    transitions = list(sync_transitions(PayOkPayment, FileCursorStore(tmp_path / "cursors.json")))
+    assert {(transition.payment_id, transition.new) for transition in transitions} == {
+        ("second", PaymentStatus.PAID),
+        ("first", PaymentStatus.WAITING),
+    }
+
+
+def test_probe_fake_backend() -> None:
+    with fake_providers(FakeBackend(failure_rate=1.0)):
+        PayOkPayment.authorize(api_key="key", api_id=1, shop_id=2, shop_secret_key="secret")
+    with mock.patch.object(requests.Session, "request") as request, pytest.raises(AuthorizationError):
+        PayOkPayment._probe()
+    request.assert_not_called()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import multiprocessing
+import time
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pytest
+
+from pypayment import PaymentGettingError, PaymentNotFound, PaymentStatus, PollerWorkerDied, QiwiPayment
+from pypayment.polling import PollTarget, ShardedPoller
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+pytestmark = pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="Workers inherit mocked provider only when forked.",
+)
+
+AUTHORIZATIONS = {QiwiPayment: {"secret_key": "key"}}
+
+
+def get_status_and_income(payment_id: str) -> tuple[PaymentStatus, float]:
+    time.sleep(0.01)
+    if payment_id == "missing":
+        raise PaymentNotFound
+    if payment_id == "failing":
+        raise PaymentGettingError("Unavailable")
+    return PaymentStatus.PAID, 10.0
+
+
+@pytest.fixture
+def provider() -> Iterator[None]:
+    """Answer status checks of QiwiPayment without requests, in the test process and forked workers."""
+    status_checks = mock.patch.object(QiwiPayment, "get_status_and_income", side_effect=get_status_and_income)
+    with mock.patch.object(QiwiPayment, "_try_authorize"), status_checks:
+        yield
+
+
+def targets(*payment_ids: str) -> list[PollTarget]:
+    return [PollTarget(QiwiPayment, payment_id) for payment_id in payment_ids]
+
+
+def test_poll(provider: None) -> None:
+    payment_ids = [str(index) for index in range(20)]
+    with ShardedPoller(AUTHORIZATIONS, processes=2, batch_size=4) as poller:
+        results = list(poller.poll(targets(*payment_ids, "missing", "failing")))
+
+    by_id = {result.payment_id: result for result in results}
+    assert len(results) == len(by_id) == 22
+    assert {by_id[payment_id].status for payment_id in payment_ids} == {PaymentStatus.PAID}
+    assert not by_id["missing"].found
+    assert by_id["failing"].error == "Unavailable"
+    assert by_id["failing"].income is None
+
+
+def test_abandoned_poll_results_are_discarded(provider: None) -> None:
+    with ShardedPoller(AUTHORIZATIONS, processes=1, threads_per_process=1, batch_size=1) as poller:
+        first_poll = poller.poll(targets(*(f"first-{index}" for index in range(10))))
+        next(first_poll)
+        first_poll.close()
+
+        results = list(poller.poll(targets("second-1", "second-2")))
+    assert sorted(result.payment_id for result in results) == ["second-1", "second-2"]
+
+
+def test_worker_death(provider: None) -> None:
+    with ShardedPoller(AUTHORIZATIONS, processes=1) as poller:
+        poller._workers[0].kill()
+        poller._workers[0].join()
+        with pytest.raises(PollerWorkerDied):
+            list(poller.poll(targets("1")))
+        poller._inputs.clear()
+        poller._workers.clear()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import io
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pypayment import (
+    DiscrepancyKind,
+    LedgerEntry,
+    PaymentGettingError,
+    PaymentNotFound,
+    PaymentStatus,
+    QiwiPayment,
+    reconcile,
+)
+from pypayment.reconciliation import read_ledger, write_csv, write_jsonl
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+STATUSES = {
+    "paid": (PaymentStatus.PAID, 100.0),
+    "waiting": (PaymentStatus.WAITING, 0.0),
+}
+
+
+@pytest.fixture(autouse=True)
+def _provider(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Answer status checks of QiwiPayment from STATUSES."""
+
+    def get_status_and_income(payment_id: str) -> tuple[PaymentStatus, float]:
+        if payment_id == "failing":
+            raise PaymentGettingError("Service unavailable")
+        if payment_id == "broken":
+            raise KeyError("status")
+        if payment_id not in STATUSES:
+            raise PaymentNotFound(payment_id)
+        return STATUSES[payment_id]
+
+    monkeypatch.setattr(QiwiPayment, "get_status_and_income", get_status_and_income)
+
+
+def test_reconcile() -> None:
+    entries = [
+        LedgerEntry("paid", income=100.0, status=PaymentStatus.PAID),
+        LedgerEntry("paid", income=99.0),
+        LedgerEntry("waiting", status=PaymentStatus.PAID),
+        "unknown",
+        "failing",
+        "broken",
+        "waiting",
+    ]
+    discrepancies = list(reconcile(QiwiPayment, entries, max_concurrency=2))
+
+    assert [(discrepancy.payment_id, discrepancy.kind) for discrepancy in discrepancies] == [
+        ("paid", DiscrepancyKind.AMOUNT_MISMATCH),
+        ("waiting", DiscrepancyKind.STATUS_MISMATCH),
+        ("unknown", DiscrepancyKind.MISSING),
+        ("failing", DiscrepancyKind.FETCH_FAILED),
+        ("broken", DiscrepancyKind.FETCH_FAILED),
+    ]
+    assert discrepancies[0].actual_income == 100.0
+    assert discrepancies[1].actual_status is PaymentStatus.WAITING
+    assert discrepancies[3].error == "Service unavailable"
+    assert discrepancies[4].error == "KeyError('status')"
+
+
+def test_reconcile_tolerance() -> None:
+    assert list(reconcile(QiwiPayment, [LedgerEntry("paid", income=99.995)])) == []
+
+
+def test_reconcile_is_lazy() -> None:
+    consumed = []
+
+    def entries() -> Iterator[str]:
+        for index in range(1000):
+            consumed.append(index)
+            yield "unknown"
+
+    discrepancies = reconcile(QiwiPayment, entries(), max_concurrency=2)
+    next(discrepancies)
+    assert len(consumed) <= 4
+    discrepancies.close()
+
+
+def test_read_ledger_csv() -> None:
+    source = io.StringIO("id,income,status\nfirst,100.5,paid\nsecond,,\n")
+    assert list(read_ledger(source)) == [
+        LedgerEntry("first", 100.5, PaymentStatus.PAID),
+        LedgerEntry("second"),
+    ]
+
+
+def test_read_ledger_ids() -> None:
+    assert list(read_ledger(io.StringIO("first\n\nsecond\n"))) == [LedgerEntry("first"), LedgerEntry("second")]
+
+
+def test_write() -> None:
+    discrepancies = list(reconcile(QiwiPayment, [LedgerEntry("waiting", status=PaymentStatus.PAID), "unknown"]))
+
+    jsonl = io.StringIO()
+    assert write_jsonl(discrepancies, jsonl) == 2
+    first = json.loads(jsonl.getvalue().splitlines()[0])
+    assert first["kind"] == "status_mismatch"
+    assert first["expected_status"] == "PAID"
+    assert first["actual_status"] == "WAITING"
+    assert first["provider"] == "QiwiPayment"
+
+    csv = io.StringIO()
+    assert write_csv(discrepancies, csv) == 2
+    assert csv.getvalue().splitlines()[0].startswith("kind,payment_id,provider,")
+    assert csv.getvalue().splitlines()[2].startswith("missing,unknown,QiwiPayment,")
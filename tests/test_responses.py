@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import pytest
+import requests
+from requests.exceptions import InvalidJSONError
+
+from pypayment import responses
+from pypayment.responses import dumps, loads, parse_json
+
+
+@pytest.fixture(params=["orjson", "json"], autouse=True)
+def _backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Run every test with orjson, when it is installed, and with the standard json module."""
+    if request.param == "orjson":
+        monkeypatch.setattr(responses, "orjson", pytest.importorskip("orjson"))
+    else:
+        monkeypatch.setattr(responses, "orjson", None)
+
+
+def make_response(content: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = requests.codes.ok
+    response._content = content
+    return response
+
+
+def test_dumps_and_loads() -> None:
+    data = {"amount": {"value": 100.5, "currency": "RUB"}, "comment": "Заказ №1", "paid": True, "id": None}
+    encoded = dumps(data)
+
+    assert isinstance(encoded, bytes)
+    assert "Заказ".encode() in encoded
+    assert loads(encoded) == data
+    assert loads(encoded.decode()) == data
+
+
+def test_parse_json() -> None:
+    assert parse_json(make_response(b'{"status": "success", "balance": "1.5"}')) == {
+        "status": "success",
+        "balance": "1.5",
+    }
+
+
+def test_parse_invalid_json() -> None:
+    response = make_response(b"<html>Bad Gateway</html>")
+    with pytest.raises(InvalidJSONError) as error:
+        parse_json(response)
+
+    assert isinstance(error.value, requests.RequestException)
+    assert error.value.response is response
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+from unittest import mock
+
+import pytest
+import requests
+
+from pypayment import (
+    AaioPayment,
+    AdaptiveConcurrency,
+    DeadlineExceeded,
+    HealthMonitor,
+    Payment,
+    QiwiPayment,
+    RequestPriority,
+    RequestScheduler,
+    deadline,
+    request_priority,
+)
+from pypayment.transport import HttpResponse
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from pypayment.timeouts import Timeout
+    from pypayment.transport import HttpRequest
+
+
+def hold(scheduler: RequestScheduler, priority: RequestPriority, release: threading.Event) -> threading.Thread:
+    """Take a slot of scheduler in a new thread and keep it until release is set."""
+    taken = threading.Event()
+
+    def run() -> None:
+        with scheduler.slot(priority):
+            taken.set()
+            release.wait()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    taken.wait()
+    return thread
+
+
+def test_reserved_slots() -> None:
+    scheduler = RequestScheduler(capacity=2, reserved=1)
+    release = threading.Event()
+    holder = hold(scheduler, RequestPriority.BACKGROUND, release)
+
+    with scheduler.slot(RequestPriority.INTERACTIVE):
+        assert scheduler.get_running(RequestPriority.INTERACTIVE) == 1
+
+    with deadline(0.05), pytest.raises(DeadlineExceeded), scheduler.slot(RequestPriority.BACKGROUND):
+        pass
+    assert scheduler.get_waiting(RequestPriority.BACKGROUND) == 0
+
+    release.set()
+    holder.join()
+
+
+def test_weighted_fair_queuing() -> None:
+    scheduler = RequestScheduler(capacity=1, reserved=0)
+    release = threading.Event()
+    holder = hold(scheduler, RequestPriority.BACKGROUND, release)
+
+    order: list[RequestPriority] = []
+
+    def run(priority: RequestPriority) -> None:
+        with scheduler.slot(priority):
+            order.append(priority)
+
+    threads = [
+        threading.Thread(target=run, args=(priority,))
+        for priority in [RequestPriority.BACKGROUND] * 4 + [RequestPriority.INTERACTIVE] * 8
+    ]
+    for thread in threads:
+        thread.start()
+    while scheduler.get_waiting(RequestPriority.BACKGROUND) + scheduler.get_waiting(RequestPriority.INTERACTIVE) < 12:
+        time.sleep(0.001)
+
+    release.set()
+    holder.join()
+    for thread in threads:
+        thread.join()
+
+    # Interactive lane gets four slots per background one, and background lane is not starved.
+    # Background lane was charged for the slot of holder, so interactive lane goes first.
+    interactive, background = RequestPriority.INTERACTIVE, RequestPriority.BACKGROUND
+    assert order == [interactive] * 5 + [background] + [interactive] * 3 + [background] * 3
+
+
+def test_invalid_reserved() -> None:
+    with pytest.raises(ValueError, match="Reserved slots must be fewer than capacity"):
+        RequestScheduler(capacity=2, reserved=2)
+
+
+@pytest.fixture
+def providers() -> Iterator[None]:
+    """Serve QiwiPayment and AaioPayment from a mocked session, and reset their settings afterwards."""
+
+    def respond(method: str, url: str, **_: Any) -> requests.Response:  # noqa: ANN401
+        response = requests.Response()
+        response.status_code = requests.codes.ok
+        response.url = url
+        response._content = b"{}"
+        return response
+
+    with mock.patch.object(requests.Session, "request", side_effect=respond):
+        QiwiPayment.authorize(secret_key="key")
+        AaioPayment.authorize(api_key="key", secret_1="secret", merchant_id="merchant")
+        try:
+            yield
+        finally:
+            Payment.set_scheduler(None)
+            QiwiPayment.set_adaptive_concurrency(None)
+
+
+def test_throttled_provider_does_not_hold_slots(providers: None) -> None:
+    Payment.set_scheduler(RequestScheduler(capacity=4, reserved=1))
+    QiwiPayment.set_adaptive_concurrency(AdaptiveConcurrency(initial_limit=1, min_limit=1, max_limit=1))
+
+    def send(http_request: HttpRequest, _timeout: Timeout) -> HttpResponse:
+        if "qiwi" in http_request.url:
+            time.sleep(0.2)
+            return HttpResponse(requests.codes.ok, json.dumps({"status": {"value": "WAITING"}}).encode())
+        return HttpResponse(requests.codes.ok, json.dumps({"status": "in_process", "profit": 0}).encode())
+
+    with mock.patch("pypayment.payment.send", side_effect=send), ThreadPoolExecutor(6) as executor:
+        futures = [executor.submit(QiwiPayment.get_status_and_income, str(index)) for index in range(6)]
+        time.sleep(0.05)
+
+        started_at = time.monotonic()
+        with request_priority(RequestPriority.BACKGROUND):
+            AaioPayment.get_status_and_income("aaio")
+        assert time.monotonic() - started_at < 0.1
+
+        for future in futures:
+            future.result()
+
+
+def test_health_probes_are_background(providers: None) -> None:
+    scheduler = RequestScheduler()
+    Payment.set_scheduler(scheduler)
+    with mock.patch.object(scheduler, "slot", wraps=scheduler.slot) as slot:
+        QiwiPayment.authorize(secret_key="key")
+        HealthMonitor([QiwiPayment]).probe()
+    assert [call.args for call in slot.call_args_list] == [
+        (RequestPriority.INTERACTIVE,),
+        (RequestPriority.BACKGROUND,),
+    ]
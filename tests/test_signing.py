@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import hashlib
+
+import pytest
+
+from pypayment.signing import SignatureContext, get_signature_context
+
+
+def md5(text: str) -> str:
+    return hashlib.md5(text.encode()).hexdigest()  # noqa: S324
+
+
+def test_sign() -> None:
+    context = SignatureContext("md5", "secret", "|")
+    assert context.sign((100, "id", 1, "RUB", "")) == md5("100|id|1|RUB||secret")
+
+
+def test_sign_without_separator() -> None:
+    context = SignatureContext("md5", "secret")
+    assert context.sign({"amount": "100", "currency": "RUB"}.values()) == md5("100RUBsecret")
+
+
+def test_sign_prefix_and_after() -> None:
+    context = SignatureContext("sha256", "secret", ":", ("merchant",))
+    expected = hashlib.sha256(b"merchant:100:RUB:secret:order").hexdigest()
+    assert context.sign((100, "RUB"), after=("order",)) == expected
+    # Prefix state is copied, not consumed, by every signature.
+    assert context.sign((100, "RUB"), after=("order",)) == expected
+
+
+def test_sign_only_secret() -> None:
+    assert SignatureContext("sha256", "secret", ":").sign(()) == hashlib.sha256(b"secret").hexdigest()
+
+
+def test_sign_many() -> None:
+    context = SignatureContext("md5", "secret", "|")
+    rows = [(1, "first"), (2, "second")]
+    assert list(context.sign_many(rows)) == [context.sign(row) for row in rows]
+
+
+def test_unknown_algorithm() -> None:
+    with pytest.raises(ValueError, match="unsupported hash type"):
+        SignatureContext("unknown", "secret").sign(("value",))
+
+
+def test_get_signature_context() -> None:
+    context = get_signature_context("md5", "secret", "|")
+    assert get_signature_context("md5", "secret", "|") is context
+    assert get_signature_context("md5", "other", "|") is not context
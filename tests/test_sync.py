@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from pypayment import FileCursorStore, PaymentStatus, QiwiPayment, sync_transitions
+from pypayment.sync import FeedRecord, SyncCursor
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from pypayment.sync import FeedPosition
+
+
+class Feed:
+    """Transaction feed of QiwiPayment, with the positions it was requested from."""
+
+    def __init__(self) -> None:
+        """Initialize empty feed."""
+        self.records: list[FeedRecord] = []
+        self.requests: list[FeedPosition | None] = []
+
+    def add(self, payment_id: str, status: PaymentStatus, position: int) -> None:
+        self.records = [record for record in self.records if record.payment_id != payment_id]
+        self.records.append(FeedRecord(payment_id, status, 100.0 if status == PaymentStatus.PAID else 0.0, position))
+
+    def iterate(self, since: FeedPosition | None) -> Iterator[FeedRecord]:
+        self.requests.append(since)
+        records = sorted(self.records, key=lambda record: record.position, reverse=True)
+        return iter([record for record in records if since is None or record.position >= since])
+
+
+@pytest.fixture
+def feed(monkeypatch: pytest.MonkeyPatch) -> Feed:
+    feed = Feed()
+    monkeypatch.setattr(QiwiPayment, "_iter_feed", feed.iterate)
+    monkeypatch.setattr(QiwiPayment, "_secret_key", "key")
+    return feed
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> FileCursorStore:
+    return FileCursorStore(tmp_path / "cursors.json")
+
+
+def sync(store: FileCursorStore, **options: Any) -> list[tuple[str, PaymentStatus | None, PaymentStatus | None]]:  # noqa: ANN401
+    transitions = sync_transitions(QiwiPayment, store, **options)
+    return [(transition.payment_id, transition.old, transition.new) for transition in transitions]
+
+
+def test_sync_transitions(feed: Feed, store: FileCursorStore) -> None:
+    feed.add("first", PaymentStatus.PAID, 1)
+    feed.add("second", PaymentStatus.WAITING, 2)
+    feed.add("third", PaymentStatus.PAID, 2)
+
+    assert sync(store) == [
+        ("second", None, PaymentStatus.WAITING),
+        ("third", None, PaymentStatus.PAID),
+        ("first", None, PaymentStatus.PAID),
+    ]
+    assert sync(store) == []
+
+    feed.add("second", PaymentStatus.PAID, 2)
+    feed.add("fourth", PaymentStatus.PAID, 3)
+    assert sync(store) == [("fourth", None, PaymentStatus.PAID), ("second", PaymentStatus.WAITING, PaymentStatus.PAID)]
+    assert feed.requests == [None, 2, 2]
+
+
+def test_sync_transitions_interrupted(feed: Feed, store: FileCursorStore, tmp_path: Path) -> None:
+    feed.add("first", PaymentStatus.PAID, 1)
+    feed.add("second", PaymentStatus.PAID, 2)
+
+    transitions = sync_transitions(QiwiPayment, store)
+    next(transitions)
+    transitions.close()
+
+    assert not (tmp_path / "cursors.json").exists()
+    assert len(sync(store)) == 2
+
+
+def test_sync_transitions_known_statuses(feed: Feed, store: FileCursorStore) -> None:
+    feed.add("first", PaymentStatus.PAID, 1)
+    feed.add("second", PaymentStatus.PAID, 2)
+    feed.add("unknown", PaymentStatus.PAID, 3)
+
+    known_statuses = {"first": PaymentStatus.WAITING, "second": PaymentStatus.PAID}
+    assert sync(store, known_statuses=known_statuses) == [("first", PaymentStatus.WAITING, PaymentStatus.PAID)]
+
+
+def test_sync_transitions_settle_timeout(feed: Feed, store: FileCursorStore) -> None:
+    feed.add("first", PaymentStatus.WAITING, 1)
+    feed.add("second", PaymentStatus.PAID, 2)
+    sync(store)
+
+    assert sync(store, settle_timeout=timedelta(0)) == []
+    assert feed.requests[-1] == 2
+
+
+def test_cursor_store(store: FileCursorStore, tmp_path: Path) -> None:
+    cursor = SyncCursor(position="2024-01-01T00:00:00+00:00", boundary=["first"], unsettled={"second": (5, 10.0)})
+    store.save("first", cursor)
+    store.save("second", SyncCursor())
+
+    reopened = FileCursorStore(tmp_path / "cursors.json")
+    assert reopened.load("first") == cursor
+    assert reopened.load("second") == SyncCursor()
+    assert reopened.load("third") is None
+    assert not (tmp_path / "cursors.json.tmp").exists()
+
+
+def test_cursor_key_depends_on_credentials(feed: Feed, store: FileCursorStore, monkeypatch: pytest.MonkeyPatch) -> None:
+    feed.add("first", PaymentStatus.PAID, 1)
+    assert len(sync(store)) == 1
+
+    monkeypatch.setattr(QiwiPayment, "_secret_key", "other")
+    assert len(sync(store)) == 1
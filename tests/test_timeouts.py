@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+from unittest import mock
+
+import pytest
+import requests
+
+from pypayment import DeadlineExceeded, QiwiPayment, Timeout, deadline, request_timeout
+from pypayment.timeouts import get_remaining_time, request
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture
+def timeouts() -> Iterator[list[tuple[float, float]]]:
+    """Serve Qiwi API from a mocked session and return timeouts of sent requests."""
+    timeouts: list[tuple[float, float]] = []
+
+    def respond(method: str, url: str, timeout: tuple[float, float], **_: Any) -> requests.Response:  # noqa: ANN401
+        timeouts.append(timeout)
+        response = requests.Response()
+        response.status_code = requests.codes.ok
+        response.url = url
+        response._content = json.dumps({"status": {"value": "WAITING"}}).encode()
+        return response
+
+    with mock.patch.object(requests.Session, "request", side_effect=respond):
+        yield timeouts
+    QiwiPayment.set_timeouts()
+
+
+def test_default_timeout(timeouts: list[tuple[float, float]]) -> None:
+    QiwiPayment.authorize(secret_key="key")
+    assert timeouts == [tuple(Timeout())]
+
+
+def test_set_timeouts(timeouts: list[tuple[float, float]]) -> None:
+    QiwiPayment.set_timeouts(5, status=Timeout(1, 2))
+    QiwiPayment.authorize(secret_key="key")
+    QiwiPayment.get_status_and_income("id")
+
+    assert timeouts == [(5, 5), (1, 2)]
+
+
+def test_request_timeout(timeouts: list[tuple[float, float]]) -> None:
+    QiwiPayment.set_timeouts(5)
+    with request_timeout(Timeout(3, 4)):
+        QiwiPayment.authorize(secret_key="key")
+    with request_timeout(0.5):
+        QiwiPayment.get_status_and_income("id")
+
+    assert timeouts == [(3, 4), (0.5, 0.5)]
+
+
+def test_deadline(timeouts: list[tuple[float, float]]) -> None:
+    with deadline(2):
+        QiwiPayment.authorize(secret_key="key")
+        with deadline(60):
+            QiwiPayment.get_status_and_income("id")
+
+    assert all(0 < timeout <= 2 for request_timeouts in timeouts for timeout in request_timeouts)
+
+
+def test_deadline_passed(timeouts: list[tuple[float, float]]) -> None:
+    with deadline(0), pytest.raises(DeadlineExceeded):
+        request("GET", QiwiPayment._API_URL, Timeout())
+    assert timeouts == []
+
+
+def test_deadline_passed_during_request() -> None:
+    timed_out = mock.patch.object(requests.Session, "request", side_effect=requests.ReadTimeout)
+    with timed_out, deadline(1), pytest.raises(DeadlineExceeded):
+        request("GET", QiwiPayment._API_URL, Timeout())
+
+    with timed_out, deadline(60), pytest.raises(requests.ReadTimeout):
+        request("GET", QiwiPayment._API_URL, Timeout())
+
+
+def test_get_remaining_time() -> None:
+    assert get_remaining_time() is None
+    with deadline(10):
+        remaining = get_remaining_time()
+        assert remaining is not None
+        assert 9 < remaining <= 10
+    assert get_remaining_time() is None
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+from unittest import mock
+
+import pytest
+import requests
+
+from pypayment import AaioPayment, PaymentGettingError, PaymentNotFound, PaymentOperation, PaymentStatus
+from pypayment.transport import HttpResponse
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture
+def session() -> Iterator[mock.Mock]:
+    """Serve Aaio API from a mocked session and authorize AaioPayment against it."""
+
+    def respond(method: str, url: str, **_: Any) -> requests.Response:  # noqa: ANN401
+        response = requests.Response()
+        response.status_code = requests.codes.ok
+        response.url = url
+        response._content = json.dumps({"url": "https://aaio.so/pay"}).encode()
+        return response
+
+    with mock.patch.object(requests.Session, "request", side_effect=respond) as request:
+        AaioPayment.authorize(api_key="key", secret_1="secret", merchant_id="merchant")
+        yield request
+
+
+def test_creation(session: mock.Mock, capsys: pytest.CaptureFixture[str]) -> None:
+    payment = AaioPayment(100, description="Order", id="order")
+
+    assert payment.url == "https://aaio.so/pay"
+    data = session.call_args.kwargs["data"]
+    assert (data["merchant_id"], data["amount"], data["order_id"], data["desc"]) == ("merchant", 100, "order", "Order")
+    assert capsys.readouterr().out == ""
+
+
+def test_status_request(session: mock.Mock) -> None:
+    request = AaioPayment._build_status_request("order")
+    assert request.operation == PaymentOperation.STATUS
+    assert request.method == "GET"
+    assert request.params == {"order_id": "order", "merchant_id": "merchant"}
+
+
+@pytest.mark.parametrize(
+    ("status_code", "body", "expected"),
+    [
+        (200, {"status": "success", "profit": 95.5}, (PaymentStatus.PAID, 95.5)),
+        (200, {"status": "in_process", "profit": 0}, (PaymentStatus.WAITING, 0)),
+    ],
+)
+def test_status_response(status_code: int, body: dict[str, Any], expected: tuple[PaymentStatus, float]) -> None:
+    response = HttpResponse(status_code, json.dumps(body).encode())
+    assert AaioPayment._parse_status_response("order", response) == expected
+
+
+def test_status_response_errors() -> None:
+    with pytest.raises(PaymentNotFound):
+        AaioPayment._parse_status_response("order", HttpResponse(404, b""))
+    with pytest.raises(PaymentGettingError, match="Internal error"):
+        AaioPayment._parse_status_response("order", HttpResponse(500, b"Internal error"))
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import urllib.parse
+from typing import TYPE_CHECKING, Any
+from unittest import mock
+
+import pytest
+import requests
+
+from pypayment import PayOkCurrency, PayOkPayment, PayOkPaymentType
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@pytest.fixture(autouse=True)
+def _authorize() -> Iterator[None]:
+    """Authorize PayOkPayment against a mocked session."""
+
+    def respond(method: str, url: str, **_: Any) -> requests.Response:  # noqa: ANN401
+        response = requests.Response()
+        response.status_code = requests.codes.ok
+        response.url = url
+        response._content = json.dumps({"status": "success", "balance": "0"}).encode()
+        return response
+
+    with mock.patch.object(requests.Session, "request", side_effect=respond):
+        PayOkPayment.authorize(
+            api_key="key",
+            api_id=1,
+            shop_id=2,
+            shop_secret_key="secret",
+            success_url="https://example.com/?paid=1",
+        )
+        yield
+
+
+def expected_url(amount: float, payment_id: str, description: str, currency: str = "RUB", method: str = "cd") -> str:
+    sign = hashlib.md5(f"{amount}|{payment_id}|2|{currency}|{description}|secret".encode()).hexdigest()  # noqa: S324
+    data = {
+        "amount": amount,
+        "payment": payment_id,
+        "shop": 2,
+        "desc": description,
+        "currency": currency,
+        "success_url": "https://example.com/?paid=1",
+        "method": method,
+        "sign": sign,
+    }
+    return PayOkPayment._PAY_URL + "?" + urllib.parse.urlencode(data)
+
+
+def test_generate_urls() -> None:
+    urls = list(PayOkPayment.generate_urls([(100, "first", "Order #1"), (2.505, "second", ""), (5, "", None)]))
+
+    assert urls[0] == expected_url(100, "first", "Order #1")
+    assert urls[1] == expected_url(2.5, "second", "second")
+    payment_id = urllib.parse.parse_qs(urllib.parse.urlparse(urls[2]).query)["payment"][0]
+    assert urls[2] == expected_url(5, payment_id, payment_id)
+
+
+def test_generate_urls_options() -> None:
+    urls = PayOkPayment.generate_urls(
+        [(100, "first", "Order")],
+        payment_type=PayOkPaymentType.QIWI,
+        currency=PayOkCurrency.USD,
+    )
+    assert list(urls) == [expected_url(100, "first", "Order", "USD", PayOkPaymentType.QIWI.value)]
+
+
+def test_generate_urls_in_chunks() -> None:
+    rows = [(index + 1, f"id-{index}", "") for index in range(25)]
+    urls = list(PayOkPayment.generate_urls(rows, chunk_size=10))
+    assert urls == [expected_url(amount, payment_id, payment_id) for amount, payment_id, _ in rows]
+
+
+def test_generate_urls_in_processes() -> None:
+    rows = [(index + 1, f"id-{index}", "Order") for index in range(25)]
+    urls = PayOkPayment.generate_urls(rows, processes=2, chunk_size=4)
+    assert list(urls) == list(PayOkPayment.generate_urls(rows))
+
+
+@pytest.mark.parametrize(("options", "message"), [({"chunk_size": 0}, "Chunk size"), ({"processes": -1}, "processes")])
+def test_generate_urls_validation(options: dict[str, Any], message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        PayOkPayment.generate_urls([(1, "id", "")], **options)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
+from unittest import mock
+
+import pytest
+import requests
+
+from pypayment import PaymentGettingError, YooMoneyOperationType, YooMoneyPayment
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+OPERATIONS = [{"operation_id": str(index), "label": f"payment-{index}"} for index in range(5)]
+
+
+@pytest.fixture
+def history() -> Iterator[list[dict[str, Any]]]:
+    """Serve YooMoney operation history in pages from a mocked session and return data of history requests."""
+    history: list[dict[str, Any]] = []
+
+    def respond(method: str, url: str, data: dict[str, Any] | None = None, **_: Any) -> requests.Response:  # noqa: ANN401
+        body: dict[str, Any] = {"account": "4100"}
+        if url == YooMoneyPayment._OPERATION_HISTORY_URL:
+            history.append(dict(data or {}))
+            start = int(data.get("start_record", 0)) if data else 0
+            end = start + int(data["records"]) if data else len(OPERATIONS)
+            body = {"operations": OPERATIONS[start:end]}
+            if end < len(OPERATIONS):
+                body["next_record"] = str(end)
+
+        response = requests.Response()
+        response.status_code = requests.codes.ok
+        response.url = url
+        response._content = json.dumps(body).encode()
+        return response
+
+    with mock.patch.object(requests.Session, "request", side_effect=respond):
+        YooMoneyPayment.authorize(access_token="token")
+        yield history
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_iter_operations(history: list[dict[str, Any]], prefetch: bool) -> None:
+    operations = list(YooMoneyPayment.iter_operations(page_size=2, prefetch=prefetch))
+
+    assert operations == OPERATIONS
+    assert [request.get("start_record") for request in history] == [None, "2", "4"]
+
+
+def test_iter_operations_is_lazy(history: list[dict[str, Any]]) -> None:
+    operations = YooMoneyPayment.iter_operations(page_size=2)
+    assert next(operations) == OPERATIONS[0]
+    assert next(operations) == OPERATIONS[1]
+    assert len(history) == 1
+    operations.close()
+
+
+def test_iter_operations_filters(history: list[dict[str, Any]]) -> None:
+    since = datetime(2024, 1, 1, tzinfo=timezone.utc)  # noqa: UP017
+    until = datetime(2024, 2, 1, tzinfo=timezone.utc)  # noqa: UP017
+    types = [YooMoneyOperationType.DEPOSITION, YooMoneyOperationType.PAYMENT]
+    list(YooMoneyPayment.iter_operations(since=since, until=until, types=types))
+
+    assert history[0]["type"] == "deposition payment"
+    assert datetime.fromisoformat(history[0]["from"]) == since
+    assert datetime.fromisoformat(history[0]["till"]) == until
+
+
+def test_iter_operations_error(history: list[dict[str, Any]]) -> None:
+    error = requests.Response()
+    error.status_code = requests.codes.ok
+    error._content = b'{"error": "illegal_param_type"}'
+
+    failing = mock.patch.object(requests.Session, "request", return_value=error)
+    with failing, pytest.raises(PaymentGettingError, match="illegal_param_type"):
+        list(YooMoneyPayment.iter_operations())